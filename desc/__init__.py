@@ -24,6 +24,7 @@ __all__ = [
     "derivatives",
     "equilibrium",
     "examples",
+    "export",
     "geometry",
     "grid",
     "io",
@@ -58,10 +59,43 @@ _BANNER = r"""
 BANNER = colored(_BANNER, "magenta")
 
 
-config = {"device": None, "avail_mem": None, "kind": None}
-
-
-def set_device(kind="cpu", gpuid=None):
+config = {
+    "device": None,
+    "avail_mem": None,
+    "kind": None,
+    # directory for on-disk caches, set DESC_CACHE_DIR="" to disable caching
+    "cache_dir": os.environ.get(
+        "DESC_CACHE_DIR",
+        os.path.join(
+            os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache")), "desc"
+        ),
+    ),
+    # whether to store transform matrices in the cache directory
+    "transform_cache": os.environ.get("DESC_TRANSFORM_CACHE", "").lower()
+    in {"1", "true", "yes"},
+    # precision of kernels decorated with desc.backend.reduced_precision
+    "precision": os.environ.get("DESC_PRECISION", "double"),
+    # memory budget in GB for jac_chunk_size="auto", defaults to avail_mem
+    "jac_mem_budget": (
+        float(os.environ["DESC_JAC_MEM_BUDGET"])
+        if os.environ.get("DESC_JAC_MEM_BUDGET")
+        else None
+    ),
+    # whether jac_chunk_size="auto" also times a few candidate chunk sizes
+    "jac_chunk_timing": os.environ.get("DESC_JAC_CHUNK_TIMING", "").lower()
+    in {"1", "true", "yes"},
+    # number of linear constraint factorizations kept in memory for reuse,
+    # see desc.objectives.utils.factorize_linear_constraints. 0 disables the cache
+    "factorization_cache_size": int(
+        os.environ.get("DESC_FACTORIZATION_CACHE_SIZE", "0") or 0
+    ),
+    # persistent compilation cache, see desc.backend.set_compilation_cache
+    "compilation_cache": os.environ.get("DESC_COMPILATION_CACHE", "").lower()
+    in {"1", "true", "yes"},
+}
+
+
+def set_device(kind="cpu", gpuid=None, compilation_cache=None):
     """Sets the device to use for computation.
 
     If kind==``'gpu'`` and a gpuid is specified, uses the specified GPU. If
@@ -74,8 +108,19 @@ def set_device(kind="cpu", gpuid=None):
     ----------
     kind : {``'cpu'``, ``'gpu'``}
         whether to use CPU or GPU.
+    gpuid : int, optional
+        Index of the GPU to use.
+    compilation_cache : bool or str, optional
+        Whether to store compiled functions on disk, so later processes can skip
+        compiling them. If a str, the directory to store them in, otherwise the
+        ``jax`` subdirectory of ``desc.config["cache_dir"]`` is used. Like the device,
+        this should be set before importing other DESC modules, otherwise use
+        ``desc.backend.set_compilation_cache``. Defaults to the environment variable
+        ``DESC_COMPILATION_CACHE``.
 
     """
+    if compilation_cache is not None:
+        config["compilation_cache"] = compilation_cache
     config["kind"] = kind
     if kind == "cpu":
         os.environ["JAX_PLATFORMS"] = "cpu"
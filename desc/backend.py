@@ -1,5 +1,6 @@
 """Backend functions for DESC, with options for JAX or regular numpy."""
 
+import contextlib
 import functools
 import os
 import warnings
@@ -63,6 +64,130 @@ def print_backend_info():
     )
 
 
+_precisions = {"double", "single"}
+
+
+@contextlib.contextmanager
+def precision(kind):
+    """Context manager to set the precision of reduced precision kernels.
+
+    Kernels decorated with ``reduced_precision``, such as the Biot-Savart laws in
+    ``desc.coils``, are evaluated in single precision inside this context if
+    ``kind="single"``. Everything else, including the equilibrium solve and linear
+    algebra, always uses double precision. The global default is set by
+    ``desc.config["precision"]`` or the environment variable ``DESC_PRECISION``.
+
+    The precision is read when a function is traced, so this has no effect on
+    functions that were already compiled, e.g. the objectives of an optimization.
+
+    Parameters
+    ----------
+    kind : {"double", "single"}
+        Precision to use.
+
+    """
+    if kind not in _precisions:
+        raise ValueError(f"precision should be one of {_precisions}, got {kind}.")
+    old = desc_config["precision"]
+    desc_config["precision"] = kind
+    try:
+        yield
+    finally:
+        desc_config["precision"] = old
+
+
+def reduced_precision(fun):
+    """Decorate a kernel that may be evaluated in single precision.
+
+    If the precision policy is ``"single"`` (see ``precision``), floating point
+    array arguments are cast to float32 before calling ``fun``, and the output is
+    cast back to float64. Because the cast happens outside of ``fun``, a jitted
+    ``fun`` is compiled separately for each precision.
+    """
+
+    def cast(x, dtype):
+        if hasattr(x, "dtype") and jnp.issubdtype(x.dtype, jnp.floating):
+            return x.astype(dtype)
+        return x
+
+    @functools.wraps(fun)
+    def wrapper(*args, **kwargs):
+        kind = desc_config["precision"]
+        if kind not in _precisions:
+            raise ValueError(f"precision should be one of {_precisions}, got {kind}.")
+        if kind == "double":
+            return fun(*args, **kwargs)
+        args = [cast(arg, jnp.float32) for arg in args]
+        kwargs = {key: cast(val, jnp.float32) for key, val in kwargs.items()}
+        return cast(fun(*args, **kwargs), jnp.float64)
+
+    return wrapper
+
+
+_compilation_cache_stats = {"hits": 0, "misses": 0}
+
+
+def set_compilation_cache(path=True):
+    """Enable or disable the persistent compilation cache.
+
+    When enabled, every function compiled by JAX is stored on disk, so later
+    processes compiling the same function (e.g. the same objective in another job)
+    load it from the cache instead of compiling it again. The cache can also be
+    enabled with ``desc.set_device(..., compilation_cache=True)``,
+    ``desc.config["compilation_cache"] = True`` or the environment variable
+    ``DESC_COMPILATION_CACHE=1`` before importing ``desc.backend``.
+
+    Parameters
+    ----------
+    path : bool or str
+        Directory to store the compiled functions in. If True, uses the ``jax``
+        subdirectory of ``desc.config["cache_dir"]``. If False, disables the cache.
+
+    """
+    if path is True:
+        path = (
+            os.path.join(os.path.expanduser(desc_config["cache_dir"]), "jax")
+            if desc_config.get("cache_dir")
+            else False
+        )
+    desc_config["compilation_cache"] = path
+    if not use_jax:
+        return
+    from jax.experimental.compilation_cache import compilation_cache
+
+    compilation_cache.reset_cache()
+    jax.config.update("jax_compilation_cache_dir", path or None)
+    if path:
+        # cache everything, the default is to skip functions compiled in under 1s
+        jax.config.update("jax_persistent_cache_min_entry_size_bytes", -1)
+        jax.config.update("jax_persistent_cache_min_compile_time_secs", 0)
+
+
+def compilation_cache_stats():
+    """Number of hits and misses of the persistent compilation cache so far.
+
+    Returns
+    -------
+    stats : dict
+        Dictionary with keys ``"hits"`` and ``"misses"``.
+
+    """
+    return _compilation_cache_stats.copy()
+
+
+def _count_compilation_cache_events(event, **kwargs):
+    if event == "/jax/compilation_cache/cache_hits":
+        _compilation_cache_stats["hits"] += 1
+    elif event == "/jax/compilation_cache/cache_misses":
+        _compilation_cache_stats["misses"] += 1
+
+
+if use_jax:
+    jax.monitoring.register_event_listener(_count_compilation_cache_events)
+if desc_config.get("compilation_cache"):
+    set_compilation_cache(desc_config["compilation_cache"])
+
+
 if use_jax:  # noqa: C901
     from jax import custom_jvp, jit, vmap
     from jax.experimental.ode import odeint
@@ -7,7 +7,7 @@ from math import factorial
 import mpmath
 import numpy as np
 
-from desc.backend import custom_jvp, fori_loop, jit, jnp, sign
+from desc.backend import custom_jvp, fori_loop, jit, jnp, scan, sign
 from desc.grid import Grid, _Grid
 from desc.io import IOAble
 from desc.utils import check_nonnegint, check_posint, flatten_list
@@ -874,7 +874,10 @@ class ZernikePolynomial(_Basis):
         lm = lm[lmidx]
         m = m[midx]
 
-        radial = zernike_radial(r[:, np.newaxis], lm[:, 0], lm[:, 1], dr=derivatives[0])
+        L_max = _zernike_L_max(lm, self.L, self.M, self.spectral_indexing)
+        radial = zernike_radial_vectorized(
+            r, lm[:, 0], lm[:, 1], dr=derivatives[0], L_max=L_max
+        )
         poloidal = fourier(t[:, np.newaxis], m, 1, derivatives[1])
         radial = radial[routidx][:, lmoutidx]
         poloidal = poloidal[toutidx][:, moutidx]
@@ -1283,7 +1286,10 @@ class FourierZernikeBasis(_Basis):
         m = m[midx]
         n = n[nidx]
 
-        radial = zernike_radial(r[:, np.newaxis], lm[:, 0], lm[:, 1], dr=derivatives[0])
+        L_max = _zernike_L_max(lm, self.L, self.M, self.spectral_indexing)
+        radial = zernike_radial_vectorized(
+            r, lm[:, 0], lm[:, 1], dr=derivatives[0], L_max=L_max
+        )
         poloidal = fourier(t[:, np.newaxis], m, dt=derivatives[1])
         toroidal = fourier(z[:, np.newaxis], n, NFP=self.NFP, dt=derivatives[2])
 
@@ -1752,6 +1758,139 @@ def zernike_radial(r, l, m, dr=0):
     return s * jnp.where((l - m) % 2 == 0, out, 0.0)
 
 
+def zernike_radial_vectorized(r, l, m, dr=0, L_max=None):
+    """Radial part of zernike polynomials, evaluating all modes at once.
+
+    Runs the three term recurrence for the jacobi polynomials once for every
+    azimuthal mode number up to ``L_max``, propagating the radial derivatives
+    alongside, and gathers the requested modes from the resulting table. This
+    avoids re-deriving the recurrence for each mode and derivative order, so it
+    is much faster than ``zernike_radial`` when evaluating a full basis.
+
+    Parameters
+    ----------
+    r : ndarray, shape(N,)
+        radial coordinates to evaluate basis
+    l : ndarray of int, shape(K,)
+        radial mode number(s)
+    m : ndarray of int, shape(K,)
+        azimuthal mode number(s)
+    dr : int
+        order of derivative (Default = 0)
+    L_max : int, optional
+        Upper bound on the radial mode numbers. Must be given if ``l`` is traced
+        under JIT. Defaults to ``max(l)``.
+
+    Returns
+    -------
+    y : ndarray, shape(N,K)
+        basis function(s) evaluated at specified points
+
+    """
+    if L_max is None:
+        L_max = np.max(l)
+    return _zernike_radial_vectorized(r, l, m, int(dr), int(L_max))
+
+
+def _zernike_L_max(modes, L, M, spectral_indexing):
+    """Upper bound on the radial mode numbers of a Zernike basis.
+
+    Mode numbers are traced when the basis is passed to a JIT compiled function, in
+    which case they are bounded by the resolution instead.
+
+    Parameters
+    ----------
+    modes : ndarray of int, shape(K,2) or (K,3)
+        Mode numbers of the basis, with the radial mode number in the first column.
+    L, M : int
+        Radial and poloidal resolution of the basis.
+    spectral_indexing : {"ansi", "fringe"}
+        Indexing method of the basis.
+
+    Returns
+    -------
+    L_max : int
+        Upper bound on ``modes[:, 0]``.
+
+    """
+    if isinstance(modes, np.ndarray):
+        return np.max(modes[:, 0])
+    if spectral_indexing == "ansi":
+        return max(L, M)
+    return L + M
+
+
+@functools.partial(custom_jvp, nondiff_argnums=(3, 4))
+@functools.partial(jit, static_argnums=(3, 4))
+def _zernike_radial_vectorized(r, l, m, dr, L_max):
+    r = jnp.reshape(r, (-1, 1))
+    r2 = r**2
+    # table columns are alpha = |m| = 0, ..., L_max
+    a = jnp.arange(L_max + 1.0)
+    shape = (dr + 1, r.shape[0], a.size)
+    j = jnp.arange(dr + 1)[:, jnp.newaxis, jnp.newaxis]
+
+    # Q[j] is the j-th derivative wrt r of the jacobi polynomial P_n^(a,0)(1 - 2r^2)
+    Q0 = jnp.zeros(shape).at[0].set(1.0)
+    Q1 = jnp.zeros(shape)
+    for i, q in enumerate([(a + 1) - (a + 2) * r2, -2 * (a + 2) * r, -2 * (a + 2)]):
+        if i <= dr:
+            Q1 = Q1.at[i].set(q)
+
+    # Leibniz rule for the j-th derivative of r^a Q, W[i] multiplies Q[dr - i]
+    W = jnp.stack(
+        [
+            factorial(dr)
+            / (factorial(i) * factorial(dr - i))
+            * jnp.prod(a - jnp.arange(i)[:, jnp.newaxis], axis=0)
+            * r ** jnp.maximum(a - i, 0)
+            for i in range(dr + 1)
+        ]
+    )
+
+    def _zernike(Q):
+        return jnp.sum(W * Q[::-1], axis=0)
+
+    def _shift(Q, i):
+        i = min(i, dr + 1)
+        return jnp.concatenate([jnp.zeros((i, *shape[1:])), Q[: dr + 1 - i]])
+
+    def body(carry, k):
+        Q0, Q1 = carry
+        # P_k = (A x + B) P_{k-1} - C P_{k-2} with x = 1 - 2r^2
+        c = 2 * k * (k + a) * (2 * k + a - 2)
+        A = (2 * k + a - 1) * (2 * k + a) * (2 * k + a - 2) / c
+        B = (2 * k + a - 1) * a**2 / c
+        C = 2 * (k + a - 1) * (k - 1) * (2 * k + a) / c
+        Q = (
+            ((A + B) - 2 * A * r2) * Q1
+            - 4 * A * r * j * _shift(Q1, 1)
+            - 2 * A * j * (j - 1) * _shift(Q1, 2)
+            - C * Q0
+        )
+        return (Q1, Q), _zernike(Q)
+
+    _, table = scan(body, (Q0, Q1), jnp.arange(2.0, L_max // 2 + 1))
+    table = jnp.concatenate(
+        [_zernike(Q0)[jnp.newaxis], _zernike(Q1)[jnp.newaxis], table]
+    )
+
+    l = jnp.asarray(l).astype(int)
+    m = jnp.abs(jnp.asarray(m)).astype(int)
+    n = (l - m) // 2
+    out = table[jnp.clip(n, 0, table.shape[0] - 1), :, m].T
+    return jnp.where(((l - m) % 2 == 0) & (n >= 0), (-1) ** n * out, 0.0)
+
+
+@_zernike_radial_vectorized.defjvp
+def _zernike_radial_vectorized_jvp(dr, L_max, x, xdot):
+    (r, l, m) = x
+    (rdot, *_) = xdot
+    f = _zernike_radial_vectorized(r, l, m, dr, L_max)
+    df = _zernike_radial_vectorized(r, l, m, dr + 1, L_max)
+    return f, df * jnp.reshape(rdot, (-1, 1))
+
+
 def power_coeffs(l):
     """Power series coefficients.
 
@@ -13,6 +13,7 @@ from desc.backend import (
     fori_loop,
     jit,
     jnp,
+    reduced_precision,
     scan,
     tree_flatten,
     tree_leaves,
@@ -40,6 +41,7 @@ from desc.optimizable import Optimizable, OptimizableCollection, optimizable_par
 from desc.utils import cross, dot, equals, errorif, flatten_list, safenorm, warnif
 
 
+@reduced_precision
 @partial(jit, static_argnames=["chunk_size"])
 def biot_savart_hh(eval_pts, coil_pts_start, coil_pts_end, current, *, chunk_size=None):
     """Biot-Savart law for filamentary coils following [1].
@@ -99,6 +101,7 @@ def biot_savart_hh(eval_pts, coil_pts_start, coil_pts_end, current, *, chunk_siz
     return B
 
 
+@reduced_precision
 @partial(jit, static_argnames=["chunk_size"])
 def biot_savart_vector_potential_hh(
     eval_pts, coil_pts_start, coil_pts_end, current, *, chunk_size=None
@@ -156,6 +159,7 @@ def biot_savart_vector_potential_hh(
     return A
 
 
+@reduced_precision
 @partial(jit, static_argnames=["chunk_size"])
 def biot_savart_quad(eval_pts, coil_pts, tangents, current, *, chunk_size=None):
     """Biot-Savart law for filamentary coil using numerical quadrature.
@@ -199,6 +203,7 @@ def biot_savart_quad(eval_pts, coil_pts, tangents, current, *, chunk_size=None):
     )
 
 
+@reduced_precision
 @partial(jit, static_argnames=["chunk_size"])
 def biot_savart_vector_potential_quad(
     eval_pts, coil_pts, tangents, current, *, chunk_size=None
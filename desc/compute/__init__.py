@@ -23,9 +23,17 @@ data : dict of ndarray
 
 """
 
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from desc import __version__
+from desc import config as desc_config
+
 # just need to import all the submodules here to register everything in the
 # data_index
-
 from . import (
     _basis_vectors,
     _bootstrap,
@@ -45,6 +53,7 @@ from . import (
 from .data_index import all_kwargs, allowed_kwargs, data_index
 from .geom_utils import rpz2xyz, rpz2xyz_vec, xyz2rpz, xyz2rpz_vec
 from .utils import (
+    ComputeProfiler,
     compute,
     get_data_deps,
     get_derivs,
@@ -59,6 +68,9 @@ from .utils import (
 # compute something, it's easier to just do it once for all quantities when we first
 # import the compute module.
 def _build_data_index():
+    path = _data_index_cache_path()
+    if path is not None and _load_data_index(path):
+        return
 
     for p in data_index:
         for key in data_index[p]:
@@ -92,6 +104,72 @@ def _build_data_index():
                         full_with_axis[_key] = full[_key]
             data_index[p][key]["full_with_axis_dependencies"] = full_with_axis
 
+    if path is not None:
+        _save_data_index(path)
+
+
+def _data_index_cache_path():
+    """Path of the cached dependency tables, or None if caching is disabled.
+
+    The file name includes the DESC version and a hash of the registered compute
+    functions' dependencies, so any change to the data index invalidates the cache.
+    """
+    if not desc_config.get("cache_dir"):
+        return None
+    deps = [
+        (p, key, data_index[p][key]["dependencies"])
+        for p in data_index
+        for key in data_index[p]
+    ]
+    key = hashlib.sha256(json.dumps(deps, default=str).encode()).hexdigest()[:16]
+    return os.path.join(
+        os.path.expanduser(desc_config["cache_dir"]),
+        f"data_index_{__version__}_{key}.pkl",
+    )
+
+
+def _load_data_index(path):
+    """Load full dependencies from the cache at path, returning True on success."""
+    try:
+        with open(path, "rb") as f:
+            cache = pickle.load(f)
+    except Exception:
+        return False
+    if cache.keys() != data_index.keys() or any(
+        cache[p].keys() != data_index[p].keys() for p in data_index
+    ):
+        return False
+    for p in data_index:
+        for key, (full, full_with_axis) in cache[p].items():
+            data_index[p][key]["full_dependencies"] = full
+            data_index[p][key]["full_with_axis_dependencies"] = full_with_axis
+    return True
+
+
+def _save_data_index(path):
+    """Save full dependencies to the cache at path, ignoring any failure."""
+    # pickle preserves the shared references between the two tables
+    cache = {
+        p: {
+            key: (
+                data_index[p][key]["full_dependencies"],
+                data_index[p][key]["full_with_axis_dependencies"],
+            )
+            for key in data_index[p]
+        }
+        for p in data_index
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so other processes never see partial files
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as f:
+            pickle.dump(cache, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, path)
+    except OSError:
+        pass
+
 
 _build_data_index()
 
@@ -1,16 +1,19 @@
 """Functions for flux surface averages and vector algebra operations."""
 
 import copy
+import functools
 import inspect
+import json
+import time
 import warnings
 
 import numpy as np
 
-from desc.backend import execute_on_cpu, jnp
+from desc.backend import execute_on_cpu, jax, jnp
 from desc.grid import Grid
 
 from ..utils import errorif
-from .data_index import allowed_kwargs, data_index, deprecated_names
+from .data_index import allowed_kwargs, assign_alias_data, data_index, deprecated_names
 
 # map from profile name to equilibrium parameter name
 profile_names = {
@@ -35,7 +38,15 @@ def _parse_parameterization(p):
 
 
 def compute(  # noqa: C901
-    parameterization, names, params, transforms, profiles, data=None, **kwargs
+    parameterization,
+    names,
+    params,
+    transforms,
+    profiles,
+    data=None,
+    evict=False,
+    profiler=None,
+    **kwargs,
 ):
     """Compute the quantity given by name on grid.
 
@@ -58,6 +69,13 @@ def compute(  # noqa: C901
         Any vector v = v¹ R̂ + v² ϕ̂ + v³ Ẑ should be given in components
         v = [v¹, v², v³] where R̂, ϕ̂, Ẑ are the normalized basis vectors
         of the cylindrical coordinates R, ϕ, Z.
+    evict : bool
+        If True, intermediate quantities are removed from ``data`` as soon as no
+        remaining compute function needs them, which lowers peak memory. Only the
+        requested ``names`` and the quantities given in ``data`` are returned.
+    profiler : ComputeProfiler, optional
+        If given, the cost of each compute function that is evaluated is recorded
+        in ``profiler``.
 
     Returns
     -------
@@ -141,6 +159,8 @@ def compute(  # noqa: C901
         transforms=transforms,
         profiles=profiles,
         data=data,
+        evict=evict,
+        profiler=profiler,
         **kwargs,
     )
 
@@ -164,7 +184,15 @@ def compute(  # noqa: C901
 
 
 def _compute(
-    parameterization, names, params, transforms, profiles, data=None, **kwargs
+    parameterization,
+    names,
+    params,
+    transforms,
+    profiles,
+    data=None,
+    evict=False,
+    profiler=None,
+    **kwargs,
 ):
     """Same as above but without checking inputs for faster recursion.
 
@@ -173,10 +201,11 @@ def _compute(
     of the cylindrical coordinates R, ϕ, Z.
 
     We need to directly call this function in objectives, since the checks in above
-    function are not compatible with JIT. This function computes given names while
-    using recursion to compute dependencies. If you want to call this function, you
-    cannot give the argument basis='xyz' since that will break the recursion. In that
-    case, either call above function or manually convert the output to xyz basis.
+    function are not compatible with JIT. This function computes given names by
+    executing a precompiled plan (see ``_get_compute_plan``), so the dependency graph
+    is only walked once for each unique request. If you want to call this function,
+    you cannot give the argument basis='xyz' since that will break the recursion. In
+    that case, either call above function or manually convert the output to xyz basis.
     """
     assert kwargs.get("basis", "rpz") == "rpz", "_compute only works in rpz coordinates"
     parameterization = _parse_parameterization(parameterization)
@@ -185,40 +214,294 @@ def _compute(
     if data is None:
         data = {}
 
-    for name in names:
-        if name in data:
-            # don't compute something that's already been computed
-            continue
-        if not has_data_dependencies(
-            parameterization, name, data, transforms["grid"].axis.size
-        ):
-            # then compute the missing dependencies
-            data = _compute(
-                parameterization,
-                data_index[parameterization][name]["dependencies"]["data"],
+    request = (
+        parameterization,
+        tuple(names),
+        bool(transforms["grid"].axis.size),
+        frozenset(data.keys()),
+    )
+    plan = _get_compute_plan(*request)
+    evictions = _get_evictions(*request) if evict else ((),) * len(plan)
+    for name, dead in zip(plan, evictions):
+        if name not in data:
+            # some compute functions also store other quantities, e.g. aliases
+            fun = data_index[parameterization][name]["fun"]
+            if profiler is not None:
+                fun = functools.partial(profiler.record, parameterization, name, fun)
+            data = fun(
                 params=params,
                 transforms=transforms,
                 profiles=profiles,
                 data=data,
                 **kwargs,
             )
-            if transforms["grid"].axis.size:
-                data = _compute(
-                    parameterization,
-                    data_index[parameterization][name]["dependencies"][
-                        "axis_limit_data"
-                    ],
-                    params=params,
-                    transforms=transforms,
-                    profiles=profiles,
-                    data=data,
-                    **kwargs,
-                )
-        # now compute the quantity
-        data = data_index[parameterization][name]["fun"](
+        for key in dead:
+            data.pop(key, None)
+    return data
+
+
+class ComputeProfiler:
+    """Record the cost of each compute function evaluated by ``compute``.
+
+    Pass an instance as the ``profiler`` argument of ``desc.compute.compute`` or
+    ``Equilibrium.compute``. For every quantity that is computed, the profiler
+    records the size of the output and, if ``cost_analysis`` is True, the FLOPs
+    and bytes accessed estimated by XLA for the compute function on its own.
+    When running eagerly (outside of JIT), the wall time of each compute function
+    is recorded as well. Repeated evaluations of a quantity are accumulated.
+
+    Parameters
+    ----------
+    cost_analysis : bool
+        Whether to compile each compute function separately to get the XLA cost
+        estimates. This is slow, so turn it off if only the timing is needed.
+
+    Examples
+    --------
+    >>> profiler = ComputeProfiler()
+    >>> data = eq.compute("|B|_mn_B", profiler=profiler)
+    >>> print(profiler.report(sort="flops", num=10))
+    >>> profiler.to_chrome_trace("compute_trace.json")
+
+    """
+
+    _columns = ("count", "time", "flops", "bytes accessed", "size")
+
+    def __init__(self, cost_analysis=True):
+        self.cost_analysis = cost_analysis
+        self.records = {}
+        self.events = []
+
+    def record(
+        self, parameterization, name, fun, params, transforms, profiles, data, **kwargs
+    ):
+        """Evaluate the compute function ``fun`` for ``name`` and record its cost."""
+        traced = any(
+            isinstance(x, jax.core.Tracer) for x in jax.tree_util.tree_leaves(params)
+        )
+        cost = {}
+        if self.cost_analysis:
+            cost = self._cost_analysis(
+                name, fun, params, transforms, profiles, data, kwargs
+            )
+        keys = set(data.keys())
+        start = time.perf_counter()
+        data = fun(
             params=params, transforms=transforms, profiles=profiles, data=data, **kwargs
         )
-    return data
+        if not traced:
+            jax.block_until_ready([data[key] for key in data.keys() - keys])
+        elapsed = time.perf_counter() - start
+
+        record = self.records.setdefault(
+            name,
+            dict.fromkeys(self._columns, 0) | {"parameterization": parameterization},
+        )
+        record["count"] += 1
+        record["time"] += 0.0 if traced else elapsed
+        record["flops"] += cost.get("flops", 0.0)
+        record["bytes accessed"] += cost.get("bytes accessed", 0.0)
+        record["size"] = int(jnp.size(data[name]))
+        if not traced:
+            self.events.append((name, start, elapsed))
+        return data
+
+    @staticmethod
+    def _cost_analysis(name, fun, params, transforms, profiles, data, kwargs):
+        # transforms and profiles are closed over, since the grids they hold are
+        # expected to be concrete by some compute functions
+        def f(params, data):
+            return fun(
+                params=params,
+                transforms=transforms,
+                profiles=profiles,
+                data=data,
+                **kwargs,
+            )[name]
+
+        abstract = lambda x: jax.ShapeDtypeStruct(jnp.shape(x), jnp.result_type(x))
+        args = jax.tree_util.tree_map(abstract, (params, data))
+        cost = jax.jit(f).lower(*args).compile().cost_analysis()
+        # older versions of jax return a list with one entry per device
+        if isinstance(cost, (list, tuple)):
+            cost = cost[0] if len(cost) else {}
+        return cost or {}
+
+    def report(self, sort="time", num=None):
+        """Return a table of the recorded quantities, most expensive first.
+
+        Parameters
+        ----------
+        sort : {"time", "flops", "bytes accessed", "size", "count"}
+            Column to sort by.
+        num : int, optional
+            Maximum number of rows to include. Defaults to all recorded quantities.
+
+        Returns
+        -------
+        report : str
+            Table with one row per quantity.
+
+        """
+        errorif(
+            sort not in self._columns,
+            ValueError,
+            f"sort should be one of {self._columns}, got {sort}.",
+        )
+        names = sorted(self.records, key=lambda k: self.records[k][sort], reverse=True)
+        width = max([len(name) for name in names] + [8])
+        lines = [
+            f"{'quantity':<{width}} {'count':>6} {'time (ms)':>10} {'GFLOPs':>10} "
+            f"{'MB accessed':>12} {'size':>10}"
+        ]
+        for name in names[:num]:
+            r = self.records[name]
+            lines.append(
+                f"{name:<{width}} {r['count']:>6d} {1e3 * r['time']:>10.3f} "
+                f"{1e-9 * r['flops']:>10.4f} {1e-6 * r['bytes accessed']:>12.3f} "
+                f"{r['size']:>10d}"
+            )
+        return "\n".join(lines)
+
+    def to_chrome_trace(self, path=None):
+        """Return the recorded timeline in the Chrome trace event format.
+
+        Each eager evaluation of a compute function becomes one complete event,
+        with the XLA cost estimates and output size stored in its ``args``. The
+        trace can be viewed with ``chrome://tracing`` or https://ui.perfetto.dev.
+
+        Parameters
+        ----------
+        path : str or path-like, optional
+            If given, the trace is also written to this file as JSON.
+
+        Returns
+        -------
+        trace : dict
+            Trace with a list of events under the key ``"traceEvents"``.
+
+        """
+        t0 = min([start for _, start, _ in self.events], default=0.0)
+        events = [
+            {
+                "name": name,
+                "cat": self.records[name]["parameterization"],
+                "ph": "X",
+                "ts": 1e6 * (start - t0),
+                "dur": 1e6 * elapsed,
+                "pid": 0,
+                "tid": 0,
+                "args": {
+                    key: self.records[name][key]
+                    for key in ("flops", "bytes accessed", "size")
+                },
+            }
+            for name, start, elapsed in self.events
+        ]
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+        return trace
+
+
+@functools.lru_cache(maxsize=256)
+def _get_compute_plan(parameterization, names, has_axis, computed):
+    """Get the ordered list of compute functions to evaluate ``names``.
+
+    The plan is topologically sorted so that every quantity appears after its
+    dependencies. It visits the dependency graph in the same order as a recursive
+    evaluation would, so executing the plan gives identical results. Plans are
+    stored in an LRU cache, so repeated requests (e.g. when retracing an objective
+    with new grid shapes) skip the graph traversal.
+
+    Parameters
+    ----------
+    parameterization : str
+        Type of object to compute for, eg Equilibrium, Curve, etc.
+    names : tuple of str
+        Name(s) of the quantity(s) to compute.
+    has_axis : bool
+        Whether the grid to compute on has a node on the magnetic axis.
+    computed : frozenset of str
+        Names of quantities already present in the data dictionary.
+
+    Returns
+    -------
+    plan : tuple of str
+        Names of the quantities whose compute functions should be evaluated, in
+        order.
+
+    """
+    plan = []
+    _build_compute_plan(parameterization, names, has_axis, set(computed), plan)
+    return tuple(plan)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_evictions(parameterization, names, has_axis, computed):
+    """Get the quantities that may be dropped after each step of a compute plan.
+
+    A quantity is dropped right after its last consumer in the plan, unless it was
+    requested in ``names`` or given in the initial data.
+
+    Parameters
+    ----------
+    parameterization : str
+        Type of object to compute for, eg Equilibrium, Curve, etc.
+    names : tuple of str
+        Name(s) of the quantity(s) to compute.
+    has_axis : bool
+        Whether the grid to compute on has a node on the magnetic axis.
+    computed : frozenset of str
+        Names of quantities already present in the data dictionary.
+
+    Returns
+    -------
+    evictions : tuple of tuple of str
+        Names of the quantities that are no longer needed after each step of
+        ``_get_compute_plan(parameterization, names, has_axis, computed)``.
+
+    """
+    p = parameterization
+    plan = _get_compute_plan(p, names, has_axis, computed)
+    last_use = {}
+    for i, name in enumerate(plan):
+        last_use[name] = i
+        fun = data_index[p][name]["fun"]
+        if isinstance(fun, functools.partial) and fun.func is assign_alias_data:
+            last_use[fun.keywords["primary"]] = i
+        deps = data_index[p][name]["dependencies"]
+        for dep in deps["data"] + (deps["axis_limit_data"] if has_axis else []):
+            last_use[dep] = i
+    keep = computed.union(names)
+    evictions = [[] for _ in plan]
+    for key, i in last_use.items():
+        if key not in keep:
+            evictions[i].append(key)
+    return tuple(tuple(sorted(dead)) for dead in evictions)
+
+
+def _build_compute_plan(p, names, has_axis, present, plan):
+    """Append names and missing dependencies to ``plan`` in evaluation order."""
+    for name in names:
+        if name in present:
+            # don't compute something that's already been computed
+            continue
+        deps = data_index[p][name]["dependencies"]
+        if not all(d in present for d in deps["data"]) or (
+            has_axis and not all(d in present for d in deps["axis_limit_data"])
+        ):
+            # then compute the missing dependencies
+            _build_compute_plan(p, deps["data"], has_axis, present, plan)
+            if has_axis:
+                _build_compute_plan(p, deps["axis_limit_data"], has_axis, present, plan)
+        plan.append(name)
+        present.add(name)
+        fun = data_index[p][name]["fun"]
+        if isinstance(fun, functools.partial) and fun.func is assign_alias_data:
+            # aliases also store the primary quantity in the data dictionary
+            present.add(fun.keywords["primary"])
 
 
 @execute_on_cpu
@@ -514,7 +797,7 @@ def get_params(keys, obj, has_axis=False, basis="rpz"):
 
 @execute_on_cpu
 def get_transforms(
-    keys, obj, grid, jitable=False, has_axis=False, basis="rpz", **kwargs
+    keys, obj, grid, jitable=False, has_axis=False, basis="rpz", lazy=False, **kwargs
 ):
     """Get transforms needed to compute a given quantity on a given grid.
 
@@ -532,6 +815,9 @@ def get_transforms(
         Whether the grid to compute on has a node on the magnetic axis.
     basis : {"rpz", "xyz"}
         Basis of computed quantities.
+    lazy : bool
+        Whether to defer evaluating the transform matrices of the spectral bases
+        until they are first used. See ``Transform``.
 
     Returns
     -------
@@ -570,6 +856,7 @@ def get_transforms(
                         derivs=derivs[c],
                         build=False,
                         method=method,
+                        lazy=lazy,
                     )
             else:  # don't perform checks if jitable=True as they are not jit-safe
                 c_transform = Transform(
@@ -578,6 +865,7 @@ def get_transforms(
                     derivs=derivs[c],
                     build=False,
                     method=method,
+                    lazy=lazy,
                 )
             transforms[c] = c_transform
         elif c == "B":  # used for Boozer transform
@@ -10,7 +10,7 @@ import numpy as np
 from scipy import special
 from scipy.constants import mu_0
 
-from desc.backend import execute_on_cpu, jnp
+from desc.backend import execute_on_cpu, jnp, tree_stack, vmap
 from desc.basis import FourierZernikeBasis, fourier, zernike_radial
 from desc.compat import ensure_positive_jacobian
 from desc.compute import compute as compute_fun
@@ -811,6 +811,8 @@ class Equilibrium(IOAble, Optimizable):
         profiles=None,
         data=None,
         override_grid=True,
+        evict=False,
+        profiler=None,
         **kwargs,
     ):
         """Compute the quantity given by name on grid.
@@ -842,6 +844,13 @@ class Equilibrium(IOAble, Optimizable):
             resolution grid to compute quantities and then downsample to user requested
             grid. If False, uses only the user specified grid, which may lead to
             inaccurate values for surface or volume averages.
+        evict : bool
+            If True, intermediate quantities are dropped as soon as they are no
+            longer needed, which lowers peak memory. Only the requested ``names``
+            and the quantities given in ``data`` are returned.
+        profiler : ComputeProfiler, optional
+            If given, the cost of each compute function that is evaluated is
+            recorded in ``profiler``. See ``desc.compute.ComputeProfiler``.
 
         Returns
         -------
@@ -942,8 +951,27 @@ class Equilibrium(IOAble, Optimizable):
                 method=method,
                 **kwargs,
             )
+        if isinstance(params, (list, tuple)):
+            # transforms and profiles don't depend on params, so build them once
+            # and map over the stacked coefficients
+            return vmap(
+                lambda params: self.compute(
+                    names,
+                    grid=grid,
+                    params=params,
+                    transforms=transforms,
+                    profiles=profiles,
+                    data=data,
+                    override_grid=override_grid,
+                    evict=evict,
+                    profiler=profiler,
+                    method=method,
+                    **kwargs,
+                )
+            )(tree_stack(params))
         if data is None:
             data = {}
+        given = set(data.keys())
 
         p = "desc.equilibrium.equilibrium.Equilibrium"
         deps = set(
@@ -1083,6 +1111,7 @@ class Equilibrium(IOAble, Optimizable):
                 # If a dependency of something is already computed, use it
                 # instead of recomputing it on a potentially bad grid.
                 data=data0d_seed,
+                profiler=profiler,
                 **kwargs,
             )
             # These should all be 0d quantities so don't need to compress/expand.
@@ -1133,6 +1162,7 @@ class Equilibrium(IOAble, Optimizable):
                 # If a dependency of something is already computed, use it
                 # instead of recomputing it on a potentially bad grid.
                 data=data1dr_seed | data0d_seed,
+                profiler=profiler,
                 **kwargs,
             )
             # Need to make this data broadcast with the data on the original grid.
@@ -1183,6 +1213,7 @@ class Equilibrium(IOAble, Optimizable):
                 # If a dependency of something is already computed, use it
                 # instead of recomputing it on a potentially bad grid.
                 data=data1dz_seed | data0d_seed,
+                profiler=profiler,
                 **kwargs,
             )
             # Need to make this data broadcast with the data on the original grid.
@@ -1202,8 +1233,15 @@ class Equilibrium(IOAble, Optimizable):
             transforms=transforms,
             profiles=profiles,
             data=data,
+            evict=evict,
+            profiler=profiler,
             **kwargs,
         )
+        if evict:
+            # also drop the dependencies that were computed on other grids
+            data = {
+                key: val for key, val in data.items() if key in names or key in given
+            }
         return data
 
     def map_coordinates(
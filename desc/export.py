@@ -0,0 +1,200 @@
+"""Ahead-of-time exported objectives.
+
+An ``ObjectiveFunction`` (or ``LinearConstraintProjection``) that has been saved with
+``ObjectiveFunction.export`` can be loaded with ``load_exported`` and evaluated
+without importing the objectives or tracing any python code, which makes starting
+worker processes that only need to evaluate a fixed objective much faster.
+
+The exported file is a numpy ``.npz`` archive holding the serialized StableHLO of
+each exported method (from ``jax.export``), the arrays of the objective and its
+constants, which are passed to the exported methods as arguments, and the state
+vector of the objective when it was exported. Exporting requires
+``jax>=0.4.30`` and the ``absl-py`` and ``flatbuffers`` packages.
+"""
+
+import json
+
+import numpy as np
+
+from desc.backend import jit, jnp
+
+# bump when the layout of the exported file changes
+_EXPORT_VERSION = 1
+
+
+def _jax_export():
+    """Import ``jax.export``, with a clear error for versions of jax without it."""
+    try:
+        from jax import export
+    except ImportError as e:
+        import jax
+
+        raise ImportError(
+            "Exporting objectives requires jax>=0.4.30, which provides jax.export, "
+            + f"got jax {jax.__version__}."
+        ) from e
+    return export
+
+
+def save_exported(path, exported, leaves, x0, dim_f, name):
+    """Save exported methods of an objective to a file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        File to save to. Should end in ``.npz``.
+    exported : dict of jax.export.Exported
+        Exported methods, by name. Each should take the state vector and the list of
+        arrays ``leaves`` as arguments.
+    leaves : list of ndarray
+        Arrays of the objective and its constants.
+    x0 : ndarray
+        State vector of the objective when it was exported.
+    dim_f : int
+        Number of objective equations.
+    name : str
+        Name of the objective.
+
+    """
+    metadata = {
+        "version": _EXPORT_VERSION,
+        "methods": list(exported),
+        "num_leaves": len(leaves),
+        "dim_f": int(dim_f),
+        "name": name,
+    }
+    arrays = {f"leaf_{i}": np.asarray(leaf) for i, leaf in enumerate(leaves)}
+    arrays.update(
+        {
+            f"method_{key}": np.frombuffer(bytes(val.serialize()), dtype=np.uint8)
+            for key, val in exported.items()
+        }
+    )
+    np.savez(path, metadata=json.dumps(metadata), x0=np.asarray(x0), **arrays)
+
+
+def load_exported(path):
+    """Load an objective saved with ``ObjectiveFunction.export``.
+
+    Parameters
+    ----------
+    path : str or path-like
+        File to load from.
+
+    Returns
+    -------
+    objective : ExportedObjective
+        Objective with the exported methods.
+
+    """
+    export = _jax_export()
+
+    with np.load(path, allow_pickle=False) as f:
+        metadata = json.loads(str(f["metadata"]))
+        if metadata["version"] != _EXPORT_VERSION:
+            raise ValueError(
+                f"Exported objective has version {metadata['version']}, "
+                f"expected {_EXPORT_VERSION}."
+            )
+        leaves = [jnp.asarray(f[f"leaf_{i}"]) for i in range(metadata["num_leaves"])]
+        exported = {
+            key: export.deserialize(bytearray(f[f"method_{key}"].tobytes()))
+            for key in metadata["methods"]
+        }
+        x0 = jnp.asarray(f["x0"])
+    return ExportedObjective(exported, leaves, x0, metadata["dim_f"], metadata["name"])
+
+
+class ExportedObjective:
+    """Objective loaded from a file saved with ``ObjectiveFunction.export``.
+
+    The methods ``compute_scaled_error`` and ``jac_scaled_error`` take only the state
+    vector ``x``. The constants of the objective are fixed to the values they had
+    when it was exported.
+
+    Parameters
+    ----------
+    exported : dict of jax.export.Exported
+        Exported methods, by name.
+    leaves : list of jax.Array
+        Arrays of the objective and its constants.
+    x0 : jax.Array
+        State vector of the objective when it was exported.
+    dim_f : int
+        Number of objective equations.
+    name : str
+        Name of the objective.
+
+    """
+
+    def __init__(self, exported, leaves, x0, dim_f, name):
+        self._exported = exported
+        self._leaves = leaves
+        self._x0 = x0
+        self._dim_f = dim_f
+        self._name = name
+        self._funs = {key: jit(val.call) for key, val in exported.items()}
+
+    def _call(self, method, x):
+        if method not in self._funs:
+            raise ValueError(
+                f"{method} was not exported, exported methods are {self.methods}."
+            )
+        return self._funs[method](jnp.asarray(x), self._leaves)
+
+    def compute_scaled_error(self, x):
+        """Compute the objective function and apply weighting and bounds.
+
+        Parameters
+        ----------
+        x : ndarray
+            State vector.
+
+        Returns
+        -------
+        f : ndarray
+            Objective function value(s).
+
+        """
+        return self._call("compute_scaled_error", x)
+
+    def jac_scaled_error(self, x):
+        """Compute Jacobian matrix of compute_scaled_error wrt x.
+
+        Parameters
+        ----------
+        x : ndarray
+            State vector.
+
+        Returns
+        -------
+        J : ndarray
+            Jacobian matrix.
+
+        """
+        return self._call("jac_scaled_error", x)
+
+    @property
+    def methods(self):
+        """list: Names of the exported methods."""
+        return list(self._exported)
+
+    @property
+    def x0(self):
+        """jax.Array: State vector of the objective when it was exported."""
+        return self._x0
+
+    @property
+    def dim_x(self):
+        """int: Dimension of the state vector."""
+        return self._x0.size
+
+    @property
+    def dim_f(self):
+        """int: Number of objective equations."""
+        return self._dim_f
+
+    @property
+    def name(self):
+        """str: Name of the objective."""
+        return self._name
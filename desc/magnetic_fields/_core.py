@@ -18,7 +18,7 @@ from interpax import approx_df, interp1d, interp2d, interp3d
 from netCDF4 import Dataset, chartostring, stringtochar
 from scipy.constants import mu_0
 
-from desc.backend import jit, jnp, sign
+from desc.backend import jit, jnp, reduced_precision, sign
 from desc.basis import (
     ChebyshevDoubleFourierBasis,
     ChebyshevPolynomial,
@@ -47,6 +47,7 @@ from desc.utils import (
 from desc.vmec_utils import ptolemy_identity_fwd, ptolemy_identity_rev
 
 
+@reduced_precision
 def biot_savart_general(re, rs, J, dV=jnp.array([1.0]), chunk_size=None):
     """Biot-Savart law for arbitrary sources.
 
@@ -77,7 +78,7 @@ def biot_savart_general(re, rs, J, dV=jnp.array([1.0]), chunk_size=None):
 
     """
     re, rs, J, dV = map(jnp.asarray, (re, rs, J, dV))
-    JdV = J * dV[:, jnp.newaxis]
+    JdV = J * dV[:, jnp.newaxis].astype(J.dtype)
     assert JdV.shape == rs.shape
 
     def biot(re):
@@ -90,6 +91,7 @@ def biot_savart_general(re, rs, J, dV=jnp.array([1.0]), chunk_size=None):
     return batch_map(biot, re[..., jnp.newaxis, :], chunk_size)
 
 
+@reduced_precision
 def biot_savart_general_vector_potential(
     re, rs, J, dV=jnp.array([1.0]), chunk_size=None
 ):
@@ -122,7 +124,7 @@ def biot_savart_general_vector_potential(
 
     """
     re, rs, J, dV = map(jnp.asarray, (re, rs, J, dV))
-    JdV = J * dV[:, jnp.newaxis]
+    JdV = J * dV[:, jnp.newaxis].astype(J.dtype)
     assert JdV.shape == rs.shape
 
     def biot(re):
@@ -47,6 +47,7 @@ class ForceBalance(_Objective):
     _coordinates = "rtz"
     _units = "(N)"
     _print_value_fmt = "Force error: "
+    _fusable = True
 
     def __init__(
         self,
@@ -159,6 +160,7 @@ class ForceBalance(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         fr = data["F_rho"] * data["|grad(rho)|"] * data["sqrt(g)"]
         fb = data["F_helical"] * data["|e^helical*sqrt(g)|"]
@@ -202,6 +204,7 @@ class ForceBalanceAnisotropic(_Objective):
     _coordinates = "rtz"
     _equilibrium = True
     _print_value_fmt = "Anisotropic force error: "
+    _fusable = True
 
     def __init__(
         self,
@@ -308,6 +311,7 @@ class ForceBalanceAnisotropic(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         f = (data["sqrt(g)"] * data["F_anisotropic"].T).T
 
@@ -339,6 +343,7 @@ class RadialForceBalance(_Objective):
     _coordinates = "rtz"
     _units = "(N)"
     _print_value_fmt = "Radial force error: "
+    _fusable = True
 
     def __init__(
         self,
@@ -445,6 +450,7 @@ class RadialForceBalance(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["F_rho"] * data["|grad(rho)|"] * data["sqrt(g)"]
 
@@ -476,6 +482,7 @@ class HelicalForceBalance(_Objective):
     _coordinates = "rtz"
     _units = "(N)"
     _print_value_fmt = "Helical force error: "
+    _fusable = True
 
     def __init__(
         self,
@@ -582,6 +589,7 @@ class HelicalForceBalance(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["F_helical"] * data["|e^helical|"] * data["sqrt(g)"]
 
@@ -612,6 +620,8 @@ class Energy(_Objective):
     _equilibrium = True
     _units = "(J)"
     _print_value_fmt = "Total MHD energy: "
+    _fusable = True
+    _fusion_kwargs = ("gamma",)
     _io_attrs_ = _Objective._io_attrs_ + ["gamma"]
 
     def __init__(
@@ -721,6 +731,7 @@ class Energy(_Objective):
             transforms=constants["transforms"],
             profiles=constants["profiles"],
             gamma=constants["gamma"],
+            data=constants.get("data"),
         )
         return data["W"]
 
@@ -757,6 +768,7 @@ class CurrentDensity(_Objective):
     _coordinates = "rtz"
     _units = "(A*m)"
     _print_value_fmt = "Current density: "
+    _fusable = True
 
     def __init__(
         self,
@@ -863,6 +875,7 @@ class CurrentDensity(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         jr = data["J^rho"] * data["sqrt(g)"]
         jt = data["J^theta"] * data["sqrt(g)"]
@@ -48,6 +48,21 @@ class ExternalObjective(_Objective):
     rel_step : float, optional
         Relative finite difference step size. Default = 0.
         Total step size is ``abs_step + rel_step * mean(abs(x))``.
+    max_workers : int, optional
+        Number of finite difference evaluations of ``fun`` to run in parallel when
+        computing the Jacobian. Default is to evaluate ``fun`` sequentially. Requires
+        ``vectorized=False``. Each chunk of ``jac_chunk_size`` columns of the Jacobian
+        is split between the workers, so the chunk size should be at least
+        ``max_workers``.
+    executor : {"thread", "process"} or concurrent.futures.Executor, optional
+        Pool to run the evaluations in. Threads are enough when ``fun`` runs an
+        external program, otherwise use processes, which requires ``fun`` to be
+        picklable (ie defined at the top level of a module). Default = "thread".
+    scratch_dir : str or path-like, optional
+        If given, each worker gets its own subdirectory ``scratch_dir/worker_<k>``,
+        which is passed to ``fun`` as the keyword argument ``scratch_dir``. Use it for
+        input and output files of the external code, so that evaluations running at
+        the same time do not overwrite each other.
 
     """
 
@@ -72,13 +87,24 @@ class ExternalObjective(_Objective):
         myobj = ExternalObjective(
             eq=eq, fun=myfun, dim_f=1, fun_kwargs={"path": "temp.h5"}, vectorized=False,
         )
-    )
+
+        # the same, but running 4 evaluations at a time, each in its own directory
+        def myfun(eq, scratch_dir):
+            path = os.path.join(scratch_dir, "temp.h5")
+            eq.save(path)
+            eq = load(path)
+            data = eq.compute("<beta>_vol")
+            return data["<beta>_vol"]
+
+        myobj = ExternalObjective(
+            eq=eq, fun=myfun, dim_f=1, max_workers=4, scratch_dir="scratch",
+        )
 
     """
 
     _units = "(Unknown)"
     _print_value_fmt = "External objective value: "
-    _static_attrs = ["_fun_wrapped", "_fun_kwargs"]
+    _static_attrs = ["_fun_wrapped", "_fun_kwargs", "_executor", "_scratch_dir"]
 
     def __init__(
         self,
@@ -90,6 +116,9 @@ class ExternalObjective(_Objective):
         vectorized=False,
         abs_step=1e-4,
         rel_step=0,
+        max_workers=None,
+        executor="thread",
+        scratch_dir=None,
         target=None,
         bounds=None,
         weight=1,
@@ -107,6 +136,9 @@ class ExternalObjective(_Objective):
         self._vectorized = vectorized
         self._abs_step = abs_step
         self._rel_step = rel_step
+        self._max_workers = max_workers
+        self._executor = executor
+        self._scratch_dir = scratch_dir
         super().__init__(
             things=eq,
             target=target,
@@ -133,34 +165,23 @@ class ExternalObjective(_Objective):
         self._scalar = self._dim_f == 1
         self._constants = {"quad_weights": 1.0}
 
-        def fun_wrapped(params):
-            """Wrap external function with possibly vectorized params."""
-            # number of equilibria for vectorized computations
-            param_shape = params["Psi"].shape
-            num_eq = param_shape[0] if len(param_shape) > 1 else 1
-
-            # convert params to list of equilibria
-            eqs = [self._eq.copy() for _ in range(num_eq)]
-            for k, eq in enumerate(eqs):
-                # update equilibria with new params
-                for param_key in self._eq.optimizable_params:
-                    param_value = np.atleast_2d(params[param_key])[k, :]
-                    if len(param_value):
-                        setattr(eq, param_key, param_value)
-
-            # call external function on equilibrium or list of equilibria
-            if not self._vectorized:
-                eqs = eqs[0]
-            return self._fun(eqs, **self._fun_kwargs)
+        # shut down the worker pool of a previous build, which would otherwise stay
+        # alive as long as anything holds on to the old wrapped function
+        close = getattr(getattr(self, "_fun_wrapped", None), "close", None)
+        if close is not None:
+            close()
 
         # wrap external function to work with JAX
         abstract_eval = lambda *args, **kwargs: jnp.empty(self._dim_f)
         self._fun_wrapped = jaxify(
-            fun_wrapped,
+            _ExternalFunction(self._eq, self._fun, self._fun_kwargs, self._vectorized),
             abstract_eval,
             vectorized=self._vectorized,
             abs_step=self._abs_step,
             rel_step=self._rel_step,
+            max_workers=self._max_workers,
+            executor=self._executor,
+            scratch_dir=self._scratch_dir,
         )
 
         super().build(use_jit=use_jit, verbose=verbose)
@@ -185,6 +206,42 @@ class ExternalObjective(_Objective):
         return f
 
 
+class _ExternalFunction:
+    """Wrap external function with possibly vectorized params.
+
+    This is a class rather than a closure so that it can be pickled and sent to
+    worker processes.
+    """
+
+    def __init__(self, eq, fun, fun_kwargs, vectorized):
+        self._eq = eq
+        self._fun = fun
+        self._fun_kwargs = fun_kwargs
+        self._vectorized = vectorized
+
+    def __call__(self, params, scratch_dir=None):
+        # number of equilibria for vectorized computations
+        param_shape = params["Psi"].shape
+        num_eq = param_shape[0] if len(param_shape) > 1 else 1
+
+        # convert params to list of equilibria
+        eqs = [self._eq.copy() for _ in range(num_eq)]
+        for k, eq in enumerate(eqs):
+            # update equilibria with new params
+            for param_key in self._eq.optimizable_params:
+                param_value = np.atleast_2d(params[param_key])[k, :]
+                if len(param_value):
+                    setattr(eq, param_key, param_value)
+
+        # call external function on equilibrium or list of equilibria
+        if not self._vectorized:
+            eqs = eqs[0]
+        kwargs = self._fun_kwargs
+        if scratch_dir is not None:
+            kwargs = dict(kwargs, scratch_dir=scratch_dir)
+        return self._fun(eqs, **kwargs)
+
+
 class GenericObjective(_Objective):
     """A generic objective that can compute any quantity from the `data_index`.
 
@@ -40,6 +40,7 @@ class AspectRatio(_Objective):
     _scalar = True
     _units = "(dimensionless)"
     _print_value_fmt = "Aspect ratio: "
+    _fusable = True
 
     def __init__(
         self,
@@ -151,6 +152,7 @@ class AspectRatio(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["R0/a"]
 
@@ -183,6 +185,7 @@ class Elongation(_Objective):
     _scalar = True
     _units = "(dimensionless)"
     _print_value_fmt = "Elongation: "
+    _fusable = True
 
     def __init__(
         self,
@@ -294,6 +297,7 @@ class Elongation(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return self._constants["transforms"]["grid"].compress(
             data["a_major/a_minor"], surface_label="zeta"
@@ -324,6 +328,7 @@ class Volume(_Objective):
     _scalar = True
     _units = "(m^3)"
     _print_value_fmt = "Plasma volume: "
+    _fusable = True
 
     def __init__(
         self,
@@ -439,6 +444,7 @@ class Volume(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["V"]
 
@@ -838,6 +844,7 @@ class MeanCurvature(_Objective):
     _coordinates = "rtz"
     _units = "(m^-1)"
     _print_value_fmt = "Mean curvature: "
+    _fusable = True
 
     def __init__(
         self,
@@ -942,6 +949,7 @@ class MeanCurvature(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["curvature_H_rho"]
 
@@ -978,6 +986,7 @@ class PrincipalCurvature(_Objective):
     _coordinates = "rtz"
     _units = "(m^-1)"
     _print_value_fmt = "Principal curvature: "
+    _fusable = True
 
     def __init__(
         self,
@@ -1082,6 +1091,7 @@ class PrincipalCurvature(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return jnp.maximum(
             jnp.abs(data["curvature_k1_rho"]), jnp.abs(data["curvature_k2_rho"])
@@ -1113,6 +1123,7 @@ class BScaleLength(_Objective):
     _coordinates = "rtz"
     _units = "(m)"
     _print_value_fmt = "Magnetic field scale length: "
+    _fusable = True
 
     def __init__(
         self,
@@ -1211,6 +1222,7 @@ class BScaleLength(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["L_grad(B)"]
 
@@ -1383,6 +1395,7 @@ class MirrorRatio(_Objective):
     _coordinates = "r"
     _units = "(dimensionless)"
     _print_value_fmt = "Mirror ratio: "
+    _fusable = True
 
     def __init__(
         self,
@@ -1493,5 +1506,6 @@ class MirrorRatio(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return constants["transforms"]["grid"].compress(data["mirror ratio"])
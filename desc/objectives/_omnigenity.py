@@ -231,6 +231,8 @@ class QuasisymmetryTwoTerm(_Objective):
     _coordinates = "rtz"
     _units = "(T^3)"
     _print_value_fmt = "Quasi-symmetry two-term error: "
+    _fusable = True
+    _fusion_kwargs = ("helicity",)
 
     def __init__(
         self,
@@ -350,6 +352,7 @@ class QuasisymmetryTwoTerm(_Objective):
             transforms=constants["transforms"],
             profiles=constants["profiles"],
             helicity=constants["helicity"],
+            data=constants.get("data"),
         )
         return data["f_C"]
 
@@ -394,6 +397,7 @@ class QuasisymmetryTripleProduct(_Objective):
     _coordinates = "rtz"
     _units = "(T^4/m^2)"
     _print_value_fmt = "Quasi-symmetry error: "
+    _fusable = True
 
     def __init__(
         self,
@@ -492,6 +496,7 @@ class QuasisymmetryTripleProduct(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["f_T"]
 
@@ -871,6 +876,7 @@ class Isodynamicity(_Objective):
     _coordinates = "rtz"
     _units = "(dimensionless)"
     _print_value_fmt = "Isodynamicity error: "
+    _fusable = True
 
     def __init__(
         self,
@@ -965,5 +971,6 @@ class Isodynamicity(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return data["isodynamicity"]
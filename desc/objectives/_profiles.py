@@ -48,6 +48,7 @@ class Pressure(_Objective):
     _coordinates = "r"
     _units = "(Pa)"
     _print_value_fmt = "Pressure: "
+    _fusable = True
 
     def __init__(
         self,
@@ -155,6 +156,7 @@ class Pressure(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return constants["transforms"]["grid"].compress(data["p"])
 
@@ -183,6 +185,7 @@ class RotationalTransform(_Objective):
     _coordinates = "r"
     _units = "(dimensionless)"
     _print_value_fmt = "Rotational transform: "
+    _fusable = True
 
     def __init__(
         self,
@@ -301,6 +304,7 @@ class RotationalTransform(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return constants["transforms"]["grid"].compress(data["iota"])
 
@@ -331,6 +335,7 @@ class Shear(_Objective):
     _coordinates = "r"
     _units = "(dimensionless)"
     _print_value_fmt = "Shear: "
+    _fusable = True
 
     def __init__(
         self,
@@ -447,6 +452,7 @@ class Shear(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return constants["transforms"]["grid"].compress(data["shear"])
 
@@ -471,6 +477,7 @@ class ToroidalCurrent(_Objective):
     _coordinates = "r"
     _units = "(A)"
     _print_value_fmt = "Toroidal current: "
+    _fusable = True
 
     def __init__(
         self,
@@ -593,5 +600,6 @@ class ToroidalCurrent(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return constants["transforms"]["grid"].compress(data["current"])
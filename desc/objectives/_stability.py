@@ -59,6 +59,7 @@ class MercierStability(_Objective):
     _coordinates = "r"
     _units = "(Wb^-2)"
     _print_value_fmt = "Mercier Stability: "
+    _fusable = True
 
     def __init__(
         self,
@@ -181,6 +182,7 @@ class MercierStability(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return constants["transforms"]["grid"].compress(data["D_Mercier"])
 
@@ -217,6 +219,7 @@ class MagneticWell(_Objective):
     _coordinates = "r"
     _units = "(dimensionless)"
     _print_value_fmt = "Magnetic Well: "
+    _fusable = True
 
     def __init__(
         self,
@@ -335,6 +338,7 @@ class MagneticWell(_Objective):
             params=params,
             transforms=constants["transforms"],
             profiles=constants["profiles"],
+            data=constants.get("data"),
         )
         return constants["transforms"]["grid"].compress(data["magnetic well"])
 
@@ -1,13 +1,21 @@
 """Base classes for objectives."""
 
 import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
 from abc import ABC, abstractmethod
 
 import numpy as np
 
+from desc import __version__
 from desc.backend import (
+    compilation_cache_stats,
     desc_config,
     execute_on_cpu,
+    jax,
     jit,
     jnp,
     tree_flatten,
@@ -16,6 +24,8 @@ from desc.backend import (
     use_jax,
 )
 from desc.batching import batched_vectorize
+from desc.compute import get_profiles, get_transforms
+from desc.compute.utils import _compute as compute_fun
 from desc.derivatives import Derivative
 from desc.io import IOAble
 from desc.optimizable import Optimizable
@@ -32,6 +42,8 @@ from desc.utils import (
     warnif,
 )
 
+from .utils import color_columns
+
 doc_target = """
     target : {float, ndarray}, optional
         Target value(s) of the objective. Only used if ``bounds`` is ``None``.
@@ -199,7 +211,7 @@ class ObjectiveFunction(IOAble):
         List of objectives to be minimized.
     use_jit : bool, optional
         Whether to just-in-time compile the objectives and derivatives.
-    deriv_mode : {"auto", "batched", "blocked"}
+    deriv_mode : {"auto", "batched", "blocked", "sparse"}
         Method for computing Jacobian matrices. ``batched`` uses forward mode, applied
         to the entire objective at once, and is generally the fastest for vector
         valued objectives. Its memory intensity vs. speed may be traded off through
@@ -207,6 +219,14 @@ class ObjectiveFunction(IOAble):
         each objective separately, using each objective's preferred AD mode (and
         each objective's `jac_chunk_size`). Generally the most efficient option when
         mixing scalar and vector valued objectives.
+        ``sparse`` is like ``batched``, but detects the sparsity pattern of the
+        Jacobian when the objective is built, and groups columns that have no
+        nonzero rows in common, so that only one Jacobian-vector product is needed
+        per group instead of one per column. Can be much faster for objectives with
+        very sparse Jacobians, such as coil objectives on a large ``CoilSet``.
+        Detecting the pattern costs about 3 Jacobians at build, and the pattern is
+        assumed to be the same at every state: entries that are zero at the states
+        probed at build are never computed.
         ``auto`` defaults to ``batched`` if all sub-objectives are set to ``fwd``,
         otherwise ``blocked``.
     name : str
@@ -224,10 +244,23 @@ class ObjectiveFunction(IOAble):
         Can also help with Hessian computation memory, as Hessian is essentially
         ``jacfwd(jacrev(f))``, and each of these operations may be chunked.
         Defaults to ``chunk_size="auto"``.
+        For large problems, ``auto`` compiles the Jacobian for a few chunk sizes and
+        uses the largest one whose measured peak memory fits in
+        ``desc.config["jac_mem_budget"]`` (in GB), which defaults to the available
+        device memory. The fastest chunk size is only chosen if
+        ``desc.config["jac_chunk_timing"]`` is set. The chosen size is cached, see
+        ``desc.config["cache_dir"]``.
         Note: When running on a CPU (not a GPU) on a HPC cluster, DESC is unable to
-        accurately estimate the available device memory, so the "auto" chunk_size
-        option will yield a larger chunk size than may be needed. It is recommended
-        to manually choose a chunk_size if an OOM error is experienced in this case.
+        accurately estimate the available device memory, so it is recommended to set
+        ``desc.config["jac_mem_budget"]`` (or the environment variable
+        ``DESC_JAC_MEM_BUDGET``) if an OOM error is experienced in this case.
+    fuse : bool, optional
+        Whether to fuse the computation of sub-objectives that compute quantities of
+        the same thing on equivalent grids. The quantities needed by each group of
+        such sub-objectives are computed together once, sharing intermediate
+        quantities such as basis vectors and metric elements, and each
+        sub-objective is handed the data it requested. This replaces the transforms
+        and constants of the fused sub-objectives at build. Default is False.
 
     """
 
@@ -240,6 +273,7 @@ class ObjectiveFunction(IOAble):
         deriv_mode="auto",
         name="ObjectiveFunction",
         jac_chunk_size="auto",
+        fuse=False,
     ):
         if not isinstance(objectives, (tuple, list)):
             objectives = (objectives,)
@@ -257,10 +291,12 @@ class ObjectiveFunction(IOAble):
             )
             deriv_mode = "batched"
             jac_chunk_size = 1
-        assert deriv_mode in {"auto", "batched", "blocked"}
+        assert deriv_mode in {"auto", "batched", "blocked", "sparse"}
         assert jac_chunk_size in ["auto", None] or isposint(jac_chunk_size)
+        assert fuse in {True, False}
 
         self._jac_chunk_size = jac_chunk_size
+        self._fuse = fuse
         self._objectives = objectives
         self._use_jit = use_jit
         self._deriv_mode = deriv_mode
@@ -279,7 +315,9 @@ class ObjectiveFunction(IOAble):
             "jac_scaled_error",
             "jac_unscaled",
             "hess",
+            "hvp",
             "grad",
+            "jac_sparse",
             "jvp_scaled",
             "jvp_scaled_error",
             "jvp_unscaled",
@@ -326,13 +364,14 @@ class ObjectiveFunction(IOAble):
             self._scalar = False
 
         self._set_things()
+        self._set_fused_groups(verbose=verbose)
 
         # setting derivative mode and chunking.
         errorif(
             isposint(self._jac_chunk_size) and self._deriv_mode in ["auto", "blocked"],
             ValueError,
             "'jac_chunk_size' was passed into ObjectiveFunction, but the "
-            "ObjectiveFunction is not using 'batched' deriv_mode",
+            "ObjectiveFunction is not using 'batched' or 'sparse' deriv_mode",
         )
         sub_obj_jac_chunk_sizes_are_ints = [
             isposint(obj._jac_chunk_size) for obj in self.objectives
@@ -341,11 +380,13 @@ class ObjectiveFunction(IOAble):
             (obj.__class__.__name__, obj._jac_chunk_size) for obj in self.objectives
         ]
         errorif(
-            any(sub_obj_jac_chunk_sizes_are_ints) and self._deriv_mode == "batched",
+            any(sub_obj_jac_chunk_sizes_are_ints)
+            and self._deriv_mode in ["batched", "sparse"],
             ValueError,
             "'jac_chunk_size' was passed into one or more sub-objectives, but the\n"
-            "ObjectiveFunction is using 'batched' deriv_mode, so sub-objective \n"
-            "'jac_chunk_size' will be ignored in favor of the ObjectiveFunction's \n"
+            f"ObjectiveFunction is using '{self._deriv_mode}' deriv_mode, so \n"
+            "sub-objective 'jac_chunk_size' will be ignored in favor of the \n"
+            "ObjectiveFunction's "
             f"'jac_chunk_size' of {self._jac_chunk_size}.\n"
             "Specify 'blocked' deriv_mode and don't pass `jac_chunk_size` for \n"
             "ObjectiveFunction if each sub-objective is desired to have a \n"
@@ -365,30 +406,166 @@ class ObjectiveFunction(IOAble):
             else:
                 self._deriv_mode = "blocked"
 
+        auto_chunk_objectives = None
         if self._jac_chunk_size == "auto":
+            # sub-objectives without a chunk size of their own are tuned along with
+            # the ObjectiveFunction when using blocked mode
+            auto_chunk_objectives = (
+                [obj for obj in self.objectives if obj._jac_chunk_size is None]
+                if self._deriv_mode == "blocked"
+                else []
+            )
             # Heuristic estimates of fwd mode Jacobian memory usage,
             # slightly conservative, based on using ForceBalance as the objective
             estimated_memory_usage = 2.4e-7 * self.dim_f * self.dim_x + 1  # in GB
+            budget = desc_config.get("jac_mem_budget") or desc_config.get("avail_mem")
             max_chunk_size = round(
-                (desc_config.get("avail_mem") / estimated_memory_usage - 0.22)
-                / 0.85
-                * self.dim_x
+                (budget / estimated_memory_usage - 0.22) / 0.85 * self.dim_x
             )
-            self._jac_chunk_size = max([1, max_chunk_size])
-            if self._deriv_mode == "blocked":
-                for obj in self.objectives:
-                    if obj._jac_chunk_size is None:
-                        obj._jac_chunk_size = self._jac_chunk_size
+            self._set_jac_chunk_size(max([1, max_chunk_size]), auto_chunk_objectives)
 
         if not self.use_jit:
             self._unjit()
 
         self._built = True
 
+        if self._deriv_mode == "sparse":
+            self._set_jac_sparsity(verbose=verbose)
+
+        if auto_chunk_objectives is not None:
+            self._tune_jac_chunk_size(auto_chunk_objectives, verbose=verbose)
+
         timer.stop("Objective build")
         if verbose > 1:
             timer.disp("Objective build")
 
+    def _set_jac_chunk_size(self, chunk_size, objectives=()):
+        """Set jac_chunk_size of self and of the given sub-objectives."""
+        self._jac_chunk_size = chunk_size
+        for obj in objectives:
+            obj._jac_chunk_size = chunk_size
+
+    def _tune_jac_chunk_size(self, objectives=(), verbose=1):
+        """Choose jac_chunk_size from the measured memory usage of the Jacobian.
+
+        The candidate chunk sizes split the columns into 1, 2, 4, ... equal chunks.
+        Since peak memory grows with the chunk size, the candidates are bisected,
+        compiling the Jacobian for each one tried and reading its peak memory from
+        XLA, to find the largest chunk size within ``desc.config["jac_mem_budget"]``
+        (which defaults to the available device memory). By default that largest
+        chunk size is used, which is usually but not always the fastest. Only if
+        ``desc.config["jac_chunk_timing"]`` is set are it and a few smaller
+        candidates also timed, and the fastest one used. The result is cached
+        in ``desc.config["cache_dir"]``, so later builds of the same objective skip
+        the search. Keeps the heuristic chunk size if the Jacobian is small compared
+        to the budget, or if the backend does not report memory usage.
+
+        Parameters
+        ----------
+        objectives : list of _Objective
+            Sub-objectives that get the same chunk size, when using blocked mode.
+        verbose : int, optional
+            Level of output.
+
+        """
+        budget = desc_config.get("jac_mem_budget") or desc_config.get("avail_mem")
+        # same heuristic as above, with a large safety factor
+        if (
+            not use_jax
+            or self._scalar
+            or 16 * 2.4e-7 * self.dim_f * self.dim_x < budget
+        ):
+            return
+        timing = bool(desc_config.get("jac_chunk_timing"))
+        path, key = _jac_chunk_size_cache_path(self, objectives, budget, timing)
+        chunk_size = _load_jac_chunk_size(path, key)
+        if chunk_size is None:
+            timer = Timer()
+            timer.start("jac_chunk_size search")
+            heuristic = self._jac_chunk_size
+            with jax.default_device(jax.devices()[0]):
+                chunk_size = self._search_jac_chunk_size(
+                    objectives, budget * 1024**3, timing
+                )
+            timer.stop("jac_chunk_size search")
+            if verbose > 1:
+                timer.disp("jac_chunk_size search")
+            if chunk_size is None:
+                self._set_jac_chunk_size(heuristic, objectives)
+                return
+            _save_jac_chunk_size(path, key, chunk_size)
+        self._set_jac_chunk_size(chunk_size, objectives)
+        if verbose > 0:
+            print(f"Using jac_chunk_size={chunk_size} for a {budget:.2f} GB budget")
+
+    def _search_jac_chunk_size(self, objectives, budget, timing):
+        """Find the best jac_chunk_size for a memory budget in bytes."""
+        dim_x = self.dim_x
+        x = self.x(*self.things)
+        constants = self.constants
+        compiled = {}
+        leaves = {}
+        peaks = {}
+
+        def peak_memory(chunk_size):
+            if chunk_size not in peaks:
+                self._set_jac_chunk_size(chunk_size, objectives)
+                # the objective and constants hold non-array data, so we compile a
+                # function of the flattened arrays only
+                leaves[chunk_size], treedef = tree_flatten((self, x, constants))
+                jac = jit(
+                    lambda leaves, treedef=treedef: (
+                        lambda obj, x, constants: obj.jac_scaled_error(x, constants)
+                    )(*tree_unflatten(treedef, leaves))
+                )
+                compiled[chunk_size] = jac.lower(leaves[chunk_size]).compile()
+                try:
+                    stats = compiled[chunk_size].memory_analysis()
+                except NotImplementedError:
+                    stats = None
+                peaks[chunk_size] = (
+                    None
+                    if stats is None
+                    else stats.temp_size_in_bytes
+                    + stats.argument_size_in_bytes
+                    + stats.output_size_in_bytes
+                    - stats.alias_size_in_bytes
+                )
+            return peaks[chunk_size]
+
+        # candidates split the Jacobian into 1, 2, 4, ... equal chunks. Memory usage
+        # is roughly m0 + m1 * chunk_size, so we bisect for the largest that fits.
+        candidates = sorted(
+            {-(-dim_x // 2**k) for k in range(int(np.log2(dim_x)) + 2)}, reverse=True
+        )
+        lo, hi = 0, len(candidates) - 1
+        if peak_memory(candidates[hi // 2]) is None:
+            return None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if peak_memory(candidates[mid]) <= budget:
+                hi = mid
+            else:
+                lo = mid + 1
+        chunk_size = candidates[lo]
+        warnif(
+            peak_memory(chunk_size) > budget,
+            UserWarning,
+            f"Jacobian needs {peak_memory(chunk_size) / 1024**3:.2f} GB with "
+            f"jac_chunk_size=1, more than the {budget / 1024**3:.2f} GB budget.",
+        )
+        if not timing:
+            return chunk_size
+
+        times = {}
+        for c in candidates[lo : lo + 3]:
+            peak_memory(c)
+            compiled[c](leaves[c]).block_until_ready()
+            t0 = time.perf_counter()
+            compiled[c](leaves[c]).block_until_ready()
+            times[c] = time.perf_counter() - t0
+        return min(times, key=times.get)
+
     def _set_things(self, things=None):
         """Tell the ObjectiveFunction what things it is optimizing.
 
@@ -430,6 +607,164 @@ class ObjectiveFunction(IOAble):
         self._unflatten = _ThingUnflattener(len(unique_), inds_, treedef_)
         self._flatten = _ThingFlattener(len(flat_), treedef_)
 
+    def _set_fused_groups(self, verbose=1):
+        """Find groups of sub-objectives whose compute can be fused.
+
+        Sub-objectives that opt in with ``_fusable`` are grouped if they compute
+        quantities of the same thing on equivalent grids. Members of a group share a
+        single set of transforms built for the union of their data keys, and the
+        data for a group is computed in one call by ``_compute_fused_data``.
+        """
+        self._fused_groups = []
+        if not self.__dict__.setdefault("_fuse", False):
+            return
+
+        groups = []
+        for i, obj in enumerate(self.objectives):
+            if not (obj._fusable and len(obj.things) == 1):
+                continue
+            constants = obj.constants
+            grid = constants["transforms"]["grid"]
+            for group in groups:
+                other = self.objectives[group[0]]
+                other_grid = other.constants["transforms"]["grid"]
+                if (
+                    obj.things[0] is other.things[0]
+                    and (grid is other_grid or grid.equiv(other_grid))
+                    and all(
+                        np.array_equal(constants[key], member.constants[key])
+                        for member in (self.objectives[j] for j in group)
+                        for key in set(obj._fusion_kwargs).intersection(
+                            member._fusion_kwargs
+                        )
+                    )
+                ):
+                    group.append(i)
+                    break
+            else:
+                groups.append([i])
+
+        for group in filter(lambda group: len(group) > 1, groups):
+            objectives = [self.objectives[i] for i in group]
+            keys = unique_list(flatten_list([obj._data_keys for obj in objectives]))[0]
+            self._fused_groups.append((tuple(group), tuple(keys)))
+            transforms = objectives[0].constants["transforms"]
+            if all(obj.constants["transforms"] is transforms for obj in objectives):
+                continue  # already fused by a previous build
+            if verbose > 0:
+                print(
+                    "Fusing compute of objectives: "
+                    + f"{[obj.name for obj in objectives]}"
+                )
+            thing = objectives[0].things[0]
+            grid = transforms["grid"]
+            transforms = get_transforms(keys, obj=thing, grid=grid)
+            profiles = get_profiles(keys, obj=thing, grid=grid)
+            for obj in objectives:
+                obj.constants["transforms"] = transforms
+                obj.constants["profiles"] = profiles
+
+    def _set_jac_sparsity(self, verbose=1, num_points=3):
+        """Detect the sparsity pattern of the Jacobian and color its columns.
+
+        The pattern is the union of the entries of the Jacobian that are nonzero at
+        the current state or at ``num_points - 1`` random perturbations of it. The
+        Jacobian is computed a few columns at a time, so that only the boolean
+        pattern is ever held for all columns. At the current state the tangents are
+        scaled by NaN, which also marks entries whose derivative happens to vanish
+        there because of a multiplication by zero. NaN does not propagate through
+        the branch of ``jnp.where`` that isn't selected, or through custom
+        derivative rules like those of ``safenorm`` and ``safediv``, so entries that
+        only depend on a variable through those are found at the perturbed states.
+
+        The pattern is assumed to be the same at every state. Entries that are zero
+        at all of the probed states are treated as structurally zero, so if the
+        Jacobian gains nonzero entries elsewhere, ``deriv_mode="sparse"`` will miss
+        them.
+        """
+        errorif(
+            not use_jax,
+            ValueError,
+            "deriv_mode='sparse' requires JAX to detect the Jacobian sparsity.",
+        )
+        timer = Timer()
+        timer.start("Jacobian sparsity detection")
+        x = self.x()
+        # columns per JVP, so that each chunk of the Jacobian takes at most ~32 MB
+        chunk_size = min(self.dim_x, max(1, 2**22 // max(self.dim_f, 1)))
+        if isinstance(self._jac_chunk_size, int):
+            chunk_size = min(chunk_size, self._jac_chunk_size)
+        rng = np.random.default_rng(0)
+        scale = 1e-2 * (np.abs(x) + np.mean(np.abs(x)) + 1e-2)
+        sparsity = np.zeros((self.dim_f, self.dim_x), dtype=bool)
+        for k in range(num_points):
+            xk = x if k == 0 else x + scale * rng.standard_normal(x.size)
+            value = jnp.nan if k == 0 else 1.0
+            for start in range(0, self.dim_x, chunk_size):
+                # pad the last chunk, so that every chunk has the same shape
+                cols = np.arange(start, start + chunk_size) % self.dim_x
+                v = (
+                    jnp.zeros((chunk_size, self.dim_x))
+                    .at[np.arange(chunk_size), cols]
+                    .set(value)
+                )
+                J = np.asarray(self.jvp_unscaled(v, xk)).T
+                sparsity[:, cols] |= (J != 0) | np.isnan(J)
+        colors = color_columns(sparsity)
+        # these are traced, so the compressed Jacobian doesn't depend on the pattern
+        # at compile time, only the number of colors does
+        self._jac_rows, self._jac_cols = map(jnp.asarray, np.nonzero(sparsity))
+        self._jac_colors = jnp.asarray(colors)
+        self._jac_num_colors = int(colors.max(initial=-1) + 1)
+        timer.stop("Jacobian sparsity detection")
+        if verbose > 0:
+            print(
+                f"Jacobian has {self._jac_rows.size} nonzero entries "
+                f"({self._jac_rows.size / max(sparsity.size, 1):.2%}), computing it "
+                f"with {self._jac_num_colors} JVPs instead of {self.dim_x}"
+            )
+        if verbose > 1:
+            timer.disp("Jacobian sparsity detection")
+
+    def _compute_fused_data(self, params, constants):
+        """Compute the data of each fused group and add it to each member's constants.
+
+        Parameters
+        ----------
+        params : list
+            Parameters for each sub-objective, as returned by ``unpack_state``.
+        constants : list
+            Constant parameters passed to sub-objectives.
+
+        Returns
+        -------
+        constants : list
+            Constant parameters passed to sub-objectives, where the constants of
+            each member of a fused group hold the data of that group under ``"data"``.
+
+        """
+        constants = list(constants)
+        for group, keys in self._fused_groups:
+            kwargs = {}
+            for i in group:
+                kwargs.update(
+                    {
+                        key: constants[i][key]
+                        for key in self.objectives[i]._fusion_kwargs
+                    }
+                )
+            data = compute_fun(
+                self.objectives[group[0]].things[0],
+                list(keys),
+                params=params[group[0]][0],
+                transforms=constants[group[0]]["transforms"],
+                profiles=constants[group[0]]["profiles"],
+                **kwargs,
+            )
+            for i in group:
+                constants[i] = dict(constants[i], data=data)
+        return constants
+
     @jit
     def compute_unscaled(self, x, constants=None):
         """Compute the raw value of the objective function.
@@ -451,6 +786,7 @@ class ObjectiveFunction(IOAble):
         if constants is None:
             constants = self.constants
         assert len(params) == len(constants) == len(self.objectives)
+        constants = self._compute_fused_data(params, constants)
         f = jnp.concatenate(
             [
                 obj.compute_unscaled(*par, constants=const)
@@ -480,6 +816,7 @@ class ObjectiveFunction(IOAble):
         if constants is None:
             constants = self.constants
         assert len(params) == len(constants) == len(self.objectives)
+        constants = self._compute_fused_data(params, constants)
         f = jnp.concatenate(
             [
                 obj.compute_scaled(*par, constants=const)
@@ -509,6 +846,7 @@ class ObjectiveFunction(IOAble):
         if constants is None:
             constants = self.constants
         assert len(params) == len(constants) == len(self.objectives)
+        constants = self._compute_fused_data(params, constants)
         f = jnp.concatenate(
             [
                 obj.compute_scaled_error(*par, constants=const)
@@ -684,24 +1022,104 @@ class ObjectiveFunction(IOAble):
             Derivative(self.compute_scalar, mode="hess")(x, constants).squeeze()
         )
 
+    @jit
+    def hvp(self, v, x, constants=None):
+        """Compute Hessian-vector product of self.compute_scalar.
+
+        Uses forward mode differentiation of the reverse mode gradient, so the cost is
+        a small multiple of the cost of the gradient and the Hessian is never formed.
+
+        Parameters
+        ----------
+        v : ndarray
+            Vector to right-multiply the Hessian by.
+        x : ndarray
+            Optimization variables.
+        constants : list
+            Constant parameters passed to sub-objectives.
+
+        Returns
+        -------
+        Hv : ndarray
+            Hessian-vector product.
+
+        """
+        if constants is None:
+            constants = self.constants
+        grad = lambda x: jnp.atleast_1d(
+            Derivative(self.compute_scalar, mode="grad")(x, constants).squeeze()
+        )
+        return Derivative.compute_jvp(grad, 0, v, x)
+
     @jit
     def jac_scaled(self, x, constants=None):
         """Compute Jacobian matrix of self.compute_scaled wrt x."""
+        if self._deriv_mode == "sparse":
+            return self._jac_sparse_to_dense(x, constants, "scaled")
         v = jnp.eye(x.shape[0])
         return self.jvp_scaled(v, x, constants).T
 
     @jit
     def jac_scaled_error(self, x, constants=None):
         """Compute Jacobian matrix of self.compute_scaled_error wrt x."""
+        if self._deriv_mode == "sparse":
+            return self._jac_sparse_to_dense(x, constants, "scaled_error")
         v = jnp.eye(x.shape[0])
         return self.jvp_scaled_error(v, x, constants).T
 
     @jit
     def jac_unscaled(self, x, constants=None):
         """Compute Jacobian matrix of self.compute_unscaled wrt x."""
+        if self._deriv_mode == "sparse":
+            return self._jac_sparse_to_dense(x, constants, "unscaled")
         v = jnp.eye(x.shape[0])
         return self.jvp_unscaled(v, x, constants).T
 
+    @functools.partial(jit, static_argnames=["op"])
+    def jac_sparse(self, x, constants=None, op="scaled_error"):
+        """Compute Jacobian matrix wrt x as a sparse matrix.
+
+        Only available with ``deriv_mode="sparse"``.
+
+        Parameters
+        ----------
+        x : ndarray
+            State vector.
+        constants : list
+            Constant parameters passed to sub-objectives.
+        op : {"scaled_error", "scaled", "unscaled"}
+            Which of ``self.compute_scaled_error``, ``self.compute_scaled`` or
+            ``self.compute_unscaled`` to differentiate.
+
+        Returns
+        -------
+        J : jax.experimental.sparse.BCOO
+            Jacobian matrix, shape(dim_f, dim_x).
+
+        """
+        from jax.experimental.sparse import BCOO
+
+        errorif(
+            self._deriv_mode != "sparse",
+            ValueError,
+            "jac_sparse requires deriv_mode='sparse', "
+            + f"but ObjectiveFunction is using '{self._deriv_mode}'",
+        )
+        values = self._jac_sparse_values(x, constants, op)
+        indices = jnp.stack([self._jac_rows, self._jac_cols], axis=-1)
+        return BCOO((values, indices), shape=(self.dim_f, self.dim_x))
+
+    def _jac_sparse_values(self, x, constants=None, op="scaled"):
+        # one tangent per color, the sum of the unit vectors of its columns
+        seeds = jnp.arange(self._jac_num_colors)[:, None] == self._jac_colors
+        Jc = self._jvp_batched(seeds.astype(x.dtype), x, constants, op)
+        return Jc[self._jac_colors[self._jac_cols], self._jac_rows]
+
+    def _jac_sparse_to_dense(self, x, constants=None, op="scaled"):
+        values = self._jac_sparse_values(x, constants, op)
+        J = jnp.zeros((self.dim_f, x.shape[0]), dtype=values.dtype)
+        return J.at[self._jac_rows, self._jac_cols].set(values)
+
     def _jvp_blocked(self, v, x, constants=None, op="scaled"):
         v = ensure_tuple(v)
         if len(v) > 1:
@@ -772,7 +1190,7 @@ class ObjectiveFunction(IOAble):
             Constant parameters passed to sub-objectives.
 
         """
-        if self._deriv_mode == "batched":
+        if self._deriv_mode in ["batched", "sparse"]:
             J = self._jvp_batched(v, x, constants, "scaled")
         if self._deriv_mode == "blocked":
             J = self._jvp_blocked(v, x, constants, "scaled")
@@ -793,7 +1211,7 @@ class ObjectiveFunction(IOAble):
             Constant parameters passed to sub-objectives.
 
         """
-        if self._deriv_mode == "batched":
+        if self._deriv_mode in ["batched", "sparse"]:
             J = self._jvp_batched(v, x, constants, "scaled_error")
         if self._deriv_mode == "blocked":
             J = self._jvp_blocked(v, x, constants, "scaled_error")
@@ -814,7 +1232,7 @@ class ObjectiveFunction(IOAble):
             Constant parameters passed to sub-objectives.
 
         """
-        if self._deriv_mode == "batched":
+        if self._deriv_mode in ["batched", "sparse"]:
             J = self._jvp_batched(v, x, constants, "unscaled")
         if self._deriv_mode == "blocked":
             J = self._jvp_blocked(v, x, constants, "unscaled")
@@ -872,7 +1290,7 @@ class ObjectiveFunction(IOAble):
         """
         return self._vjp(v, x, constants, "unscaled")
 
-    def compile(self, mode="auto", verbose=1):
+    def compile(self, mode="auto", verbose=1):  # noqa: C901
         """Call the necessary functions to ensure the function is compiled.
 
         Parameters
@@ -903,6 +1321,7 @@ class ObjectiveFunction(IOAble):
         if verbose > 0:
             msg = "Compiling objective function and derivatives: "
             print(msg + f"{[obj.name for obj in self.objectives]}")
+        cache_stats = compilation_cache_stats()
         timer.start("Total compilation time")
 
         if mode in ["scalar", "bfgs", "all"]:
@@ -939,8 +1358,61 @@ class ObjectiveFunction(IOAble):
         timer.stop("Total compilation time")
         if verbose > 1:
             timer.disp("Total compilation time")
+        if verbose > 0 and desc_config.get("compilation_cache"):
+            hits, misses = (
+                compilation_cache_stats()[key] - cache_stats[key]
+                for key in ("hits", "misses")
+            )
+            print(f"Compilation cache: {hits} hits, {misses} misses")
         self._compiled = True
 
+    def export(self, path, platforms=None, verbose=1):
+        """Save the objective and its Jacobian as ahead-of-time exported functions.
+
+        ``compute_scaled_error`` and ``jac_scaled_error`` are lowered to StableHLO with
+        ``jax.export`` and saved along with the arrays of the objective and its
+        constants. The result can be loaded with ``desc.export.load_exported`` and
+        evaluated in another process without importing the objectives or tracing
+        them again. Requires ``jax>=0.4.30`` and the ``absl-py`` and ``flatbuffers``
+        packages.
+
+        Parameters
+        ----------
+        path : str or path-like
+            File to save to. Should end in ``.npz``.
+        platforms : list of str, optional
+            Platforms to export for, e.g. ``["cpu", "cuda"]``. Defaults to the
+            platform of the default device.
+        verbose : int, optional
+            Level of output.
+
+        """
+        from desc.export import _jax_export, save_exported
+
+        errorif(not self.built, RuntimeError, "ObjectiveFunction must be built first.")
+        errorif(not use_jax, RuntimeError, "Exporting objectives requires JAX.")
+        export = _jax_export()
+        timer = Timer()
+        timer.start("Objective export")
+        x = self.x()
+        leaves, treedef = tree_flatten((self, self.constants))
+
+        def method(name):
+            def fun(x, leaves):
+                obj, constants = tree_unflatten(treedef, leaves)
+                return getattr(obj, name)(x, constants)
+
+            return jit(fun)
+
+        exported = {
+            name: export.export(method(name), platforms=platforms)(x, leaves)
+            for name in ["compute_scaled_error", "jac_scaled_error"]
+        }
+        save_exported(path, exported, leaves, x, self.dim_f, self.name)
+        timer.stop("Objective export")
+        if verbose > 1:
+            timer.disp("Objective export")
+
     @property
     def constants(self):
         """list: constant parameters for each sub-objective."""
@@ -1052,6 +1524,12 @@ class _Objective(IOAble, ABC):
     _coordinates = ""
     _units = "(Unknown)"
     _equilibrium = False
+    # objectives that only compute self._data_keys of their single thing with
+    # transforms and profiles from get_transforms and get_profiles can set _fusable
+    # so ObjectiveFunction can compute them together with other objectives. Keys of
+    # constants that are passed as keyword arguments to compute go in _fusion_kwargs
+    _fusable = False
+    _fusion_kwargs = ()
     _io_attrs_ = [
         "_target",
         "_bounds",
@@ -1697,3 +2175,72 @@ class _ThingFlattener(IOAble):
         assert len(flat) == self.length
         unique, _ = unique_list(flat)
         return unique
+
+
+def _jac_chunk_size_cache_path(objective, objectives, budget, timing):
+    """Path of the jac_chunk_size cache and key of the given ObjectiveFunction.
+
+    The key hashes everything the tuned chunk size depends on: the versions, device,
+    budget, derivative mode and the type and size of each sub-objective and thing.
+    Returns None for the path if caching is disabled.
+    """
+    signature = [
+        __version__,
+        jax.__version__,
+        desc_config.get("device"),
+        desc_config.get("precision"),
+        budget,
+        timing,
+        objective._deriv_mode,
+        [(type(t).__qualname__, t.dim_x) for t in objective.things],
+        [
+            (
+                type(obj).__qualname__,
+                obj.dim_f,
+                obj._deriv_mode,
+                None if any(obj is o for o in objectives) else obj._jac_chunk_size,
+                objective._things_per_objective_idx[k],
+            )
+            for k, obj in enumerate(objective.objectives)
+        ],
+    ]
+    key = hashlib.sha256(json.dumps(signature, default=str).encode()).hexdigest()
+    if not desc_config.get("cache_dir"):
+        return None, key
+    path = os.path.join(
+        os.path.expanduser(desc_config["cache_dir"]), "jac_chunk_size.json"
+    )
+    return path, key
+
+
+def _load_jac_chunk_size(path, key):
+    """Cached jac_chunk_size for key, or None if not found."""
+    if path is None:
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f).get(key)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_jac_chunk_size(path, key, chunk_size):
+    """Add jac_chunk_size for key to the cache, ignoring any failure."""
+    if path is None:
+        return
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache[key] = chunk_size
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so other processes never see partial files
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as f:
+            json.dump(cache, f)
+        os.replace(f.name, path)
+    except OSError:
+        pass
@@ -3,14 +3,28 @@
 Functions in this module should not depend on any other submodules in desc.objectives.
 """
 
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
+import scipy.sparse
 
-from desc.backend import jit, jnp, put, softargmax
+from desc.backend import desc_config, jit, jnp, put, softargmax
 from desc.io import IOAble
-from desc.utils import Index, errorif, flatten_list, svd_inv_null, unique_list, warnif
-
-
-def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa: C901
+from desc.utils import (
+    Index,
+    block_svd_inv_null,
+    errorif,
+    flatten_list,
+    svd_inv_null,
+    unique_list,
+    warnif,
+)
+
+
+def factorize_linear_constraints(  # noqa: C901
+    objective, constraint, x_scale="auto", factorization="svd"
+):
     """Compute and factorize A to get particular solution and nullspace.
 
     Given constraints of the form Ax=b, factorize A to find a particular solution xp
@@ -27,6 +41,16 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
         Characteristic scale of each variable. Setting ``x_scale`` is equivalent
         to reformulating the problem in scaled variables ``xs = x / x_scale``.
         If set to ``'auto'``, the scale is determined from the initial state vector.
+    factorization : {"svd", "sparse"}
+        How to find the particular solution and null space. ``"svd"`` uses an SVD of
+        the constraint matrix, after eliminating parameters that are fixed by a
+        single constraint. ``"sparse"`` does the elimination on a sparse matrix, then
+        splits the remaining constraints into independent blocks that share no
+        parameters and factorizes each with a small SVD, which is much faster for the
+        block structure of typical constraints (eg ``BoundaryRSelfConsistency``
+        only couples modes with the same poloidal and toroidal mode numbers). Both
+        give the same particular solution and null space, though the basis of the
+        null space is different.
 
     Returns
     -------
@@ -36,8 +60,10 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
         Combined constraint matrix, such that A @ x[unfixed_idx] == b.
     b : list of ndarray
         Combined RHS vector.
-    Z : ndarray
-        Null space operator for full combined A such that A @ Z == 0.
+    Z : ndarray or _SparseOperator
+        Null space operator for full combined A such that A @ Z == 0. For
+        ``factorization="sparse"`` this is a sparse operator that supports the
+        matrix products needed for the projection without forming the dense matrix.
     D : ndarray
         Scale of the full state vector x, as set by the parameter ``x_scale``.
     unfixed_idx : ndarray
@@ -46,7 +72,22 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
         Functions to project full vector x into reduced vector y,
         and to recover x from y.
 
+    Notes
+    -----
+    If ``desc.config["factorization_cache_size"]`` (or the environment variable
+    ``DESC_FACTORIZATION_CACHE_SIZE``) is set to a positive number, that many
+    factorizations are cached in memory, keyed by the scaled constraint matrix left
+    after removing fixed parameters. Rebuilding the same constraints with different
+    targets (for example in perturbations or repeated solves) then only recomputes the
+    particular solution. The cache is disabled by default, since each entry keeps the
+    pseudo-inverse and null space alive, which for ``factorization="svd"`` are dense.
+
     """
+    errorif(
+        factorization not in ["svd", "sparse"],
+        ValueError,
+        f"factorization should be one of 'svd', 'sparse', got {factorization}",
+    )
     for con in constraint.objectives:
         errorif(
             not con.linear,
@@ -99,11 +140,13 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
     # incompatible and so we will leave those to be caught later.
     A_augmented = np.hstack([A, np.reshape(b, (A.shape[0], 1))])
 
-    # Find unique rows of A_augmented
-    _, unique_indices = np.unique(A_augmented, axis=0, return_index=True)
-
-    # Sort the indices to preserve the order of appearance
-    unique_indices = np.sort(unique_indices)
+    # Find the first occurrence of each unique row of A_augmented, in order of
+    # appearance. Hashing the rows is much faster than sorting them with np.unique,
+    # adding 0 makes -0.0 and 0.0 compare equal as they would in np.unique.
+    first = {}
+    for i, row in enumerate(A_augmented + 0.0):
+        first.setdefault(row.tobytes(), i)
+    unique_indices = np.fromiter(first.values(), dtype=int)
     # Find the indices of the degenerate rows
     degenerate_idx = np.setdiff1d(np.arange(A_augmented.shape[0]), unique_indices)
 
@@ -115,7 +158,10 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
     A_nondegenerate = A.copy()
 
     # remove fixed parameters from A and b
-    A, b, xp, unfixed_idx, fixed_idx = remove_fixed_parameters(A, b, xp)
+    if factorization == "sparse":
+        A, b, xp, unfixed_idx, fixed_idx = _remove_fixed_parameters_sparse(A, b, xp)
+    else:
+        A, b, xp, unfixed_idx, fixed_idx = remove_fixed_parameters(A, b, xp)
 
     # compute x_scale if not provided
     # Note: this x_scale is not the same as the x_scale as in solve_options["x_scale"]
@@ -130,9 +176,13 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
     D = np.where(np.abs(x_scale) < 1e2, 1, np.abs(x_scale))
 
     # null space & particular solution
-    A = A * D[None, unfixed_idx]
-    if A.size:
-        A_inv, Z = svd_inv_null(A)
+    if factorization == "sparse":
+        A = scipy.sparse.csr_matrix(A @ scipy.sparse.diags(D[unfixed_idx]))
+        A_inv, Z = _cached_factorization(A, factorization, block_svd_inv_null)
+        A = A.toarray()
+    elif A.size:
+        A = A * D[None, unfixed_idx]
+        A_inv, Z = _cached_factorization(A, factorization, svd_inv_null)
     else:
         A_inv = A.T
         Z = np.eye(A.shape[1])
@@ -142,8 +192,13 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
     xp = jnp.asarray(xp)
     A = jnp.asarray(A)
     b = jnp.asarray(b)
-    Z = jnp.asarray(Z)
     D = jnp.asarray(D)
+    if factorization == "sparse":
+        # keep only the nonzero entries of the blocks
+        A_inv = _SparseOperator.from_scipy(A_inv)
+        Z = _SparseOperator.from_scipy(Z)
+    else:
+        Z = jnp.asarray(Z)
 
     project = _Project(Z, D, xp, unfixed_idx)
     recover = _Recover(Z, D, xp, unfixed_idx, objective.dim_x)
@@ -206,6 +261,110 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
     )
 
 
+class _SparseOperator(IOAble):
+    """Sparse matrix in coordinate format, applied with gathers and scatter-adds.
+
+    Used for the null space of linear constraints factorized with
+    ``factorization="sparse"``, which is made of small dense blocks for constraints
+    that couple several parameters and the identity for free parameters. Only the
+    nonzero entries are stored, so memory and the cost of a matrix vector product
+    scale with the number of parameters rather than its square.
+
+    Supports the subset of array operations needed to use it in place of a dense
+    matrix: ``@`` with a dense vector or matrix on either side, ``.T``, ``**`` and
+    ``*`` or ``/`` by a scalar, a column vector (scaling rows) or a row vector
+    (scaling columns).
+
+    Parameters
+    ----------
+    rows, cols : ndarray of int
+        Row and column indices of the nonzero entries.
+    vals : ndarray
+        Values of the nonzero entries.
+    shape : tuple of int
+        Shape of the matrix.
+
+    """
+
+    _io_attrs_ = ["rows", "cols", "vals", "shape"]
+    _static_attrs = ["shape"]
+    _dynamic_attrs = ["rows", "cols"]
+    # so that numpy arrays defer to our reflected operators
+    __array_ufunc__ = None
+
+    def __init__(self, rows, cols, vals, shape):
+        self.rows = rows
+        self.cols = cols
+        self.vals = vals
+        self.shape = tuple(int(n) for n in shape)
+
+    @classmethod
+    def from_scipy(cls, A):
+        """Create from a scipy.sparse matrix."""
+        A = scipy.sparse.coo_matrix(A)
+        return cls(jnp.asarray(A.row), jnp.asarray(A.col), jnp.asarray(A.data), A.shape)
+
+    @property
+    def T(self):
+        """_SparseOperator: Transpose of the matrix."""
+        return _SparseOperator(self.cols, self.rows, self.vals, self.shape[::-1])
+
+    @property
+    def ndim(self):
+        """int: Number of dimensions, always 2."""
+        return 2
+
+    @property
+    def dtype(self):
+        """dtype: Data type of the entries."""
+        return self.vals.dtype
+
+    def todense(self):
+        """Return the matrix as a dense array."""
+        return jnp.zeros(self.shape, self.dtype).at[self.rows, self.cols].add(self.vals)
+
+    def column_norms(self):
+        """Return the 2-norm of each column, like ``jnp.linalg.norm(A, axis=0)``."""
+        return jnp.sqrt(
+            jnp.zeros(self.shape[1], self.dtype).at[self.cols].add(self.vals**2)
+        )
+
+    def __matmul__(self, x):
+        x = jnp.asarray(x)
+        vals = self.vals.reshape((-1,) + (1,) * (x.ndim - 1))
+        out = jnp.zeros((self.shape[0],) + x.shape[1:], jnp.result_type(self.dtype, x))
+        return out.at[self.rows].add(vals * x[self.cols])
+
+    def __rmatmul__(self, x):
+        x = jnp.asarray(x)
+        if x.ndim == 1:
+            return self.T @ x
+        return (self.T @ x.T).T
+
+    def __mul__(self, d):
+        d = jnp.asarray(d)
+        if d.ndim == 0:
+            vals = self.vals * d
+        elif d.ndim == 2 and d.shape == (self.shape[0], 1):
+            vals = self.vals * d[self.rows, 0]
+        elif d.shape in [(self.shape[1],), (1, self.shape[1])]:
+            vals = self.vals * d.reshape(-1)[self.cols]
+        else:
+            raise ValueError(
+                f"Can only multiply matrix of shape {self.shape} by a scalar, row or "
+                + f"column vector, got shape {d.shape}."
+            )
+        return _SparseOperator(self.rows, self.cols, vals, self.shape)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, d):
+        return self * (1 / jnp.asarray(d))
+
+    def __pow__(self, p):
+        return _SparseOperator(self.rows, self.cols, self.vals**p, self.shape)
+
+
 class _Project(IOAble):
     _io_attrs_ = ["Z", "D", "xp", "unfixed_idx"]
 
@@ -308,6 +467,44 @@ def combine_args(*objectives):
     return objectives
 
 
+def color_columns(sparsity):
+    """Partition the columns of a sparse matrix into structurally orthogonal groups.
+
+    Columns with the same color have no nonzero entries in the same row, so a matrix
+    vector product with the sum of the unit vectors of one color gives every nonzero
+    value of those columns at once. Columns are colored greedily (first-fit) in their
+    natural order, which works well for block structured matrices such as Jacobians
+    of objectives on a set of coils.
+
+    Parameters
+    ----------
+    sparsity : ndarray of bool, shape(m, n)
+        Sparsity pattern of the matrix. True where the matrix may be nonzero.
+
+    Returns
+    -------
+    colors : ndarray of int, shape(n,)
+        Color of each column, from 0 to the number of colors - 1.
+
+    """
+    sparsity = np.asarray(sparsity, dtype=bool)
+    num_cols = sparsity.shape[1]
+    # rows with the same pattern put the same constraints on the coloring
+    sparsity = np.unique(np.packbits(sparsity, axis=1), axis=0)
+    sparsity = np.unpackbits(sparsity, axis=1, count=num_cols).astype(bool)
+    # used[i, c] is whether a column with color c is nonzero in row i
+    used = np.zeros((sparsity.shape[0], num_cols), dtype=bool)
+    colors = np.zeros(num_cols, dtype=int)
+    num_colors = 0
+    for j in range(num_cols):
+        rows = np.flatnonzero(sparsity[:, j])
+        available = ~used[rows, : num_colors + 1].any(axis=0)
+        colors[j] = np.argmax(available)  # there is always a new color available
+        num_colors = max(num_colors, colors[j] + 1)
+        used[rows, colors[j]] = True
+    return colors
+
+
 def _parse_callable_target_bounds(target, bounds, x):
     if x.ndim > 1:
         x = x[:, 0]
@@ -473,3 +670,71 @@ def remove_fixed_parameters(A, b, xp):
     fixed_idx = np.delete(np.arange(xp.size), unfixed_idx)
 
     return A, b, xp, unfixed_idx, fixed_idx
+
+
+_factorization_cache = OrderedDict()
+
+
+def _cached_factorization(A, factorization, fun):
+    """Compute fun(A), reusing the result for a matrix with the same entries.
+
+    Only the hash of A is stored, along with the result, in a least recently used
+    cache of size ``desc.config["factorization_cache_size"]``.
+    """
+    size = desc_config.get("factorization_cache_size", 0)
+    if not size:
+        return fun(A)
+    h = hashlib.sha256(str((factorization, A.shape, A.dtype.str)).encode())
+    if scipy.sparse.issparse(A):
+        A.sort_indices()
+        arrays = (A.indptr, A.indices, A.data + 0.0)
+    else:
+        arrays = (np.ascontiguousarray(A) + 0.0,)
+    for arr in arrays:
+        h.update(np.ascontiguousarray(arr).tobytes())
+    key = h.hexdigest()
+    if key in _factorization_cache:
+        _factorization_cache.move_to_end(key)
+        return _factorization_cache[key]
+    out = fun(A)
+    _factorization_cache[key] = out
+    while len(_factorization_cache) > size:
+        _factorization_cache.popitem(last=False)
+    return out
+
+
+def _remove_fixed_parameters_sparse(A, b, xp):
+    """Same as remove_fixed_parameters, but A is returned as a sparse matrix.
+
+    Fixed parameters are found and eliminated by their indices without any dense
+    matrix operations, so the cost is proportional to the number of nonzeros of A.
+    """
+    A = scipy.sparse.csr_matrix(A)
+    b = np.array(b, dtype=float)
+    xp = np.array(xp, dtype=float)
+    indices_idx = np.arange(A.shape[1])
+
+    while True:
+        A.eliminate_zeros()
+        # fixed just means there is a single element in A, so A_ij*x_j = b_i
+        fixed_rows = np.flatnonzero(np.diff(A.indptr) == 1)
+        if not fixed_rows.size:
+            break
+        # something like 0.5 x1 = 2 is the same as x1 = 4
+        values = b[fixed_rows] / A.data[A.indptr[fixed_rows]]
+        # several constraints may fix the same parameter, keep the first
+        fixed_idx, first = np.unique(A.indices[A.indptr[fixed_rows]], return_index=True)
+        values = values[first]
+        xp[indices_idx[fixed_idx]] = values
+        unfixed_rows = np.setdiff1d(np.arange(A.shape[0]), fixed_rows)
+        unfixed_idx = np.setdiff1d(np.arange(A.shape[1]), fixed_idx)
+        # move the fixed values to the RHS of the other constraints
+        A = A[unfixed_rows]
+        b = b[unfixed_rows] - A[:, fixed_idx] @ values
+        A = A[:, unfixed_idx]
+        indices_idx = indices_idx[unfixed_idx]
+
+    unfixed_idx = indices_idx
+    fixed_idx = np.delete(np.arange(xp.size), unfixed_idx)
+
+    return A, b, xp, unfixed_idx, fixed_idx
@@ -16,6 +16,8 @@ from desc.objectives import (
 from desc.objectives.utils import (
     _Project,
     _Recover,
+    _SparseOperator,
+    _remove_fixed_parameters_sparse,
     factorize_linear_constraints,
     remove_fixed_parameters,
 )
@@ -24,6 +26,13 @@ from desc.utils import Timer, errorif, get_instance, setdefault
 from .utils import f_where_x
 
 
+def _column_norms(Z):
+    """2-norm of each column of a dense array or _SparseOperator."""
+    if isinstance(Z, _SparseOperator):
+        return Z.column_norms()
+    return jnp.linalg.norm(Z, axis=0)
+
+
 class LinearConstraintProjection(ObjectiveFunction):
     """Remove linear constraints via orthogonal projection.
 
@@ -49,11 +58,21 @@ class LinearConstraintProjection(ObjectiveFunction):
         If set to ``'auto'``, the scale is determined from the initial state vector.
     name : str
         Name of the objective function.
+    factorization : {"svd", "sparse"}
+        How to factorize the linear constraints. ``"sparse"`` eliminates fixed
+        parameters by index and factorizes independent blocks of the remaining
+        constraints separately, which is much faster at high resolution. See
+        ``desc.objectives.utils.factorize_linear_constraints`` for details.
 
     """
 
     def __init__(
-        self, objective, constraint, x_scale="auto", name="LinearConstraintProjection"
+        self,
+        objective,
+        constraint,
+        x_scale="auto",
+        name="LinearConstraintProjection",
+        factorization="svd",
     ):
         errorif(
             not isinstance(objective, ObjectiveFunction),
@@ -81,6 +100,7 @@ class LinearConstraintProjection(ObjectiveFunction):
         self._objective = objective
         self._constraint = constraint
         self._x_scale = x_scale
+        self._factorization = factorization
         self._built = False
         # don't want to compile this, just use the compiled objective
         self._use_jit = False
@@ -128,17 +148,27 @@ class LinearConstraintProjection(ObjectiveFunction):
             self._objective,
             self._constraint,
             self._x_scale,
+            self._factorization,
         )
         # inverse of the linear constraint matrix A without any scaling
         self._Ainv = self._D[self._unfixed_idx, None] * self._ADinv
         # nullspace of the linear constraint matrix A without any scaling
         self._ZA = self._D[self._unfixed_idx, None] * self._Z
-        self._ZA = self._ZA / jnp.linalg.norm(self._ZA, axis=0)
+        self._ZA = self._ZA / _column_norms(self._ZA)
         self._dim_x = self._objective.dim_x
         self._dim_x_reduced = self._Z.shape[1]
 
         # equivalent matrix for A[unfixed_idx] @ D @ Z == A @ unfixed_idx_mat
-        self._unfixed_idx_mat = jnp.diag(self._D)[:, self._unfixed_idx] @ self._Z
+        if isinstance(self._Z, _SparseOperator):
+            rows = jnp.asarray(self._unfixed_idx)[self._Z.rows]
+            self._unfixed_idx_mat = _SparseOperator(
+                rows,
+                self._Z.cols,
+                self._Z.vals * self._D[rows],
+                (self._dim_x, self._dim_x_reduced),
+            )
+        else:
+            self._unfixed_idx_mat = jnp.diag(self._D)[:, self._unfixed_idx] @ self._Z
 
         self._built = True
         timer.stop(f"{self.name} build")
@@ -193,7 +223,8 @@ class LinearConstraintProjection(ObjectiveFunction):
         the inverse of the scaled linear constraint matrix (ADinv) to reflect the new
         equilibrium a.k.a. the new target of the constraint of system Ax=b. This
         also updates the project and recover methods. Updating quantities in this way
-        is faster than calling factorize_linear_constraints again.
+        is faster than calling factorize_linear_constraints again. If the scaling D
+        does not change, only the particular solution is recomputed.
 
         Parameters
         ----------
@@ -216,21 +247,28 @@ class LinearConstraintProjection(ObjectiveFunction):
         # remove fixed parameters from A and b again by the same loop as in factorize
         # Actually A (unscaled linear constraint matrix without any degenerate rows)
         # does not change here, but still recompute it while updating others
-        A, b, xp, unfixed_idx, fixed_idx = remove_fixed_parameters(A, b, xp)
+        if self._factorization == "sparse":
+            A, b, xp, unfixed_idx, fixed_idx = _remove_fixed_parameters_sparse(A, b, xp)
+        else:
+            A, b, xp, unfixed_idx, fixed_idx = remove_fixed_parameters(A, b, xp)
 
         x_scale = self._objective.x(*self._objective.things)
-        self._D = jnp.where(jnp.abs(x_scale) < 1e2, 1, jnp.abs(x_scale))
-
-        # since D has changed, we need to update the ADinv
-        # as mentioned above A does not change, so we can use the same Ainv
-        # pinv(A) = Ainv, ADinv = pinv(A @ D) = Dinv @ Ainv, Dinv = 1 / D
-        self._ADinv = (1 / self._D)[unfixed_idx, None] * self._Ainv
-        # we also need to update the nullspace Z of AD in a similar way
-        # A @ ZA = 0 -> (A @ D) @ ((1 / D) @ ZA) = 0 -> Z = (1 / D) @ ZA
-        # where ZA is the nullspace of A, and Z is the nullspace of AD
-        self._Z = (1 / self._D)[self._unfixed_idx, None] * self._ZA
-        # we also normalize Z to make each column have unit norm
-        self._Z = self._Z / jnp.linalg.norm(self._Z, axis=0)
+        D = jnp.where(jnp.abs(x_scale) < 1e2, 1, jnp.abs(x_scale))
+
+        # if only the targets changed, Z and ADinv are still valid and we just need
+        # the new particular solution
+        if not np.array_equal(D, self._D):
+            self._D = D
+            # since D has changed, we need to update the ADinv
+            # as mentioned above A does not change, so we can use the same Ainv
+            # pinv(A) = Ainv, ADinv = pinv(A @ D) = Dinv @ Ainv, Dinv = 1 / D
+            self._ADinv = (1 / self._D)[unfixed_idx, None] * self._Ainv
+            # we also need to update the nullspace Z of AD in a similar way
+            # A @ ZA = 0 -> (A @ D) @ ((1 / D) @ ZA) = 0 -> Z = (1 / D) @ ZA
+            # where ZA is the nullspace of A, and Z is the nullspace of AD
+            self._Z = (1 / self._D)[self._unfixed_idx, None] * self._ZA
+            # we also normalize Z to make each column have unit norm
+            self._Z = self._Z / _column_norms(self._Z)
 
         xp = put(xp, unfixed_idx, self._ADinv @ b)
         xp = put(xp, fixed_idx, ((1 / self._D) * xp)[fixed_idx])
@@ -363,9 +401,36 @@ class LinearConstraintProjection(ObjectiveFunction):
             @ (self._Z * self._D[self._unfixed_idx, None])
         )
 
+    def hvp(self, v, x_reduced, constants=None):
+        """Compute Hessian-vector product of self.compute_scalar.
+
+        Parameters
+        ----------
+        v : ndarray
+            Vector to right-multiply the Hessian by.
+        x_reduced : ndarray
+            Reduced state vector that satisfies linear constraints.
+        constants : list
+            Constant parameters passed to sub-objectives.
+
+        Returns
+        -------
+        Hv : ndarray
+            Hessian-vector product.
+
+        """
+        x = self.recover(x_reduced)
+        df = self._objective.hvp(self._unfixed_idx_mat @ v, x, constants)
+        return df[self._unfixed_idx] @ (self._Z * self._D[self._unfixed_idx, None])
+
     def _jac(self, x_reduced, constants=None, op="scaled"):
         x = self.recover(x_reduced)
         v = self._unfixed_idx_mat
+        if self._objective._deriv_mode == "sparse":
+            # the full Jacobian only takes a few JVPs, cheaper than 1 per column of v
+            return getattr(self._objective, "jac_" + op)(x, constants) @ v
+        if isinstance(v, _SparseOperator):
+            v = v.todense()
         df = getattr(self._objective, "jvp_" + op)(v.T, x, constants)
         return df.T
 
@@ -1002,6 +1067,18 @@ class ProximalProjection(ObjectiveFunction):
         J = self.jac_scaled_error(x, constants)
         return J.T @ J
 
+    def hvp(self, v, x, constants=None):
+        """Not implemented, ProximalProjection has no matrix free derivatives.
+
+        Its derivatives need the full Jacobian of the equilibrium constraint, so a
+        Hessian-vector product would cost as much as ``hess``. Use ``hess`` instead.
+        """
+        raise NotImplementedError(
+            "ProximalProjection has no matrix free Hessian-vector product, since its "
+            + "derivatives need the full Jacobian of the equilibrium constraint. "
+            + "Use hess instead."
+        )
+
     def jac_scaled(self, x, constants=None):
         """Compute Jacobian of self.compute_scaled.
 
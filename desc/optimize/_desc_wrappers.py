@@ -1,13 +1,17 @@
 from scipy.optimize import NonlinearConstraint
 
-from desc.backend import jnp
+from desc.backend import jax, jnp
+from desc.utils import errorif
 
+from ._constraint_wrappers import ProximalProjection
 from .aug_lagrangian import fmin_auglag
 from .aug_lagrangian_ls import lsq_auglag
 from .fmin_scalar import fmintr
 from .least_squares import lsqtr
+from .multistart import lsqtr_multistart
 from .optimizer import register_optimizer
 from .stochastic import sgd
+from .utils import Telemetry
 
 
 @register_optimizer(
@@ -260,6 +264,12 @@ def _optimize_desc_least_squares(
     """
     assert constraint is None, f"method {method} doesn't support constraints"
     options = {} if options is None else options
+    errorif(
+        options.get("tr_method") == "cg" and isinstance(objective, ProximalProjection),
+        ValueError,
+        "tr_method='cg' needs vector-Jacobian products, which are not available "
+        "for ProximalProjection, use a different tr_method.",
+    )
     if not isinstance(x_scale, str) and jnp.allclose(x_scale, 1):
         options.setdefault("initial_trust_radius", 1e-3)
         options.setdefault("max_trust_radius", 1.0)
@@ -280,6 +290,130 @@ def _optimize_desc_least_squares(
         verbose=verbose,
         callback=None,
         options=options,
+        jvp=objective.jvp_scaled_error,
+        vjp=objective.vjp_scaled_error,
+    )
+    return result
+
+
+@register_optimizer(
+    name="lsq-multistart",
+    description="Trust region least squares from a batch of perturbed initial guesses, "
+    + "which are all advanced together by one compiled program. "
+    + "See https://desc-docs.readthedocs.io/en/stable/_api/optimize/desc.optimize.lsqtr_multistart.html",  # noqa: E501
+    scalar=False,
+    equality_constraints=False,
+    inequality_constraints=False,
+    stochastic=False,
+    hessian=False,
+    GPU=True,
+)
+def _optimize_desc_least_squares_multistart(
+    objective, constraint, x0, method, x_scale, verbose, stoptol, options=None
+):
+    """Wrapper for desc.optimize.lsqtr_multistart.
+
+    Parameters
+    ----------
+    objective : ObjectiveFunction
+        Function to minimize.
+    constraint : ObjectiveFunction
+        Constraint to satisfy - not supported by this method
+    x0 : ndarray
+        Starting point.
+    method : {"lsq-multistart"}
+        Name of the method to use.
+    x_scale : array_like or ‘jac’, optional
+        Characteristic scale of each variable. Setting x_scale is equivalent to
+        reformulating the problem in scaled variables xs = x / x_scale. An alternative
+        view is that the size of a trust region along jth dimension is proportional to
+        x_scale[j]. Improved convergence may be achieved by setting x_scale such that
+        a step of a given size along any of the scaled variables has a similar effect
+        on the cost function. If set to ‘jac’, the scale is iteratively updated using
+        the inverse norms of the columns of the Jacobian matrix.
+    verbose : int
+        * 0  : work silently.
+        * 1 : display a termination report.
+        * 2 : display the final cost and status of each initial guess.
+    stoptol : dict
+        Dictionary of stopping tolerances, with keys {"xtol", "ftol", "gtol", "ctol",
+        "maxiter", "max_nfev", "max_njev", "max_ngev", "max_nhev"}
+    options : dict, optional
+        Dictionary of optional keyword arguments to override default solver
+        settings. See ``desc.optimize.lsqtr_multistart`` for details. Additionally
+        accepts
+
+        - ``"num_starts"`` : (int > 0) Number of initial guesses. The first is x0, and
+          the others are x0 plus random normal perturbations. Default 8.
+        - ``"start_perturbation"`` : (float > 0) Standard deviation of the
+          perturbations, relative to the root mean square of x0. Default 1e-2.
+        - ``"starts"`` : (ndarray, shape(k, n)) Initial guesses to use instead of
+          random perturbations, in the same units as x0. Overrides the previous two
+          options.
+        - ``"seed"`` : (int) Seed of the random perturbations. Default 0.
+        - ``"telemetry"`` : (str, path-like or callable) Where to send a machine
+          readable record of the run. Since all iterations happen in a single
+          compiled loop, only one record is made, at the end of the best start.
+
+    Returns
+    -------
+    res : OptimizeResult
+       The optimization result represented as a ``OptimizeResult`` object.
+       Important attributes are: ``x`` the solution array, ``success`` a
+       Boolean flag indicating if the optimizer exited successfully and
+       ``message`` which describes the cause of the termination. See
+       `OptimizeResult` for a description of other attributes.
+
+    """
+    assert constraint is None, f"method {method} doesn't support constraints"
+    errorif(
+        isinstance(objective, ProximalProjection),
+        ValueError,
+        f"method {method} needs a JAX transformable objective, which "
+        "ProximalProjection is not. Use a different method.",
+    )
+    options = {} if options is None else options.copy()
+    num_starts = options.pop("num_starts", 8)
+    start_perturbation = options.pop("start_perturbation", 1e-2)
+    seed = options.pop("seed", 0)
+    starts = options.pop("starts", None)
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), method)
+    if starts is None:
+        noise = jax.random.normal(
+            jax.random.PRNGKey(seed), (num_starts - 1, x0.size), dtype=x0.dtype
+        )
+        scale = start_perturbation * jnp.sqrt(jnp.mean(x0**2))
+        starts = jnp.vstack([x0, x0 + scale * noise])
+    if not isinstance(x_scale, str) and jnp.allclose(x_scale, 1):
+        options.setdefault("initial_trust_radius", 1e-3)
+        options.setdefault("max_trust_radius", 1.0)
+    elif "initial_trust_radius" not in options:
+        options.setdefault("initial_trust_ratio", 0.1)
+    options["max_nfev"] = stoptol["max_nfev"]
+
+    result = lsqtr_multistart(
+        objective.compute_scaled_error,
+        x0=starts,
+        jac=objective.jac_scaled_error,
+        args=(objective.constants,),
+        x_scale=x_scale,
+        ftol=stoptol["ftol"],
+        xtol=stoptol["xtol"],
+        gtol=stoptol["gtol"],
+        maxiter=stoptol["maxiter"],
+        verbose=verbose,
+        options=options,
+    )
+    telemetry.record(
+        result["nit"],
+        result["x"],
+        result["fun"],
+        nfev=result["nfev"],
+        njev=result["njev"],
+        cost=result["cost"],
+        optimality=result["optimality"],
+        num_starts=starts.shape[0],
+        num_success=jnp.sum(result["success_all"]),
     )
     return result
 
@@ -349,6 +483,12 @@ def _optimize_desc_fmin_scalar(
     """
     assert constraint is None, f"method {method} doesn't support constraints"
     options = {} if options is None else options
+    errorif(
+        options.get("tr_method") == "cg" and isinstance(objective, ProximalProjection),
+        ValueError,
+        "tr_method='cg' needs Hessian-vector products, which are not available "
+        "for ProximalProjection, use a different tr_method.",
+    )
     hess = objective.hess if "bfgs" not in method else "bfgs"
     if not isinstance(x_scale, str) and jnp.allclose(x_scale, 1):
         options.setdefault("initial_trust_ratio", 1e-3)
@@ -371,6 +511,7 @@ def _optimize_desc_fmin_scalar(
         verbose=verbose,
         callback=None,
         options=options,
+        hvp=objective.hvp,
     )
     return result
 
@@ -0,0 +1,540 @@
+"""Spectral multigrid solvers for fixed boundary equilibrium problems."""
+
+import warnings
+
+import numpy as np
+
+from desc.backend import jax, jnp
+from desc.objectives import (
+    ForceBalance,
+    HelicalForceBalance,
+    ObjectiveFunction,
+    RadialForceBalance,
+    get_equilibrium_objective,
+    get_fixed_boundary_constraints,
+    maybe_add_self_consistency,
+)
+from desc.utils import copy_coeffs, errorif
+
+from ._constraint_wrappers import LinearConstraintProjection
+from .least_squares import lsqtr
+from .optimizer import register_optimizer
+from .utils import CoarseGridPreconditioner, Telemetry
+
+# objectives that can be rebuilt on a coarser equilibrium, and the mode of
+# get_equilibrium_objective that gives them
+_OBJECTIVE_MODES = {
+    frozenset([ForceBalance]): "force",
+    frozenset([RadialForceBalance, HelicalForceBalance]): "forces",
+}
+
+
+def _basis(eq, key):
+    """Basis of the parameter ``key`` of ``eq``, or None if it doesn't have one."""
+    bases = {
+        "R_lmn": lambda: eq.R_basis,
+        "Z_lmn": lambda: eq.Z_basis,
+        "L_lmn": lambda: eq.L_basis,
+        "Rb_lmn": lambda: eq.surface.R_basis,
+        "Zb_lmn": lambda: eq.surface.Z_basis,
+        "Ra_n": lambda: eq.axis.R_basis,
+        "Za_n": lambda: eq.axis.Z_basis,
+    }
+    return bases[key]() if key in bases else None
+
+
+def _transfer_indices(eq_fine, eq_coarse):
+    """Indices of the state vectors of two resolutions that hold the same modes.
+
+    ``x_fine[fine_idx]`` and ``x_coarse[coarse_idx]`` are the coefficients of the
+    same modes, every other coefficient only exists at the fine resolution. So
+    prolongation is zero padding, restriction is truncation and they are transposes
+    of each other, like ``Equilibrium.change_resolution``.
+    """
+    fine_idx, coarse_idx = [], []
+    for key in eq_coarse.optimizable_params:
+        idx_f = np.asarray(eq_fine.x_idx[key])
+        idx_c = np.asarray(eq_coarse.x_idx[key])
+        basis_f, basis_c = _basis(eq_fine, key), _basis(eq_coarse, key)
+        if basis_c is None:
+            errorif(
+                idx_f.size != idx_c.size,
+                ValueError,
+                f"Parameter {key} has different sizes at different resolutions.",
+            )
+            fine_idx.append(idx_f)
+            coarse_idx.append(idx_c)
+            continue
+        # position + 1 of each fine mode in the coarse basis, or 0 if not in it
+        pos = np.asarray(
+            copy_coeffs(np.arange(1, idx_c.size + 1), basis_c.modes, basis_f.modes)
+        ).astype(int)
+        fine_idx.append(idx_f[pos > 0])
+        coarse_idx.append(idx_c[pos[pos > 0] - 1])
+    return np.concatenate(fine_idx), np.concatenate(coarse_idx)
+
+
+class _Level:
+    """Equilibrium problem at one resolution of the multigrid hierarchy."""
+
+    def __init__(self, objective, fine=None):
+        self.objective = objective
+        self.eq = objective._objective.things[0]
+        if fine is not None:
+            self.fine_idx, self.coarse_idx = _transfer_indices(fine.eq, self.eq)
+            self.dim_x_fine = fine.objective._objective.dim_x
+        self.nit = self.nfev = self.njev = 0
+        self._jac_x = self._jac = None
+
+    def restrict(self, x_fine):
+        """Truncate a full state vector of the finer level to this level."""
+        x = jnp.zeros(self.objective._objective.dim_x, dtype=x_fine.dtype)
+        return x.at[self.coarse_idx].set(x_fine[self.fine_idx])
+
+    def prolong(self, x):
+        """Zero pad a full state vector of this level to the finer level."""
+        x_fine = jnp.zeros(self.dim_x_fine, dtype=x.dtype)
+        return x_fine.at[self.fine_idx].set(x[self.coarse_idx])
+
+    def fun(self, y, shift=0.0):
+        """Residual of the level, shifted by a constant."""
+        self.nfev += 1
+        return self.objective.compute_scaled_error(y) - shift
+
+    def jac(self, y, *args):
+        """Jacobian of the level, reusing the last one if y hasn't changed.
+
+        Consecutive smoothing steps at a level often start where the previous ones
+        stopped, so this saves one Jacobian each time.
+        """
+        if self._jac_x is None or not jnp.array_equal(y, self._jac_x):
+            self._jac = self.objective.jac_scaled_error(y, *args)
+            self._jac_x = y
+            self.njev += 1
+        return self._jac
+
+    def smooth(self, y, shift, x_scale, stoptol, maxiter, options):
+        """Take up to maxiter trust region steps on 1/2 |f(y) - shift|**2."""
+        objective = self.objective
+        result = lsqtr(
+            lambda y, *args: objective.compute_scaled_error(y, *args) - shift,
+            x0=y,
+            jac=self.jac,
+            args=(objective.constants,),
+            x_scale=x_scale,
+            ftol=stoptol["ftol"],
+            xtol=stoptol["xtol"],
+            gtol=stoptol["gtol"],
+            maxiter=maxiter,
+            verbose=0,
+            options=options.copy(),
+            jvp=objective.jvp_scaled_error,
+            vjp=objective.vjp_scaled_error,
+        )
+        self.nit += result["nit"]
+        self.nfev += result["nfev"]
+        return result
+
+
+def _build_levels(objective, levels, verbose):
+    """Rebuild the objective and constraints on successively coarser equilibria."""
+    from desc.equilibrium import Equilibrium
+
+    things = objective._objective.things
+    errorif(
+        len(things) != 1 or not isinstance(things[0], Equilibrium),
+        ValueError,
+        "Multigrid can only be used to solve for a single Equilibrium.",
+    )
+    eq = things[0]
+    mode = _OBJECTIVE_MODES.get(
+        frozenset(type(obj) for obj in objective._objective.objectives)
+    )
+    errorif(
+        mode is None,
+        ValueError,
+        "Multigrid can only be used with the 'force' or 'forces' equilibrium "
+        + "objectives, got "
+        + f"{[obj.name for obj in objective._objective.objectives]}.",
+    )
+    constraint_types = {type(con) for con in objective._constraint.objectives}
+    default_types = {
+        type(con)
+        for con in maybe_add_self_consistency(eq, get_fixed_boundary_constraints(eq))
+    }
+    errorif(
+        constraint_types != default_types,
+        ValueError,
+        "Multigrid can only be used with the default fixed boundary constraints.",
+    )
+
+    # coarse problems start from the current solution, which satisfies the constraints
+    eq = eq.copy()
+    eq.params_dict = objective._objective.unpack_state(
+        objective.recover(objective.x(*objective.things)), False
+    )[0]
+    hierarchy = [_Level(objective)]
+    for _ in range(levels - 1):
+        L, M, N = max(eq.L // 2, 1), max(eq.M // 2, 1), eq.N // 2
+        if M < 2 or (L, M, N) == (eq.L, eq.M, eq.N):
+            break
+        eq = eq.copy()
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="Reducing radial")
+            eq.change_resolution(
+                L,
+                M,
+                N,
+                L_grid=max(-(-eq.L_grid // 2), L),
+                M_grid=max(-(-eq.M_grid // 2), M),
+                N_grid=max(-(-eq.N_grid // 2), N),
+            )
+        constraint = ObjectiveFunction(
+            maybe_add_self_consistency(eq, get_fixed_boundary_constraints(eq))
+        )
+        coarse = LinearConstraintProjection(
+            get_equilibrium_objective(eq, mode=mode),
+            constraint,
+            factorization=objective._factorization,
+        )
+        coarse.build(verbose=max(verbose - 2, 0))
+        hierarchy.append(_Level(coarse, fine=hierarchy[-1]))
+    return hierarchy
+
+
+def _coarse_grid_preconditioner(fine, coarse):
+    """Preconditioner for the fine level from the Jacobian of the coarse level."""
+    # coarse steps in the fine reduced variables. The map is linear and doesn't
+    # depend on the solution, so it is only computed once
+    S = jax.jacfwd(
+        lambda y_c: fine.objective.project(
+            coarse.prolong(coarse.objective.recover(y_c))
+        )
+    )(jnp.zeros(coarse.objective._dim_x_reduced))
+
+    def precond(y, *args):
+        x = fine.objective.recover(y)
+        y_c = coarse.objective.project(coarse.restrict(x))
+        J_c = coarse.jac(y_c, coarse.objective.constants)
+        return CoarseGridPreconditioner.from_jac(S, J_c)
+
+    return precond
+
+
+def _vcycle(hierarchy, k, y, shift, x_scale, stoptol, opts):
+    """Improve the solution of level k with one V-cycle.
+
+    Returns the new solution and the result of the last trust region solve.
+    """
+    level = hierarchy[k]
+    if k == len(hierarchy) - 1:
+        if k == 0:  # resolution too low to coarsen, just solve it
+            maxiter = stoptol["maxiter"] - level.nit
+        else:
+            maxiter, x_scale = opts["coarse_maxiter"], "jac"
+        result = level.smooth(y, shift, x_scale, stoptol, maxiter, opts["lsq"])
+        return result["x"], result
+
+    if opts["pre_smooth"]:
+        y = level.smooth(y, shift, x_scale, stoptol, opts["pre_smooth"], opts["lsq"])[
+            "x"
+        ]
+
+    # restrict the current solution to the coarse level
+    coarse = hierarchy[k + 1]
+    x = level.objective.recover(y)
+    y_c0 = coarse.objective.project(coarse.restrict(x))
+
+    # gradient of the fine cost in the coarse variables, ie along the prolongation
+    # of coarse steps, which satisfy the fine constraints
+    f = level.fun(y, shift)
+    g = level.objective._objective.vjp_scaled_error(f, x)
+    g_c = coarse.restrict(g) @ coarse.objective._unfixed_idx_mat
+    # full approximation scheme: shift the coarse residual so that the gradient of
+    # the coarse cost at the restricted solution equals the restricted fine gradient,
+    # then the coarse problem corrects the smooth error of the fine problem
+    f_c = coarse.fun(y_c0)
+    J_c = coarse.jac(y_c0, coarse.objective.constants)
+    shift_c = jnp.linalg.lstsq(J_c.T, J_c.T @ f_c - g_c)[0]
+    y_c, _ = _vcycle(hierarchy, k + 1, y_c0, shift_c, x_scale, stoptol, opts)
+
+    # prolong the coarse correction, backtracking if it doesn't reduce the cost
+    dx = coarse.prolong(coarse.objective.recover(y_c) - coarse.objective.recover(y_c0))
+    cost = jnp.sum(f**2) / 2
+    for alpha in [1.0, 0.5, 0.25]:
+        y_new = level.objective.project(x + alpha * dx)
+        if jnp.sum(level.fun(y_new, shift) ** 2) / 2 < cost:
+            y = y_new
+            break
+
+    result = level.smooth(y, shift, x_scale, stoptol, opts["post_smooth"], opts["lsq"])
+    return result["x"], result
+
+
+@register_optimizer(
+    name="lsq-multigrid",
+    description="Spectral multigrid for fixed boundary equilibrium solves. Trust "
+    + "region least squares steps at the full resolution are combined with "
+    + "corrections from the same problem at lower spectral resolutions.",
+    scalar=False,
+    equality_constraints=False,
+    inequality_constraints=False,
+    stochastic=False,
+    hessian=False,
+    GPU=True,
+)
+def _optimize_desc_multigrid(
+    objective, constraint, x0, method, x_scale, verbose, stoptol, options=None
+):
+    """Solve a fixed boundary equilibrium with spectral multigrid V-cycles.
+
+    Each V-cycle takes a few trust region steps at the full resolution, restricts
+    the solution to a lower spectral resolution (truncating the Fourier-Zernike
+    coefficients), solves a coarse problem whose residual is shifted so that its
+    gradient matches the restricted fine gradient (the full approximation scheme),
+    and adds the zero-padded coarse correction back before a few more steps at the
+    full resolution. Coarse levels are solved recursively by the same method, so
+    most of the iterations are done where Jacobians are cheap.
+
+    Parameters
+    ----------
+    objective : LinearConstraintProjection
+        Force balance objective, with the default fixed boundary constraints.
+    constraint : ObjectiveFunction
+        Constraint to satisfy - not supported by this method
+    x0 : ndarray
+        Starting point.
+    method : {"lsq-multigrid"}
+        Name of the method to use.
+    x_scale : array_like or ‘jac’, optional
+        Characteristic scale of each variable at the full resolution. Coarse levels
+        always use the inverse norms of the columns of the Jacobian matrix.
+    verbose : int
+        * 0  : work silently.
+        * 1 : display a termination report.
+        * 2 : display progress after each cycle
+    stoptol : dict
+        Dictionary of stopping tolerances, with keys {"xtol", "ftol", "gtol", "ctol",
+        "maxiter", "max_nfev", "max_njev", "max_ngev", "max_nhev"}. ``maxiter`` is
+        the maximum number of steps at the full resolution.
+    options : dict, optional
+        Dictionary of optional keyword arguments to override default solver
+        settings. See ``desc.optimize.lsqtr`` for details. Additionally accepts
+
+        - ``"levels"`` : (int > 1) Number of resolutions, each one halving ``L``,
+          ``M`` and ``N`` (and the grid resolution) of the previous one. Fewer are
+          used if ``M`` would drop below 2, if there are none this is the same as
+          ``"lsq-exact"``. Default 2.
+        - ``"pre_smooth"`` : (int >= 0) Number of steps before the coarse correction
+          at each level. Default 1.
+        - ``"post_smooth"`` : (int > 0) Number of steps after the coarse correction
+          at each level. Default 2.
+        - ``"coarse_maxiter"`` : (int > 0) Maximum number of steps at the coarsest
+          level. Default 20.
+
+    Returns
+    -------
+    res : OptimizeResult
+       The optimization result represented as a ``OptimizeResult`` object.
+       Important attributes are: ``x`` the solution array, ``success`` a
+       Boolean flag indicating if the optimizer exited successfully and
+       ``message`` which describes the cause of the termination. See
+       `OptimizeResult` for a description of other attributes.
+
+    """
+    assert constraint is None, f"method {method} doesn't support constraints"
+    errorif(
+        not isinstance(objective, LinearConstraintProjection),
+        ValueError,
+        f"method {method} needs a LinearConstraintProjection of an equilibrium "
+        + "objective, as made by Equilibrium.solve.",
+    )
+    options = {} if options is None else options.copy()
+    levels = options.pop("levels", 2)
+    opts = {
+        "pre_smooth": options.pop("pre_smooth", 1),
+        "post_smooth": options.pop("post_smooth", 2),
+        "coarse_maxiter": options.pop("coarse_maxiter", 20),
+    }
+    errorif(
+        levels < 2 or opts["post_smooth"] < 1,
+        ValueError,
+        "levels should be at least 2 and post_smooth at least 1, got "
+        + f"{levels} and {opts['post_smooth']}.",
+    )
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), method)
+    if not isinstance(x_scale, str) and jnp.allclose(x_scale, 1):
+        options.setdefault("initial_trust_radius", 1e-3)
+        options.setdefault("max_trust_radius", 1.0)
+    elif options.get("initial_trust_radius", "scipy") == "scipy":
+        options.setdefault("initial_trust_ratio", 0.1)
+    opts["lsq"] = options
+
+    hierarchy = _build_levels(objective, levels, verbose)
+    if verbose > 1:
+        print(
+            "Multigrid resolutions (L, M, N): "
+            + ", ".join(f"({lv.eq.L}, {lv.eq.M}, {lv.eq.N})" for lv in hierarchy)
+        )
+
+    y = x0
+    allx = [x0]
+    fine = hierarchy[0]
+    cycle = 0
+    while fine.nit < stoptol["maxiter"]:
+        cycle += 1
+        y, result = _vcycle(hierarchy, 0, y, 0.0, x_scale, stoptol, opts)
+        allx.append(y)
+        njev = [level.njev for level in hierarchy]
+        if verbose > 1:
+            print(
+                f"Cycle {cycle}: cost {result['cost']:.3e}, "
+                + f"optimality {result['optimality']:.3e}, "
+                + f"Jacobian evaluations per level {njev}"
+            )
+        telemetry.record(
+            cycle,
+            x=y,
+            f=result["fun"],
+            nfev=fine.nfev,
+            njev=fine.njev,
+            njev_levels=njev,
+            cost=result["cost"],
+            optimality=result["optimality"],
+        )
+        if result["success"] or fine.nfev >= stoptol["max_nfev"]:
+            break
+
+    result["x"] = y
+    result["allx"] = allx
+    result["nit"] = fine.nit
+    result["nfev"] = fine.nfev
+    result["njev"] = fine.njev
+    result["njev_levels"] = [level.njev for level in hierarchy]
+    result["ncycles"] = cycle
+    if verbose > 0:
+        if result["success"]:
+            print(result["message"])
+        else:
+            print("Warning: " + result["message"])
+        print("         Current function value: {:.3e}".format(result["cost"]))
+        print("         Multigrid cycles: {:d}".format(cycle))
+        print("         Iterations: {:d}".format(result["nit"]))
+        print("         Function evaluations: {:d}".format(result["nfev"]))
+        print("         Jacobian evaluations: {:d}".format(result["njev"]))
+    return result
+
+
+@register_optimizer(
+    name="lsq-jfnk",
+    description="Jacobian-free Newton-Krylov for fixed boundary equilibrium solves. "
+    + "Matrix free trust region least squares, with conjugate gradients "
+    + "preconditioned by the factorized Jacobian of the same problem at a lower "
+    + "spectral resolution.",
+    scalar=False,
+    equality_constraints=False,
+    inequality_constraints=False,
+    stochastic=False,
+    hessian=False,
+    GPU=True,
+)
+def _optimize_desc_jfnk(
+    objective, constraint, x0, method, x_scale, verbose, stoptol, options=None
+):
+    """Solve a fixed boundary equilibrium with a Jacobian-free Newton-Krylov method.
+
+    Takes trust region steps with ``tr_method="cg"`` in ``desc.optimize.lsqtr``, so
+    the Jacobian at the full resolution is only used through ``jvp_scaled_error``
+    and ``vjp_scaled_error`` and is never formed. The conjugate gradient iterations
+    are preconditioned with the Jacobian of the same problem at half the spectral
+    resolution, which is formed and factorized at the start and reused for many
+    steps. This needs much less memory than ``"lsq-exact"``, and far fewer
+    Jacobian-vector products than ``tr_method="cg"`` without preconditioning.
+
+    Parameters
+    ----------
+    objective : LinearConstraintProjection
+        Force balance objective, with the default fixed boundary constraints.
+    constraint : ObjectiveFunction
+        Constraint to satisfy - not supported by this method
+    x0 : ndarray
+        Starting point.
+    method : {"lsq-jfnk"}
+        Name of the method to use.
+    x_scale : array_like or ‘jac’, optional
+        Characteristic scale of each variable. With ``'jac'``, the column norms of
+        the Jacobian are estimated from a few vector-Jacobian products.
+    verbose : int
+        * 0  : work silently.
+        * 1 : display a termination report.
+        * 2 : display progress during iterations
+    stoptol : dict
+        Dictionary of stopping tolerances, with keys {"xtol", "ftol", "gtol", "ctol",
+        "maxiter", "max_nfev", "max_njev", "max_ngev", "max_nhev"}
+    options : dict, optional
+        Dictionary of optional keyword arguments to override default solver
+        settings. See ``desc.optimize.lsqtr`` for details, in particular
+        ``"cg_maxiter"``, ``"cg_rtol"`` and ``"cg_precond_every"``, the number of
+        accepted steps after which the coarse Jacobian is recomputed (default 0,
+        never). If the resolution is too low to coarsen, with ``M`` less than 4,
+        the conjugate gradients are not preconditioned.
+
+    Returns
+    -------
+    res : OptimizeResult
+       The optimization result represented as a ``OptimizeResult`` object.
+       Important attributes are: ``x`` the solution array, ``success`` a
+       Boolean flag indicating if the optimizer exited successfully and
+       ``message`` which describes the cause of the termination. See
+       `OptimizeResult` for a description of other attributes.
+
+    """
+    assert constraint is None, f"method {method} doesn't support constraints"
+    errorif(
+        not isinstance(objective, LinearConstraintProjection),
+        ValueError,
+        f"method {method} needs a LinearConstraintProjection of an equilibrium "
+        + "objective, as made by Equilibrium.solve.",
+    )
+    options = {} if options is None else options.copy()
+    errorif(
+        options.pop("tr_method", "cg") != "cg",
+        ValueError,
+        f"method {method} only supports tr_method='cg'.",
+    )
+    if not isinstance(x_scale, str) and jnp.allclose(x_scale, 1):
+        options.setdefault("initial_trust_radius", 1e-3)
+        options.setdefault("max_trust_radius", 1.0)
+    elif options.get("initial_trust_radius", "scipy") == "scipy":
+        options.setdefault("initial_trust_ratio", 0.1)
+    options["max_nfev"] = stoptol["max_nfev"]
+    options["tr_method"] = "cg"
+
+    hierarchy = _build_levels(objective, 2, verbose)
+    if len(hierarchy) > 1:
+        options["cg_precond"] = _coarse_grid_preconditioner(*hierarchy)
+        if verbose > 1:
+            coarse = hierarchy[-1].eq
+            print(
+                "Preconditioning with the Jacobian at resolution (L, M, N): "
+                + f"({coarse.L}, {coarse.M}, {coarse.N})"
+            )
+
+    result = lsqtr(
+        objective.compute_scaled_error,
+        x0=x0,
+        jac=objective.jac_scaled_error,
+        args=(objective.constants,),
+        x_scale=x_scale,
+        ftol=stoptol["ftol"],
+        xtol=stoptol["xtol"],
+        gtol=stoptol["gtol"],
+        maxiter=stoptol["maxiter"],
+        verbose=verbose,
+        callback=None,
+        options=options,
+        jvp=objective.jvp_scaled_error,
+        vjp=objective.vjp_scaled_error,
+    )
+    result["njev_coarse"] = hierarchy[-1].njev if len(hierarchy) > 1 else 0
+    return result
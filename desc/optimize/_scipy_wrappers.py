@@ -8,6 +8,7 @@ from desc.backend import jnp
 
 from .optimizer import register_optimizer
 from .utils import (
+    Telemetry,
     check_termination,
     compute_hess_scale,
     compute_jac_scale,
@@ -83,7 +84,8 @@ def _optimize_scipy_minimize(  # noqa: C901
         "maxiter", "max_nfev"}
     options : dict, optional
         Dictionary of optional keyword arguments to override default solver
-        settings. See ``scipy.optimize.minimize`` for details.
+        settings. See ``scipy.optimize.minimize`` for details. The
+        ``"telemetry"`` option is handled by DESC, see ``desc.optimize.lsqtr``.
 
     Returns
     -------
@@ -99,7 +101,10 @@ def _optimize_scipy_minimize(  # noqa: C901
     options = {} if options is None else options
     options.setdefault("maxiter", stoptol["maxiter"])
     options.setdefault("disp", False)
-    fun, grad, hess = objective.compute_scalar, objective.grad, objective.hess
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), method)
+    fun = telemetry.wrap("fun", objective.compute_scalar)
+    grad = telemetry.wrap("grad", objective.grad)
+    hess = telemetry.wrap("hess", objective.hess)
     if isinstance(x_scale, str) and x_scale == "auto":
         H = hess(x0)
         scale, _ = compute_hess_scale(H)
@@ -204,6 +209,17 @@ def _optimize_scipy_minimize(  # noqa: C901
             print_iteration_nonlinear(
                 len(allx) - 1, len(func_allx), f1, df, dx_norm, g_norm
             )
+        telemetry.record(
+            len(allx) - 1,
+            x1,
+            nfev=len(func_allx),
+            ngev=len(grad_allx),
+            nhev=len(hess_allx),
+            cost=f1,
+            cost_reduction=df,
+            step_norm=dx_norm,
+            optimality=g_norm,
+        )
 
         success[0], message[0] = check_termination(
             df,
@@ -338,7 +354,8 @@ def _optimize_scipy_least_squares(  # noqa: C901
         "maxiter", "max_nfev"}
     options : dict, optional
         Dictionary of optional keyword arguments to override default solver
-        settings. See ``scipy.optimize.least_squares`` for details.
+        settings. See ``scipy.optimize.least_squares`` for details. The
+        ``"telemetry"`` option is handled by DESC, see ``desc.optimize.lsqtr``.
 
     Returns
     -------
@@ -353,7 +370,9 @@ def _optimize_scipy_least_squares(  # noqa: C901
     assert constraint is None, f"method {method} doesn't support constraints"
     options = {} if options is None else options
     x_scale = "jac" if x_scale == "auto" else x_scale
-    fun, jac = objective.compute_scaled_error, objective.jac_scaled_error
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), method)
+    fun = telemetry.wrap("fun", objective.compute_scaled_error)
+    jac = telemetry.wrap("jac", objective.jac_scaled_error)
     # need to use some "global" variables here
     fun_allx = []
     fun_allf = []
@@ -410,6 +429,17 @@ def _optimize_scipy_least_squares(  # noqa: C901
             print_iteration_nonlinear(
                 len(jac_allx), len(fun_allx), c1, df, dx_norm, g_norm
             )
+        telemetry.record(
+            len(jac_allx),
+            x1,
+            f1,
+            nfev=len(fun_allx),
+            njev=len(jac_allx),
+            cost=c1,
+            cost_reduction=df,
+            step_norm=dx_norm,
+            optimality=g_norm,
+        )
         success[0], message[0] = check_termination(
             df,
             c1,
@@ -537,7 +567,8 @@ def _optimize_scipy_constrained(  # noqa: C901
         "maxiter", "max_nfev"}
     options : dict, optional
         Dictionary of optional keyword arguments to override default solver
-        settings. See ``scipy.optimize.minimize`` for details.
+        settings. See ``scipy.optimize.minimize`` for details. The
+        ``"telemetry"`` option is handled by DESC, see ``desc.optimize.lsqtr``.
 
     Returns
     -------
@@ -552,7 +583,10 @@ def _optimize_scipy_constrained(  # noqa: C901
     options = {} if options is None else options
     options.setdefault("maxiter", stoptol["max_nfev"])
     options.setdefault("disp", False)
-    fun, grad, hess = objective.compute_scalar, objective.grad, objective.hess
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), method)
+    fun = telemetry.wrap("fun", objective.compute_scalar)
+    grad = telemetry.wrap("grad", objective.grad)
+    hess = telemetry.wrap("hess", objective.hess)
 
     if isinstance(x_scale, str) and x_scale == "auto":
         H = hess(x0)
@@ -574,6 +608,8 @@ def _optimize_scipy_constrained(  # noqa: C901
             J = constraint.jac_scaled(x0)
             Jscale, _ = compute_jac_scale(J)
             scale = jnp.sqrt(scale * Jscale)
+        cfun = telemetry.wrap("constraint", constraint.compute_scaled)
+        cjac = telemetry.wrap("constraint_jac", constraint.jac_scaled)
 
         def cfun_wrapped(xs):
             # record all the x and fs we see
@@ -584,7 +620,7 @@ def _optimize_scipy_constrained(  # noqa: C901
                 f = np.array([])
             if not f.size:
                 cfun_allx.append(x)
-                f = constraint.compute_scaled(x, constraint.constants)
+                f = cfun(x, constraint.constants)
                 cfun_allf.append(f)
             return f
 
@@ -596,7 +632,7 @@ def _optimize_scipy_constrained(  # noqa: C901
                 J = np.array([[]])
             if not J.size:
                 cjac_allx.append(x)
-                J = constraint.jac_scaled(x, constraint.constants)
+                J = cjac(x, constraint.constants)
                 cjac_allf.append(J)
             return J * scale
 
@@ -729,6 +765,18 @@ def _optimize_scipy_constrained(  # noqa: C901
                 g_norm,
                 constr_violation,
             )
+        telemetry.record(
+            len(allx) - 1,
+            x1,
+            nfev=len(func_allx),
+            ngev=len(grad_allx),
+            nhev=len(hess_allx),
+            cost=f1,
+            cost_reduction=df,
+            step_norm=dx_norm,
+            optimality=g_norm,
+            constr_violation=constr_violation,
+        )
         success[0], message[0] = check_termination(
             df,
             f1,
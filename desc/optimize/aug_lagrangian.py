@@ -20,6 +20,7 @@ from .tr_subproblems import (
 )
 from .utils import (
     STATUS_MESSAGES,
+    Telemetry,
     check_termination,
     compute_hess_scale,
     inequality_to_bounds,
@@ -172,6 +173,10 @@ def fmin_auglag(  # noqa: C901
           approximates the optimal step using Powell's dogleg method. ``"subspace"``
           solves a reduced subproblem over the space spanned by the gradient and Newton
           direction. Default ``"exact"``
+        - ``"telemetry"`` : (str, path-like or callable) Where to send a machine
+          readable record of each iteration, see ``desc.optimize.lsqtr``. Records
+          also include the constraint violation, mean penalty parameter and largest
+          multiplier.
         - ``"hessian_exception_strategy"`` : (``"skip_update"``, ``"damp_update"``)
           If BFGS is used, defines how to proceed when the curvature condition is
           violated. Set it to 'skip_update' to just skip the update. Or, alternatively,
@@ -234,6 +239,14 @@ def fmin_auglag(  # noqa: C901
         bounds,
         *args,
     )
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), "fmin_auglag")
+    fun_wrapped = telemetry.wrap("fun", fun_wrapped)
+    grad_wrapped = telemetry.wrap("grad", grad_wrapped)
+    if callable(hess_wrapped):
+        hess_wrapped = telemetry.wrap("hess", hess_wrapped)
+    constraint_wrapped.fun = telemetry.wrap("constraint", constraint_wrapped.fun)
+    constraint_wrapped.jac = telemetry.wrap("constraint_jac", constraint_wrapped.jac)
+    constraint_wrapped.vjp = telemetry.wrap("constraint_jac", constraint_wrapped.vjp)
 
     def lagfun(f, c, y, mu, *args):
         return f - jnp.dot(y, c) + jnp.sum(mu / 2 * c * c)
@@ -389,7 +402,7 @@ def fmin_auglag(  # noqa: C901
         ValueError,
         f"tr_method should be one of {methods.keys()}, got {tr_method}",
     )
-    subproblem = methods[tr_method]
+    subproblem = telemetry.wrap("subproblem", methods[tr_method])
 
     z_norm = jnp.linalg.norm(((z * scale_inv) if scaled_termination else z), ord=2)
     success = None
@@ -429,6 +442,19 @@ def fmin_auglag(  # noqa: C901
             jnp.mean(mu),
             jnp.max(jnp.abs(y)),
         )
+    telemetry.record(
+        iteration,
+        z2xs(z)[0],
+        nfev=nfev,
+        ngev=ngev,
+        nhev=nhev,
+        cost=f,
+        optimality=g_norm,
+        trust_radius=trust_radius,
+        constr_violation=constr_violation,
+        penalty_param=jnp.mean(mu),
+        max_multiplier=jnp.max(jnp.abs(y)),
+    )
 
     while iteration < maxiter and success is None:
 
@@ -605,6 +631,21 @@ def fmin_auglag(  # noqa: C901
                 jnp.mean(mu),
                 jnp.max(jnp.abs(y)),
             )
+        telemetry.record(
+            iteration,
+            z2xs(z)[0],
+            nfev=nfev,
+            ngev=ngev,
+            nhev=nhev,
+            cost=f,
+            cost_reduction=actual_reduction,
+            step_norm=step_norm,
+            optimality=g_norm,
+            trust_radius=trust_radius,
+            constr_violation=constr_violation,
+            penalty_param=jnp.mean(mu),
+            max_multiplier=jnp.max(jnp.abs(y)),
+        )
 
     if g_norm < gtol and constr_violation < ctol:
         success, message = True, STATUS_MESSAGES["gtol"]
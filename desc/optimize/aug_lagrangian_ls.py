@@ -1,5 +1,7 @@
 """Augmented Lagrangian for vector valued objectives."""
 
+import functools
+
 from scipy.optimize import NonlinearConstraint, OptimizeResult
 
 from desc.backend import jnp, qr
@@ -20,6 +22,8 @@ from .tr_subproblems import (
 )
 from .utils import (
     STATUS_MESSAGES,
+    Telemetry,
+    broyden_update,
     check_termination,
     compute_jac_scale,
     inequality_to_bounds,
@@ -173,8 +177,21 @@ def lsq_auglag(  # noqa: C901
           value decomposition. ``"cho"`` is generally the fastest for large systems,
           especially on GPU, but may be less accurate for badly scaled systems.
           ``"svd"`` is the most accurate but significantly slower. Default ``"qr"``.
+        - ``"broyden_updates"`` : (int >= 0) Maximum number of consecutive accepted
+          steps after which the Jacobian is updated with Broyden's rank one secant
+          formula instead of being recomputed. A fresh Jacobian is computed when this
+          many updates have been made, or when the ratio of actual to predicted
+          reduction falls below ``"broyden_threshold"``. Default 0, which always
+          recomputes the Jacobian.
+        - ``"broyden_threshold"`` : (0 < float < 1) Ratio of actual to predicted
+          reduction below which a Jacobian from Broyden updates is discarded and
+          recomputed. Default 0.5.
         - ``"scaled_termination"`` : Whether to evaluate termination criteria for
           ``xtol`` and ``gtol`` in scaled / normalized units (default) or base units.
+        - ``"telemetry"`` : (str, path-like or callable) Where to send a machine
+          readable record of each iteration, see ``desc.optimize.lsqtr``. Records
+          also include the constraint violation, mean penalty parameter and largest
+          multiplier.
 
     Returns
     -------
@@ -216,6 +233,13 @@ def lsq_auglag(  # noqa: C901
         bounds,
         *args,
     )
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), "lsq_auglag")
+    fun_wrapped = telemetry.wrap("fun", fun_wrapped)
+    jac_wrapped = telemetry.wrap("jac", jac_wrapped)
+    constraint_wrapped.fun = telemetry.wrap("constraint", constraint_wrapped.fun)
+    constraint_wrapped.jac = telemetry.wrap("constraint_jac", constraint_wrapped.jac)
+    factorize = functools.partial(telemetry.wrap, "factorize")
+    subproblem = functools.partial(telemetry.wrap, "subproblem")
 
     # L(x,y,mu) = 1/2 f(x)^2 - y*c(x) + mu/2 c(x)^2 + y^2/(2*mu)
     # = 1/2 f(x)^2 + 1/2 [-y/sqrt(mu) + sqrt(mu) c(x)]^2
@@ -309,6 +333,8 @@ def lsq_auglag(  # noqa: C901
     tr_increase_ratio = options.pop("tr_increase_ratio", 4)
     tr_decrease_ratio = options.pop("tr_decrease_ratio", 0.25)
     tr_method = options.pop("tr_method", "qr")
+    broyden_updates = options.pop("broyden_updates", 0)
+    broyden_threshold = options.pop("broyden_threshold", 0.5)
 
     errorif(
         len(options) > 0,
@@ -330,6 +356,7 @@ def lsq_auglag(  # noqa: C901
     actual_reduction = jnp.inf
     Lactual_reduction = jnp.inf
     alpha = None  # "Levenberg-Marquardt" parameter
+    num_broyden = 0  # number of Broyden updates since the last fresh Jacobian
 
     allx = [z]
     alltr = [trust_radius]
@@ -361,6 +388,19 @@ def lsq_auglag(  # noqa: C901
             jnp.mean(mu),
             jnp.max(jnp.abs(y)),
         )
+    telemetry.record(
+        iteration,
+        z2xs(z)[0],
+        f,
+        nfev=nfev,
+        njev=njev,
+        cost=cost,
+        optimality=g_norm,
+        trust_radius=trust_radius,
+        constr_violation=constr_violation,
+        penalty_param=jnp.mean(mu),
+        max_multiplier=jnp.max(jnp.abs(y)),
+    )
 
     while iteration < maxiter and success is None:
 
@@ -369,17 +409,17 @@ def lsq_auglag(  # noqa: C901
         L_a = jnp.concatenate([L, jnp.zeros(diag_h.size)]) if bounded else L
 
         if tr_method == "svd":
-            U, s, Vt = jnp.linalg.svd(J_a, full_matrices=False)
+            U, s, Vt = factorize(jnp.linalg.svd)(J_a, full_matrices=False)
         elif tr_method == "cho":
-            B_h = jnp.dot(J_a.T, J_a)
+            B_h = factorize(jnp.dot)(J_a.T, J_a)
         elif tr_method == "qr":
             # try full newton step
             tall = J_a.shape[0] >= J_a.shape[1]
             if tall:
-                Q, R = qr(J_a, mode="economic")
+                Q, R = factorize(qr)(J_a, mode="economic")
                 p_newton = solve_triangular_regularized(R, -Q.T @ L_a)
             else:
-                Q, R = qr(J_a.T, mode="economic")
+                Q, R = factorize(qr)(J_a.T, mode="economic")
                 p_newton = Q @ solve_triangular_regularized(R.T, -L_a, lower=True)
 
         actual_reduction = -1
@@ -394,15 +434,15 @@ def lsq_auglag(  # noqa: C901
             # and it tells us whether the proposed step
             # has reached the trust region boundary or not.
             if tr_method == "svd":
-                step_h, hits_boundary, alpha = trust_region_step_exact_svd(
+                step_h, hits_boundary, alpha = subproblem(trust_region_step_exact_svd)(
                     L_a, U, s, Vt.T, trust_radius, alpha
                 )
             elif tr_method == "cho":
-                step_h, hits_boundary, alpha = trust_region_step_exact_cho(
+                step_h, hits_boundary, alpha = subproblem(trust_region_step_exact_cho)(
                     g_h, B_h, trust_radius, alpha
                 )
             elif tr_method == "qr":
-                step_h, hits_boundary, alpha = trust_region_step_exact_qr(
+                step_h, hits_boundary, alpha = subproblem(trust_region_step_exact_qr)(
                     p_newton, L_a, J_a, trust_radius, alpha
                 )
 
@@ -463,7 +503,8 @@ def lsq_auglag(  # noqa: C901
                 Lreduction_ratio,
                 ftol,
                 xtol,
-                gtol,
+                # the gradient is only approximate after Broyden updates
+                gtol if num_broyden == 0 else 0,
                 iteration,
                 maxiter,
                 nfev,
@@ -476,19 +517,36 @@ def lsq_auglag(  # noqa: C901
             )
             if success is not None:
                 break
+            if num_broyden > 0 and Lreduction_ratio < broyden_threshold:
+                # the model may be bad because of the approximate Jacobian,
+                # so recompute it rather than shrinking the trust region further
+                break
 
-        # if reduction was enough, accept the step
-        if Lactual_reduction > 0:
-            z = z_new
-            allx.append(z)
-            f = f_new
-            c = c_new
-            constr_violation = jnp.linalg.norm(c, ord=jnp.inf)
-            L = L_new
-            cost = cost_new
-            Lcost = Lcost_new
-            J = lagjac(z, y, mu, *args)
-            njev += 1
+        # if reduction was enough, accept the step. If not, but the Jacobian came
+        # from Broyden updates, recompute it at the current point
+        refresh_jac = num_broyden > 0 and success is None
+        if Lactual_reduction > 0 or refresh_jac:
+            if Lactual_reduction > 0:
+                dz, dL = z_new - z, L_new - L
+                z = z_new
+                allx.append(z)
+                f = f_new
+                c = c_new
+                constr_violation = jnp.linalg.norm(c, ord=jnp.inf)
+                L = L_new
+                cost = cost_new
+                Lcost = Lcost_new
+            if (
+                Lactual_reduction > 0
+                and num_broyden < broyden_updates
+                and Lreduction_ratio >= broyden_threshold
+            ):
+                J = broyden_update(J, dz, dL)
+                num_broyden += 1
+            else:
+                J = lagjac(z, y, mu, *args)
+                njev += 1
+                num_broyden = 0
             g = jnp.dot(J.T, L)
 
             if jac_scale:
@@ -501,6 +559,7 @@ def lsq_auglag(  # noqa: C901
 
             # updating augmented lagrangian params
             if g_norm < gtolk:
+                mu_old = mu
                 y = jnp.where(jnp.abs(c) < ctolk, y - mu * c, y)
                 mu = jnp.where(jnp.abs(c) >= ctolk, tau * mu, mu)
                 if constr_violation < ctolk:
@@ -512,8 +571,13 @@ def lsq_auglag(  # noqa: C901
                 # if we update lagrangian params, need to recompute L and J
                 L = lagfun(f, c, y, mu)
                 Lcost = 0.5 * jnp.dot(L, L)
-                J = lagjac(z, y, mu, *args)
-                njev += 1
+                if num_broyden > 0:
+                    # J only depends on mu through the scaling of the constraint
+                    # rows, so rescale the approximate Jacobian instead
+                    J = J.at[f.size :].multiply(jnp.sqrt(mu / mu_old)[:, None])
+                else:
+                    J = lagjac(z, y, mu, *args)
+                    njev += 1
                 g = jnp.dot(J.T, L)
 
                 if jac_scale:
@@ -533,13 +597,13 @@ def lsq_auglag(  # noqa: C901
             g_h = g * d
             J_h = J * d
 
-            if g_norm < gtol and constr_violation < ctol:
+            if g_norm < gtol and constr_violation < ctol and num_broyden == 0:
                 success, message = True, STATUS_MESSAGES["gtol"]
 
-            if callback(jnp.copy(z2xs(z)[0]), *args):
+            if Lactual_reduction > 0 and callback(jnp.copy(z2xs(z)[0]), *args):
                 success, message = False, STATUS_MESSAGES["callback"]
 
-        else:
+        if Lactual_reduction <= 0:
             step_norm = step_h_norm = actual_reduction = 0
 
         iteration += 1
@@ -555,8 +619,23 @@ def lsq_auglag(  # noqa: C901
                 jnp.mean(mu),
                 jnp.max(jnp.abs(y)),
             )
+        telemetry.record(
+            iteration,
+            z2xs(z)[0],
+            f,
+            nfev=nfev,
+            njev=njev,
+            cost=cost,
+            cost_reduction=actual_reduction,
+            step_norm=step_norm,
+            optimality=g_norm,
+            trust_radius=trust_radius,
+            constr_violation=constr_violation,
+            penalty_param=jnp.mean(mu),
+            max_multiplier=jnp.max(jnp.abs(y)),
+        )
 
-    if g_norm < gtol and constr_violation < ctol:
+    if g_norm < gtol and constr_violation < ctol and num_broyden == 0:
         success, message = True, STATUS_MESSAGES["gtol"]
     if (iteration == maxiter) and success is None:
         success, message = False, STATUS_MESSAGES["maxiter"]
@@ -2,7 +2,7 @@
 
 from scipy.optimize import BFGS, OptimizeResult
 
-from desc.backend import jnp
+from desc.backend import jax, jnp
 from desc.utils import errorif, safediv, setdefault
 
 from .bound_utils import (
@@ -15,13 +15,17 @@ from .bound_utils import (
 from .tr_subproblems import (
     solve_trust_region_2d_subspace,
     solve_trust_region_dogleg,
+    trust_region_step_cg,
     trust_region_step_exact_cho,
     update_tr_radius,
 )
 from .utils import (
     STATUS_MESSAGES,
+    MatrixFreeHessian,
+    Telemetry,
     check_termination,
     compute_hess_scale,
+    compute_hess_scale_matfree,
     print_header_nonlinear,
     print_iteration_nonlinear,
 )
@@ -42,6 +46,7 @@ def fmintr(  # noqa: C901
     maxiter=None,
     callback=None,
     options=None,
+    hvp=None,
 ):
     """Minimize a scalar function using a (quasi)-Newton trust region method.
 
@@ -55,7 +60,8 @@ def fmintr(  # noqa: C901
         function to compute gradient, df/dx. Should take the same arguments as fun
     hess : callable or ``'bfgs'``, optional:
         function to compute Hessian matrix of fun, or ``'bfgs'`` in which case the BFGS
-        method will be used to approximate the Hessian.
+        method will be used to approximate the Hessian. Not used with
+        ``tr_method="cg"``, which uses ``hvp`` instead.
     bounds : tuple of array-like
         Lower and upper bounds on independent variables. Defaults to no bounds.
         Each array must match the size of x0 or be a scalar, in the latter case a
@@ -71,7 +77,9 @@ def fmintr(  # noqa: C901
         be achieved by setting ``x_scale`` such that a step of a given size
         along any of the scaled variables has a similar effect on the cost
         function. If set to ``'hess'``, the scale is iteratively updated using the
-        inverse norms of the columns of the Hessian matrix.
+        inverse norms of the columns of the Hessian matrix. With ``tr_method="cg"``
+        the diagonal of the Hessian is estimated from a few Hessian-vector products,
+        and acts as a diagonal preconditioner for the conjugate gradient iterations.
     ftol : float or None, optional
         Tolerance for termination by the change of the cost function.
         The optimization process is stopped when ``dF < ftol * F``,
@@ -136,12 +144,21 @@ def fmintr(  # noqa: C901
         - ``"tr_decrease_ratio"`` : (0 < float < 1) Factor to decrease the trust region
           radius by when  the ratio of actual to predicted reduction falls below
           threshold. Default 0.25.
-        - ``"tr_method"`` : (``"exact"``, ``"dogleg"``, ``"subspace"``) Method to use
-          for trust region subproblem. ``"exact"`` uses a series of cholesky
-          factorizations (usually 2-3) to find the optimal step. ``"dogleg"``
+        - ``"tr_method"`` : (``"exact"``, ``"dogleg"``, ``"subspace"``, ``"cg"``)
+          Method to use for trust region subproblem. ``"exact"`` uses a series of
+          cholesky factorizations (usually 2-3) to find the optimal step. ``"dogleg"``
           approximates the optimal step using Powell's dogleg method. ``"subspace"``
           solves a reduced subproblem over the space spanned by the gradient and Newton
-          direction. Default ``"exact"``
+          direction. ``"cg"`` approximates the optimal step with truncated conjugate
+          gradients (Newton-CG, Steihaug-Toint), using only Hessian-vector products
+          from ``hvp``, so the Hessian is never formed. Not supported with BFGS.
+          Default ``"exact"``
+        - ``"cg_rtol"`` : (float > 0) Relative tolerance on the residual of the
+          Newton equations for ``tr_method="cg"``. Default is
+          ``min(0.5, sqrt(norm(g)))`` where ``g`` is the scaled gradient.
+        - ``"cg_maxiter"`` : (int > 0) Maximum number of conjugate gradient
+          iterations per trust region subproblem for ``tr_method="cg"``. Defaults to
+          the size of x.
         - ``"hessian_exception_strategy"`` : (``"skip_update"``, ``"damp_update"``)
           If BFGS is used, defines how to proceed when the curvature condition is
           violated. Set it to 'skip_update' to just skip the update. Or, alternatively,
@@ -161,6 +178,12 @@ def fmintr(  # noqa: C901
           By default uses ``"auto"``.
         - ``"scaled_termination"`` : Whether to evaluate termination criteria for
           ``xtol`` and ``gtol`` in scaled / normalized units (default) or base units.
+        - ``"telemetry"`` : (str, path-like or callable) Where to send a machine
+          readable record of each iteration, see ``desc.optimize.lsqtr``.
+    hvp : callable, optional
+        Function to compute Hessian-vector products of fun, with signature
+        ``hvp(v, x, *args)``. Only used with ``tr_method="cg"``. Defaults to forward
+        mode differentiation of ``grad``.
 
     Returns
     -------
@@ -190,11 +213,27 @@ def fmintr(  # noqa: C901
     assert in_bounds(x, lb, ub), "x0 is infeasible"
     x = make_strictly_feasible(x, lb, ub)
 
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), "fmintr")
+    fun, grad = telemetry.wrap("fun", fun), telemetry.wrap("grad", grad)
     f = fun(x, *args)
     nfev += 1
     g = grad(x, *args)
     ngev += 1
 
+    tr_method = options.pop("tr_method", "exact")
+    matrix_free = tr_method == "cg"
+    if matrix_free:
+        errorif(
+            isinstance(hess, (str, BFGS)),
+            ValueError,
+            "tr_method='cg' needs the exact Hessian, it is not supported with BFGS",
+        )
+        hvp = setdefault(
+            hvp,
+            lambda v, x, *args: jax.jvp(lambda y: grad(y, *args), (x,), (v,))[1],
+        )
+        hess = lambda x, *args: MatrixFreeHessian(hvp, x, args)
+
     if isinstance(hess, str) and hess.lower() == "bfgs":
         hess_init_scale = options.pop("hessian_init_scale", "auto")
         hess_exception_strategy = options.pop(
@@ -203,6 +242,7 @@ def fmintr(  # noqa: C901
         hess_min_curvature = options.pop("hessian_minimum_curvature", None)
         hess = BFGS(hess_exception_strategy, hess_min_curvature, hess_init_scale)
     if callable(hess):
+        hess = telemetry.wrap("hess", hess)
         H = hess(x, *args)
         nhev += 1
         bfgs = False
@@ -228,7 +268,9 @@ def fmintr(  # noqa: C901
 
     hess_scale = isinstance(x_scale, str) and x_scale in ["hess", "auto"]
     if hess_scale:
-        scale, scale_inv = compute_hess_scale(H)
+        scale, scale_inv = (
+            compute_hess_scale_matfree(H) if matrix_free else compute_hess_scale(H)
+        )
     else:
         x_scale = jnp.broadcast_to(x_scale, x.shape)
         scale, scale_inv = x_scale, 1 / x_scale
@@ -239,7 +281,7 @@ def fmintr(  # noqa: C901
     diag_h = g * dv * scale
 
     g_h = g * d
-    H_h = d * H * d[:, None]
+    H_h = H.scale(d) if matrix_free else d * H * d[:, None]
     g_norm = jnp.linalg.norm(
         (g * v * scale if scaled_termination else g * v), ord=jnp.inf
     )
@@ -248,7 +290,7 @@ def fmintr(  # noqa: C901
     # scipy : norm of the scaled x, as used in scipy
     # mix : geometric mean of conngould and scipy
     tr_scipy = jnp.linalg.norm(x * scale_inv / v**0.5)
-    conngould = safediv(g_h @ g_h, abs(g_h @ H_h @ g_h))
+    conngould = safediv(g_h @ g_h, abs(g_h @ H_h.dot(g_h)))
     init_tr = {
         "scipy": tr_scipy,
         "conngould": conngould,
@@ -266,7 +308,8 @@ def fmintr(  # noqa: C901
     tr_decrease_threshold = options.pop("tr_decrease_threshold", 0.25)
     tr_increase_ratio = options.pop("tr_increase_ratio", 2)
     tr_decrease_ratio = options.pop("tr_decrease_ratio", 0.25)
-    tr_method = options.pop("tr_method", "exact")
+    cg_rtol = options.pop("cg_rtol", None)
+    cg_maxiter = options.pop("cg_maxiter", None)
 
     errorif(
         len(options) > 0,
@@ -280,13 +323,14 @@ def fmintr(  # noqa: C901
         "dogleg": solve_trust_region_dogleg,
         "subspace": solve_trust_region_2d_subspace,
         "exact": trust_region_step_exact_cho,
+        "cg": trust_region_step_cg,
     }
     errorif(
         tr_method not in methods,
         ValueError,
         f"tr_method should be one of {methods.keys()}, got {tr_method}",
     )
-    subproblem = methods[tr_method]
+    subproblem = telemetry.wrap("subproblem", methods[tr_method])
 
     x_norm = jnp.linalg.norm(((x * scale_inv) if scaled_termination else x), ord=2)
     success = None
@@ -301,6 +345,17 @@ def fmintr(  # noqa: C901
             iteration, nfev, f, actual_reduction, step_norm, g_norm
         )
 
+    telemetry.record(
+        iteration,
+        x,
+        nfev=nfev,
+        ngev=ngev,
+        nhev=nhev,
+        cost=f,
+        optimality=g_norm,
+        trust_radius=trust_radius,
+    )
+
     allx = [x]
     alltr = [trust_radius]
 
@@ -311,7 +366,8 @@ def fmintr(  # noqa: C901
 
     while iteration < maxiter and success is None:
 
-        H_a = H_h + jnp.diag(diag_h) if bounded else H_h
+        if not matrix_free:  # the cg subproblem adds diag_h itself
+            H_a = H_h + jnp.diag(diag_h) if bounded else H_h
 
         actual_reduction = -1
 
@@ -323,7 +379,12 @@ def fmintr(  # noqa: C901
             # This gives us the proposed step relative to the current position
             # and it tells us whether the proposed step
             # has reached the trust region boundary or not.
-            step_h, hits_boundary, alpha = subproblem(g_h, H_a, trust_radius, alpha)
+            if matrix_free:
+                step_h, hits_boundary, alpha = subproblem(
+                    g_h, H_h, diag_h, trust_radius, alpha, cg_rtol, cg_maxiter, "hess"
+                )
+            else:
+                step_h, hits_boundary, alpha = subproblem(g_h, H_a, trust_radius, alpha)
 
             step = d * step_h  # Trust-region solution in the original space.
 
@@ -405,7 +466,11 @@ def fmintr(  # noqa: C901
                 nhev += 1
 
             if hess_scale:
-                scale, scale_inv = compute_hess_scale(H)
+                scale, scale_inv = (
+                    compute_hess_scale_matfree(H)
+                    if matrix_free
+                    else compute_hess_scale(H)
+                )
 
             v, dv = cl_scaling_vector(x, g, lb, ub)
             v = jnp.where(dv != 0, v * scale_inv, v)
@@ -413,7 +478,7 @@ def fmintr(  # noqa: C901
             diag_h = g * dv * scale
 
             g_h = g * d
-            H_h = d * H * d[:, None]
+            H_h = H.scale(d) if matrix_free else d * H * d[:, None]
 
             x_norm = jnp.linalg.norm(
                 ((x * scale_inv) if scaled_termination else x), ord=2
@@ -437,6 +502,18 @@ def fmintr(  # noqa: C901
             print_iteration_nonlinear(
                 iteration, nfev, f, actual_reduction, step_norm, g_norm
             )
+        telemetry.record(
+            iteration,
+            x,
+            nfev=nfev,
+            ngev=ngev,
+            nhev=nhev,
+            cost=f,
+            cost_reduction=actual_reduction,
+            step_norm=step_norm,
+            optimality=g_norm,
+            trust_radius=trust_radius,
+        )
 
     if g_norm < gtol:
         success, message = True, STATUS_MESSAGES["gtol"]
@@ -449,7 +526,7 @@ def fmintr(  # noqa: C901
         fun=f,
         grad=g,
         v=v,
-        hess=H,
+        hess=None if matrix_free else H,
         optimality=g_norm,
         nfev=nfev,
         ngev=ngev,
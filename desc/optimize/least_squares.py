@@ -1,8 +1,10 @@
 """Function for solving nonlinear least squares problems."""
 
+import functools
+
 from scipy.optimize import OptimizeResult
 
-from desc.backend import jnp, qr
+from desc.backend import jax, jnp, qr
 from desc.utils import errorif, safediv, setdefault
 
 from .bound_utils import (
@@ -13,6 +15,7 @@ from .bound_utils import (
     select_step,
 )
 from .tr_subproblems import (
+    trust_region_step_cg,
     trust_region_step_exact_cho,
     trust_region_step_exact_qr,
     trust_region_step_exact_svd,
@@ -20,8 +23,12 @@ from .tr_subproblems import (
 )
 from .utils import (
     STATUS_MESSAGES,
+    MatrixFreeJacobian,
+    Telemetry,
+    broyden_update,
     check_termination,
     compute_jac_scale,
+    compute_jac_scale_matfree,
     print_header_nonlinear,
     print_iteration_nonlinear,
     solve_triangular_regularized,
@@ -42,6 +49,8 @@ def lsqtr(  # noqa: C901
     maxiter=None,
     callback=None,
     options=None,
+    jvp=None,
+    vjp=None,
 ):
     """Solve a least squares problem using a (quasi)-Newton trust region method.
 
@@ -68,7 +77,10 @@ def lsqtr(  # noqa: C901
         be achieved by setting ``x_scale`` such that a step of a given size
         along any of the scaled variables has a similar effect on the cost
         function. If set to ``'jac'``, the scale is iteratively updated using the
-        inverse norms of the columns of the Jacobian matrix.
+        inverse norms of the columns of the Jacobian matrix. With
+        ``tr_method="cg"`` the column norms are estimated from a few vector-Jacobian
+        products, and act as a diagonal preconditioner for the conjugate gradient
+        iterations.
     ftol : float or None, optional
         Tolerance for termination by the change of the cost function.
         The optimization process is stopped when ``dF < ftol * F``,
@@ -138,9 +150,51 @@ def lsqtr(  # noqa: C901
           Cholesky factorizations (generally 2-3), while ``"svd"`` uses one singular
           value decomposition. ``"cho"`` is generally the fastest for large systems,
           especially on GPU, but may be less accurate for badly scaled systems.
-          ``"svd"`` is the most accurate but significantly slower. Default ``"qr"``.
+          ``"svd"`` is the most accurate but significantly slower. ``"cg"`` uses
+          truncated conjugate gradients (Steihaug-Toint) on the normal equations, and
+          only needs ``jvp`` and ``vjp``, so the Jacobian is never formed. This
+          makes each iteration much less accurate, but allows solving problems whose
+          Jacobian doesn't fit in memory. Default ``"qr"``.
+        - ``"cg_rtol"`` : (float > 0) Relative tolerance on the residual of the
+          normal equations for ``tr_method="cg"``. Default is
+          ``min(0.5, sqrt(norm(g)))`` where ``g`` is the scaled gradient.
+        - ``"cg_maxiter"`` : (int > 0) Maximum number of conjugate gradient
+          iterations per trust region subproblem for ``tr_method="cg"``. Defaults to
+          the size of x.
+        - ``"cg_precond"`` : (callable) Function with signature
+          ``cg_precond(x, *args)`` that returns a preconditioner for the conjugate
+          gradient iterations of ``tr_method="cg"``, such as a
+          ``desc.optimize.utils.CoarseGridPreconditioner``. It is an approximate
+          inverse of ``J.T @ J`` that is computed once and reused for many iterations,
+          see ``"cg_precond_every"``. Default None, which only scales the variables.
+        - ``"cg_precond_every"`` : (int >= 0) Number of accepted steps after which
+          ``cg_precond`` is called again at the current point. Default 0, which
+          keeps the first preconditioner for the whole solve.
+        - ``"broyden_updates"`` : (int >= 0) Maximum number of consecutive accepted
+          steps after which the Jacobian is updated with Broyden's rank one secant
+          formula instead of being recomputed. A fresh Jacobian is computed when this
+          many updates have been made, or when the ratio of actual to predicted
+          reduction falls below ``"broyden_threshold"``. Not supported with
+          ``tr_method="cg"``. Default 0, which always recomputes the Jacobian.
+        - ``"broyden_threshold"`` : (0 < float < 1) Ratio of actual to predicted
+          reduction below which a Jacobian from Broyden updates is discarded and
+          recomputed. Default 0.5.
         - ``"scaled_termination"`` : Whether to evaluate termination criteria for
           ``xtol`` and ``gtol`` in scaled / normalized units (default) or base units.
+        - ``"telemetry"`` : (str, path-like or callable) Where to send a machine
+          readable record of each iteration, with the cost, step norm, trust radius,
+          time spent evaluating ``fun`` and ``jac``, factorizing the Jacobian and
+          solving the subproblem, and peak memory. A str or path is a file that each
+          record is appended to as a line of JSON, a callable is called with each
+          record as a dict. See ``desc.optimize.utils.Telemetry``.
+    jvp : callable, optional
+        Function to compute Jacobian-vector products of fun, with signature
+        ``jvp(v, x, *args)``, where ``v`` has shape (n,) or (k, n). Only used with
+        ``tr_method="cg"``. Defaults to forward mode differentiation of fun.
+    vjp : callable, optional
+        Function to compute vector-Jacobian products of fun, with signature
+        ``vjp(u, x, *args)``. Only used with ``tr_method="cg"``. Defaults to reverse
+        mode differentiation of fun.
 
     Returns
     -------
@@ -175,12 +229,39 @@ def lsqtr(  # noqa: C901
     assert in_bounds(x, lb, ub), "x0 is infeasible"
     x = make_strictly_feasible(x, lb, ub)
 
+    tr_method = options.pop("tr_method", "qr")
+    errorif(
+        tr_method not in ["cho", "svd", "qr", "cg"],
+        ValueError,
+        "tr_method should be one of 'cho', 'svd', 'qr', 'cg', got {}".format(tr_method),
+    )
+    matrix_free = tr_method == "cg"
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), "lsqtr")
+    if matrix_free:
+        jvp = setdefault(
+            jvp,
+            lambda v, x, *args: jax.vmap(
+                lambda vi: jax.jvp(lambda y: fun(y, *args), (x,), (vi,))[1]
+            )(jnp.atleast_2d(v)).reshape(v.shape[:-1] + (-1,)),
+        )
+        vjp = setdefault(
+            vjp, lambda u, x, *args: jax.vjp(lambda y: fun(y, *args), x)[1](u)[0]
+        )
+
+    fun, jac = telemetry.wrap("fun", fun), telemetry.wrap("jac", jac)
+    factorize = functools.partial(telemetry.wrap, "factorize")
+    subproblem = functools.partial(telemetry.wrap, "subproblem")
+
     f = fun(x, *args)
     nfev += 1
     cost = 0.5 * jnp.dot(f, f)
-    J = jac(x, *args).block_until_ready()  # FIXME: block is needed for jaxify util
+    if matrix_free:
+        J = MatrixFreeJacobian(jvp, vjp, x, args, (f.size, x.size))
+        g = J.rdot(f)
+    else:
+        J = jac(x, *args).block_until_ready()  # FIXME: block is needed for jaxify util
+        g = jnp.dot(J.T, f)
     njev += 1
-    g = jnp.dot(J.T, f)
 
     maxiter = setdefault(maxiter, n * 100)
     max_nfev = options.pop("max_nfev", 5 * maxiter + 1)
@@ -189,7 +270,9 @@ def lsqtr(  # noqa: C901
 
     jac_scale = isinstance(x_scale, str) and x_scale in ["jac", "auto"]
     if jac_scale:
-        scale, scale_inv = compute_jac_scale(J)
+        scale, scale_inv = (
+            compute_jac_scale_matfree(J) if matrix_free else compute_jac_scale(J)
+        )
     else:
         x_scale = jnp.broadcast_to(x_scale, x.shape)
         scale, scale_inv = x_scale, 1 / x_scale
@@ -200,7 +283,7 @@ def lsqtr(  # noqa: C901
     diag_h = g * dv * scale
 
     g_h = g * d
-    J_h = J * d
+    J_h = J.scale(d) if matrix_free else J * d
     g_norm = jnp.linalg.norm(
         (g * v * scale if scaled_termination else g * v), ord=jnp.inf
     )
@@ -209,7 +292,7 @@ def lsqtr(  # noqa: C901
     # scipy : norm of the scaled x, as used in scipy
     # mix : geometric mean of conngould and scipy
     tr_scipy = jnp.linalg.norm(x * scale_inv / v**0.5)
-    conngould = safediv(jnp.sum(g_h**2), jnp.sum((J_h @ g_h) ** 2))
+    conngould = safediv(jnp.sum(g_h**2), jnp.sum(J_h.dot(g_h) ** 2))
     init_tr = {
         "scipy": tr_scipy,
         "conngould": conngould,
@@ -227,7 +310,12 @@ def lsqtr(  # noqa: C901
     tr_decrease_threshold = options.pop("tr_decrease_threshold", 0.25)
     tr_increase_ratio = options.pop("tr_increase_ratio", 2)
     tr_decrease_ratio = options.pop("tr_decrease_ratio", 0.25)
-    tr_method = options.pop("tr_method", "qr")
+    cg_rtol = options.pop("cg_rtol", None)
+    cg_maxiter = options.pop("cg_maxiter", None)
+    cg_precond = options.pop("cg_precond", None)
+    cg_precond_every = options.pop("cg_precond_every", 0)
+    broyden_updates = options.pop("broyden_updates", 0)
+    broyden_threshold = options.pop("broyden_threshold", 0.5)
 
     errorif(
         len(options) > 0,
@@ -235,10 +323,17 @@ def lsqtr(  # noqa: C901
         "Unknown options: {}".format([key for key in options]),
     )
     errorif(
-        tr_method not in ["cho", "svd", "qr"],
+        matrix_free and broyden_updates > 0,
+        ValueError,
+        "broyden_updates is not supported with tr_method='cg'",
+    )
+    errorif(
+        cg_precond is not None and not matrix_free,
         ValueError,
-        "tr_method should be one of 'cho', 'svd', 'qr', got {}".format(tr_method),
+        "cg_precond is only used with tr_method='cg'",
     )
+    precond = None if cg_precond is None else factorize(cg_precond)(x, *args)
+    num_precond = 0  # number of accepted steps since the last preconditioner
 
     callback = setdefault(callback, lambda *args: False)
 
@@ -255,31 +350,44 @@ def lsqtr(  # noqa: C901
             iteration, nfev, cost, actual_reduction, step_norm, g_norm
         )
 
+    telemetry.record(
+        iteration,
+        x,
+        f,
+        nfev=nfev,
+        njev=njev,
+        cost=cost,
+        optimality=g_norm,
+        trust_radius=trust_radius,
+    )
+
     allx = [x]
     alltr = [trust_radius]
     if g_norm < gtol:
         success, message = True, STATUS_MESSAGES["gtol"]
 
     alpha = None  # "Levenberg-Marquardt" parameter
+    num_broyden = 0  # number of Broyden updates since the last fresh Jacobian
 
     while iteration < maxiter and success is None:
 
-        # we don't want to factorize the extra stuff if we don't need to
-        J_a = jnp.vstack([J_h, jnp.diag(diag_h**0.5)]) if bounded else J_h
-        f_a = jnp.concatenate([f, jnp.zeros(diag_h.size)]) if bounded else f
+        if not matrix_free:
+            # we don't want to factorize the extra stuff if we don't need to
+            J_a = jnp.vstack([J_h, jnp.diag(diag_h**0.5)]) if bounded else J_h
+            f_a = jnp.concatenate([f, jnp.zeros(diag_h.size)]) if bounded else f
 
         if tr_method == "svd":
-            U, s, Vt = jnp.linalg.svd(J_a, full_matrices=False)
+            U, s, Vt = factorize(jnp.linalg.svd)(J_a, full_matrices=False)
         elif tr_method == "cho":
-            B_h = jnp.dot(J_a.T, J_a)
+            B_h = factorize(jnp.dot)(J_a.T, J_a)
         elif tr_method == "qr":
             # try full newton step
             tall = J_a.shape[0] >= J_a.shape[1]
             if tall:
-                Q, R = qr(J_a, mode="economic")
+                Q, R = factorize(qr)(J_a, mode="economic")
                 p_newton = solve_triangular_regularized(R, -Q.T @ f_a)
             else:
-                Q, R = qr(J_a.T, mode="economic")
+                Q, R = factorize(qr)(J_a.T, mode="economic")
                 p_newton = Q @ solve_triangular_regularized(R.T, -f_a, lower=True)
 
         actual_reduction = -1
@@ -293,17 +401,28 @@ def lsqtr(  # noqa: C901
             # and it tells us whether the proposed step
             # has reached the trust region boundary or not.
             if tr_method == "svd":
-                step_h, hits_boundary, alpha = trust_region_step_exact_svd(
+                step_h, hits_boundary, alpha = subproblem(trust_region_step_exact_svd)(
                     f_a, U, s, Vt.T, trust_radius, alpha
                 )
             elif tr_method == "cho":
-                step_h, hits_boundary, alpha = trust_region_step_exact_cho(
+                step_h, hits_boundary, alpha = subproblem(trust_region_step_exact_cho)(
                     g_h, B_h, trust_radius, alpha
                 )
             elif tr_method == "qr":
-                step_h, hits_boundary, alpha = trust_region_step_exact_qr(
+                step_h, hits_boundary, alpha = subproblem(trust_region_step_exact_qr)(
                     p_newton, f_a, J_a, trust_radius, alpha
                 )
+            elif tr_method == "cg":
+                step_h, hits_boundary, alpha = subproblem(trust_region_step_cg)(
+                    g_h,
+                    J_h,
+                    diag_h,
+                    trust_radius,
+                    alpha,
+                    cg_rtol,
+                    cg_maxiter,
+                    precond=None if precond is None else precond.scale(d),
+                )
             step = d * step_h  # Trust-region solution in the original space.
 
             step, step_h, predicted_reduction = select_step(
@@ -357,7 +476,8 @@ def lsqtr(  # noqa: C901
                 reduction_ratio,
                 ftol,
                 xtol,
-                gtol,
+                # the gradient is only approximate after Broyden updates
+                gtol if num_broyden == 0 else 0,
                 iteration,
                 maxiter,
                 nfev,
@@ -368,19 +488,47 @@ def lsqtr(  # noqa: C901
             )
             if success is not None:
                 break
+            if num_broyden > 0 and reduction_ratio < broyden_threshold:
+                # the model may be bad because of the approximate Jacobian,
+                # so recompute it rather than shrinking the trust region further
+                break
 
-        # if reduction was enough, accept the step
-        if actual_reduction > 0:
-            x = x_new
-            allx.append(x)
-            f = f_new
-            cost = cost_new
-            J = jac(x, *args)
-            njev += 1
-            g = jnp.dot(J.T, f)
+        # if reduction was enough, accept the step. If not, but the Jacobian came
+        # from Broyden updates, recompute it at the current point
+        refresh_jac = num_broyden > 0 and success is None
+        if actual_reduction > 0 or refresh_jac:
+            if actual_reduction > 0:
+                dx, df = x_new - x, f_new - f
+                x = x_new
+                allx.append(x)
+                f = f_new
+                cost = cost_new
+            if (
+                actual_reduction > 0
+                and num_broyden < broyden_updates
+                and reduction_ratio >= broyden_threshold
+            ):
+                J = broyden_update(J, dx, df)
+                num_broyden += 1
+            elif matrix_free:
+                J = MatrixFreeJacobian(jvp, vjp, x, args, (f.size, x.size))
+                njev += 1
+                num_precond += 1
+                if precond is not None and num_precond == cg_precond_every:
+                    precond = factorize(cg_precond)(x, *args)
+                    num_precond = 0
+            else:
+                J = jac(x, *args)
+                njev += 1
+                num_broyden = 0
+            g = J.rdot(f) if matrix_free else jnp.dot(J.T, f)
 
             if jac_scale:
-                scale, scale_inv = compute_jac_scale(J, scale_inv)
+                scale, scale_inv = (
+                    compute_jac_scale_matfree(J, scale_inv)
+                    if matrix_free
+                    else compute_jac_scale(J, scale_inv)
+                )
 
             v, dv = cl_scaling_vector(x, g, lb, ub)
             v = jnp.where(dv != 0, v * scale_inv, v)
@@ -388,7 +536,7 @@ def lsqtr(  # noqa: C901
             diag_h = g * dv * scale
 
             g_h = g * d
-            J_h = J * d
+            J_h = J.scale(d) if matrix_free else J * d
             x_norm = jnp.linalg.norm(
                 ((x * scale_inv) if scaled_termination else x), ord=2
             )
@@ -396,13 +544,13 @@ def lsqtr(  # noqa: C901
                 (g * v * scale if scaled_termination else g * v), ord=jnp.inf
             )
 
-            if g_norm < gtol:
+            if g_norm < gtol and num_broyden == 0:
                 success, message = True, STATUS_MESSAGES["gtol"] + f" ({gtol=:.2e})"
 
-            if callback(jnp.copy(x), *args):
+            if actual_reduction > 0 and callback(jnp.copy(x), *args):
                 success, message = False, STATUS_MESSAGES["callback"]
 
-        else:
+        if actual_reduction <= 0:
             step_norm = step_h_norm = actual_reduction = 0
 
         iteration += 1
@@ -410,8 +558,20 @@ def lsqtr(  # noqa: C901
             print_iteration_nonlinear(
                 iteration, nfev, cost, actual_reduction, step_norm, g_norm
             )
+        telemetry.record(
+            iteration,
+            x,
+            f,
+            nfev=nfev,
+            njev=njev,
+            cost=cost,
+            cost_reduction=actual_reduction,
+            step_norm=step_norm,
+            optimality=g_norm,
+            trust_radius=trust_radius,
+        )
 
-    if g_norm < gtol:
+    if g_norm < gtol and num_broyden == 0:
         success, message = True, STATUS_MESSAGES["gtol"] + f" ({gtol=:.2e})"
     if (iteration == maxiter) and success is None:
         success, message = False, STATUS_MESSAGES["maxiter"]
@@ -423,7 +583,7 @@ def lsqtr(  # noqa: C901
         fun=f,
         grad=g,
         v=v,
-        jac=J,
+        jac=None if matrix_free else J,
         optimality=g_norm,
         nfev=nfev,
         njev=njev,
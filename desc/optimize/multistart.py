@@ -0,0 +1,382 @@
+"""Function for solving a least squares problem from many initial guesses at once."""
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from desc.backend import cond, jax, jit, jnp, qr, while_loop
+from desc.utils import errorif, setdefault
+
+from .tr_subproblems import (
+    trust_region_step_exact_cho,
+    trust_region_step_exact_qr,
+    trust_region_step_exact_svd,
+)
+from .utils import (
+    STATUS_MESSAGES,
+    compute_jac_scale,
+    evaluate_quadratic_form_jac,
+    solve_triangular_regularized,
+)
+
+# status of each member of the batch, 0 means still running
+_STATUS_KEYS = [None, "ftol", "xtol", "gtol", "maxiter", "max_nfev", "approx"]
+
+
+def _status_message(status):
+    key = _STATUS_KEYS[int(status)]
+    if key in ["ftol", "xtol", "gtol"]:
+        return STATUS_MESSAGES["success"] + "\n" + STATUS_MESSAGES[key]
+    return STATUS_MESSAGES[key]
+
+
+def lsqtr_multistart(  # noqa: C901
+    fun,
+    x0,
+    jac,
+    args=(),
+    x_scale="jac",
+    ftol=1e-6,
+    xtol=1e-6,
+    gtol=1e-6,
+    verbose=1,
+    maxiter=None,
+    options=None,
+):
+    """Solve a least squares problem from a batch of initial guesses simultaneously.
+
+    Runs the trust region method of ``lsqtr`` from each row of ``x0``. The objective,
+    Jacobian and trust region subproblem are vectorized over the rows with
+    ``jax.vmap``, and the iterations of all rows are advanced together in a single
+    compiled ``while_loop``, so the problem is only traced and compiled once no matter
+    how many initial guesses there are. Each row is frozen once its own termination
+    criteria are met, and the loop ends when every row has terminated.
+
+    Each iteration tries one step for every running row. The Jacobian is only
+    recomputed when at least one row accepted its step, but then it is computed for
+    all rows, so it is most efficient when the rows take similar numbers of steps.
+    Bounds and callbacks are not supported.
+
+    Parameters
+    ----------
+    fun : callable
+        objective to be minimized. Should have a signature like fun(x,*args)-> 1d array
+        and be JAX transformable.
+    x0 : array-like, shape(k, n)
+        initial guesses, one per row.
+    jac : callable:
+        function to compute Jacobian matrix of fun. Should be JAX transformable.
+    args : tuple
+        additional arguments passed to fun and jac, shared by all rows.
+    x_scale : array_like or ``'jac'``, optional
+        Characteristic scale of each variable. If set to ``'jac'``, the scale of each
+        row is iteratively updated using the inverse norms of the columns of its
+        Jacobian matrix. See ``lsqtr`` for details.
+    ftol : float or None, optional
+        Tolerance for termination by the change of the cost function.
+        A row is stopped when ``dF < ftol * F``, and there was an adequate agreement
+        between a local quadratic model and the true model in the last step.
+        If None, the termination by this condition is disabled.
+    xtol : float or None, optional
+        Tolerance for termination by the change of the independent variables.
+        A row is stopped when ``norm(dx) < xtol * (xtol + norm(x))``.
+        If None, the termination by this condition is disabled.
+    gtol : float or None, optional
+        Absolute tolerance for termination by the norm of the gradient.
+        A row is stopped when ``max(abs(g)) < gtol``.
+        If None, the termination by this condition is disabled.
+    verbose : {0, 1, 2}, optional
+        * 0 : work silently.
+        * 1 (default) : display a termination report for the best row.
+        * 2 : also display the final cost and status of every row.
+    maxiter : int, optional
+        maximum number of accepted steps of each row. Defaults to size(x)*100
+    options : dict, optional
+        dictionary of optional keyword arguments to override default solver settings.
+
+        - ``"max_nfev"`` : (int > 0) Maximum number of function evaluations of each
+          row. Default is ``5*maxiter+1``
+        - ``"initial_trust_radius"`` : (float > 0) Initial trust region radius.
+          Default is the scaled norm of x0, as in ``lsqtr``.
+        - ``"initial_trust_ratio"`` : (float > 0) A extra scaling factor that is
+          applied to the initial trust radius. Default 1.
+        - ``"max_trust_radius"`` : (float > 0) Maximum allowable trust region radius.
+          Default ``np.inf``.
+        - ``"min_trust_radius"`` : (float >= 0) Minimum allowable trust region radius.
+          A row is terminated if its trust region falls below this value.
+          Default ``np.finfo(x0.dtype).eps``.
+        - ``"tr_increase_threshold"``, ``"tr_decrease_threshold"``,
+          ``"tr_increase_ratio"``, ``"tr_decrease_ratio"`` : Trust region update
+          parameters, see ``lsqtr``.
+        - ``"tr_method"`` : (``"qr"``, ``"svd"``, ``"cho"``) Method to use for solving
+          the trust region subproblem, see ``lsqtr``. Default ``"qr"``.
+
+    Returns
+    -------
+    res : OptimizeResult
+        The optimization result of the row with the lowest final cost, with the same
+        attributes as the result of ``lsqtr``. Additionally has attributes ``best``,
+        the index of that row, and ``x_all``, ``cost_all``, ``success_all``,
+        ``status_all``, ``nfev_all`` and ``nit_all`` with the results of every row.
+        ``status_all`` is an integer array where 1, 2 and 3 mean the row converged by
+        ``ftol``, ``xtol`` or ``gtol``, 4 and 5 mean it reached ``maxiter`` or
+        ``max_nfev``, and 6 means its trust region became too small.
+
+    """
+    options = {} if options is None else options.copy()
+    errorif(
+        isinstance(x_scale, str) and x_scale not in ["jac", "auto"],
+        ValueError,
+        "x_scale should be one of 'jac', 'auto' or array-like, got {}".format(x_scale),
+    )
+    x0 = jnp.atleast_2d(jnp.asarray(x0))
+    errorif(x0.ndim != 2, ValueError, "x0 should have shape (k, n).")
+    k, n = x0.shape
+
+    maxiter = setdefault(maxiter, n * 100)
+    max_nfev = options.pop("max_nfev", 5 * maxiter + 1)
+    init_tr = options.pop("initial_trust_radius", None)
+    tr_ratio = options.pop("initial_trust_ratio", 1.0)
+    max_trust_radius = options.pop("max_trust_radius", jnp.inf)
+    min_trust_radius = options.pop("min_trust_radius", jnp.finfo(x0.dtype).eps)
+    tr_increase_threshold = options.pop("tr_increase_threshold", 0.75)
+    tr_decrease_threshold = options.pop("tr_decrease_threshold", 0.25)
+    tr_increase_ratio = options.pop("tr_increase_ratio", 2)
+    tr_decrease_ratio = options.pop("tr_decrease_ratio", 0.25)
+    tr_method = options.pop("tr_method", "qr")
+    errorif(
+        tr_method not in ["cho", "svd", "qr"],
+        ValueError,
+        "tr_method should be one of 'cho', 'svd', 'qr', got {}".format(tr_method),
+    )
+    errorif(
+        len(options) > 0,
+        ValueError,
+        "Unknown options: {}".format([key for key in options]),
+    )
+    ftol = setdefault(ftol, 0)
+    xtol = setdefault(xtol, 0)
+    gtol = setdefault(gtol, 0)
+
+    jac_scale = isinstance(x_scale, str)
+    if not jac_scale:
+        x_scale = jnp.broadcast_to(x_scale, (n,))
+
+    in_axes = (0,) + (None,) * len(args)
+    vfun = jax.vmap(fun, in_axes=in_axes)
+    vjac = jax.vmap(jac, in_axes=in_axes)
+
+    def get_scale(J, prev_scale_inv=None):
+        if jac_scale:
+            return compute_jac_scale(J, prev_scale_inv)
+        return x_scale, 1 / x_scale
+
+    def update_tr_radius(trust_radius, actual_reduction, predicted_reduction, norm):
+        """Vectorized version of tr_subproblems.update_tr_radius."""
+        ratio = jnp.where(
+            predicted_reduction > 0,
+            actual_reduction
+            / jnp.where(predicted_reduction > 0, predicted_reduction, 1),
+            jnp.where((predicted_reduction == 0) & (actual_reduction == 0), 1.0, 0.0),
+        )
+        trust_radius = jnp.where(
+            (ratio < tr_decrease_threshold) | jnp.isnan(ratio),
+            tr_decrease_ratio * norm,
+            jnp.where(
+                ratio > tr_increase_threshold,
+                jnp.maximum(norm * tr_increase_ratio, trust_radius),
+                trust_radius,
+            ),
+        )
+        return jnp.clip(trust_radius, 0, max_trust_radius), ratio
+
+    @jit
+    def run(x0, *args):
+        def trial_step(x, f, J, g, cost, scale, trust_radius, alpha):
+            """Solve the subproblem and evaluate the new point for a single row."""
+            J_h = J * scale
+            g_h = g * scale
+            if tr_method == "svd":
+                U, s, Vt = jnp.linalg.svd(J_h, full_matrices=False)
+                step_h, hits_boundary, alpha = trust_region_step_exact_svd(
+                    f, U, s, Vt.T, trust_radius, alpha
+                )
+            elif tr_method == "cho":
+                B_h = jnp.dot(J_h.T, J_h)
+                step_h, hits_boundary, alpha = trust_region_step_exact_cho(
+                    g_h, B_h, trust_radius, alpha
+                )
+            else:
+                if J_h.shape[0] >= J_h.shape[1]:
+                    Q, R = qr(J_h, mode="economic")
+                    p_newton = solve_triangular_regularized(R, -Q.T @ f)
+                else:
+                    Q, R = qr(J_h.T, mode="economic")
+                    p_newton = Q @ solve_triangular_regularized(R.T, -f, lower=True)
+                step_h, hits_boundary, alpha = trust_region_step_exact_qr(
+                    p_newton, f, J_h, trust_radius, alpha
+                )
+            predicted_reduction = -evaluate_quadratic_form_jac(J_h, g_h, step_h)
+            x_new = x + scale * step_h
+            f_new = fun(x_new, *args)
+            cost_new = 0.5 * jnp.dot(f_new, f_new)
+            return x_new, f_new, cost_new, step_h, predicted_reduction
+
+        def body(state):
+            x, f, J, g, cost, scale, scale_inv, trust_radius, alpha = state[:9]
+            nfev, njev, nit, status = state[9:]
+            running = status == 0
+
+            x_new, f_new, cost_new, step_h, predicted_reduction = jax.vmap(trial_step)(
+                x, f, J, g, cost, scale, trust_radius, alpha
+            )
+            nfev = nfev + running
+            actual_reduction = cost - cost_new
+            step_h_norm = jnp.linalg.norm(step_h, axis=-1)
+            tr_new, ratio = update_tr_radius(
+                trust_radius, actual_reduction, predicted_reduction, step_h_norm
+            )
+            alpha = jnp.where(running, alpha * trust_radius / tr_new, alpha)
+            trust_radius = jnp.where(running, tr_new, trust_radius)
+
+            x_norm = jnp.linalg.norm(x * scale_inv, axis=-1)
+            ftol_satisfied = (
+                (0 < actual_reduction)
+                & (actual_reduction < jnp.abs(ftol * cost))
+                & (ratio > 0.25)
+            )
+            xtol_satisfied = (step_h_norm < xtol * (xtol + x_norm)) & (ratio > 0.25)
+
+            accept = running & (actual_reduction > 0)
+            x = jnp.where(accept[:, None], x_new, x)
+            f = jnp.where(accept[:, None], f_new, f)
+            cost = jnp.where(accept, cost_new, cost)
+            nit = nit + accept
+            # only compute the Jacobian if some row moved
+            J = cond(
+                jnp.any(accept),
+                lambda J: jnp.where(accept[:, None, None], vjac(x, *args), J),
+                lambda J: J,
+                J,
+            )
+            njev = njev + accept
+            g = jnp.where(accept[:, None], jnp.einsum("kmn,km->kn", J, f), g)
+            new_scale, new_scale_inv = jax.vmap(get_scale)(J, scale_inv)
+            scale = jnp.where(accept[:, None], new_scale, scale)
+            scale_inv = jnp.where(accept[:, None], new_scale_inv, scale_inv)
+            g_norm = jnp.max(jnp.abs(g * scale), axis=-1)
+
+            new_status = jnp.select(
+                [
+                    ftol_satisfied,
+                    xtol_satisfied,
+                    g_norm < gtol,
+                    nit >= maxiter,
+                    nfev >= max_nfev,
+                    ~accept & (step_h_norm < min_trust_radius),
+                ],
+                list(range(1, 7)),
+                0,
+            )
+            status = jnp.where(running, new_status, status)
+            return (
+                x,
+                f,
+                J,
+                g,
+                cost,
+                scale,
+                scale_inv,
+                trust_radius,
+                alpha,
+                nfev,
+                njev,
+                nit,
+                status,
+            )
+
+        f = vfun(x0, *args)
+        J = vjac(x0, *args)
+        g = jnp.einsum("kmn,km->kn", J, f)
+        cost = 0.5 * jnp.sum(f**2, axis=-1)
+        scale, scale_inv = jax.vmap(get_scale)(J)
+        if init_tr is None:
+            trust_radius = jnp.linalg.norm(x0 * scale_inv, axis=-1)
+            trust_radius = jnp.where(trust_radius > 0, trust_radius, 1.0)
+        else:
+            trust_radius = jnp.full(k, init_tr, dtype=x0.dtype)
+        trust_radius *= tr_ratio
+        g_norm = jnp.max(jnp.abs(g * scale), axis=-1)
+        status = jnp.where(g_norm < gtol, 3, 0)
+        ones = jnp.ones(k, dtype=int)
+        state = (
+            x0,
+            f,
+            J,
+            g,
+            cost,
+            scale,
+            scale_inv,
+            trust_radius,
+            jnp.zeros(k, dtype=x0.dtype),
+            ones,
+            ones,
+            0 * ones,
+            status,
+        )
+        return while_loop(lambda state: jnp.any(state[12] == 0), body, state)
+
+    x, f, J, g, cost, scale, _, _, _, nfev, njev, nit, status = run(x0, *args)
+    status = np.asarray(status)
+    best = int(jnp.argmin(jnp.where(jnp.isnan(cost), jnp.inf, cost)))
+    success_all = (status >= 1) & (status <= 3)
+    result = OptimizeResult(
+        x=x[best],
+        success=bool(success_all[best]),
+        cost=cost[best],
+        fun=f[best],
+        grad=g[best],
+        jac=J[best],
+        optimality=jnp.max(jnp.abs(g[best] * scale[best])),
+        nfev=int(nfev[best]),
+        njev=int(njev[best]),
+        nit=int(nit[best]),
+        status=int(status[best]),
+        message=_status_message(status[best]),
+        allx=[x0[best], x[best]],
+        best=best,
+        x_all=x,
+        cost_all=cost,
+        success_all=success_all,
+        status_all=status,
+        nfev_all=nfev,
+        nit_all=nit,
+    )
+    if verbose > 1:
+        print("Row   Cost          Nfev   Nit    Status")
+        for i in range(k):
+            print(
+                "{:<6d}{:<14.3e}{:<7d}{:<7d}{}".format(
+                    i, cost[i], int(nfev[i]), int(nit[i]), _STATUS_KEYS[status[i]]
+                )
+            )
+    if verbose > 0:
+        print(
+            "{} of {} initial guesses converged, best is {}.".format(
+                int(success_all.sum()), k, best
+            )
+        )
+        if result["success"]:
+            print(result["message"])
+        else:
+            print("Warning: " + result["message"])
+        print("         Current function value: {:.3e}".format(result["cost"]))
+        print(
+            "         Total delta_x: {:.3e}".format(
+                jnp.linalg.norm(x0[best] - result["x"])
+            )
+        )
+        print("         Iterations: {:d}".format(result["nit"]))
+        print("         Function evaluations: {:d}".format(result["nfev"]))
+        print("         Jacobian evaluations: {:d}".format(result["njev"]))
+
+    return result
@@ -27,6 +27,7 @@ from desc.utils import (
 )
 
 from ._constraint_wrappers import LinearConstraintProjection, ProximalProjection
+from .utils import Telemetry
 
 
 class Optimizer(IOAble):
@@ -147,6 +148,11 @@ class Optimizer(IOAble):
               ``ProximalProjection`` as its ``perturb_options``.
             - ``"solve_options"`` : Dictionary of keyword arguments to pass to
               ``ProximalProjection`` as its ``solve_options``.
+            - ``"telemetry"`` : (str, path-like or callable) Where to send a machine
+              readable record of each iteration, including the time spent in each
+              part of the optimizer, peak memory and the cost of each sub-objective.
+              A str or path is a file that records are appended to as lines of JSON,
+              a callable is called with each record as a dict.
 
             See the documentation page [Optimizers
             Supported](https://desc-docs.readthedocs.io/en/stable/optimizers.html)
@@ -240,6 +246,11 @@ class Optimizer(IOAble):
         # different from objective.things, to ensure the correct order is passed
         # to the objective
         x0 = objective.x(*[things[things.index(t)] for t in objective.things])
+        if options.get("telemetry", None) is not None:
+            options = options.copy()
+            options["telemetry"] = Telemetry(
+                options["telemetry"], method=self.method, objective=objective
+            )
 
         stoptol = _get_default_tols(
             method,
@@ -541,8 +552,11 @@ def get_combined_constraint_objectives(
         )
         objective.build(verbose=verbose)
         if nonlinear_constraint is not None:
+            # must use the same null space as the objective
             nonlinear_constraint = LinearConstraintProjection(
-                nonlinear_constraint, linear_constraint
+                nonlinear_constraint,
+                linear_constraint,
+                factorization=objective._factorization,
             )
             nonlinear_constraint.build(verbose=verbose)
 
@@ -550,7 +564,8 @@ def get_combined_constraint_objectives(
         # need to project x_scale down to correct size
         Z = objective._Z
         x_scale = np.broadcast_to(x_scale, objective._objective.dim_x)
-        x_scale = np.abs(np.diag(Z.T @ np.diag(x_scale[objective._unfixed_idx]) @ Z))
+        # diag(Z.T @ diag(x_scale) @ Z), without forming the dense matrices
+        x_scale = np.abs(np.asarray((Z**2).T @ x_scale[objective._unfixed_idx]))
         x_scale = np.where(x_scale < np.finfo(x_scale.dtype).eps, 1, x_scale)
 
     if objective.scalar and (not optimizers[method]["scalar"]):
@@ -7,6 +7,7 @@ from desc.utils import errorif, setdefault
 
 from .utils import (
     STATUS_MESSAGES,
+    Telemetry,
     check_termination,
     print_header_nonlinear,
     print_iteration_nonlinear,
@@ -79,6 +80,8 @@ def sgd(
         - ``"alpha"`` : (float > 0) Step size parameter. Default
           ``1e-2 * norm(x)/norm(grad(x))``
         - ``"beta"`` : (float > 0) Momentum parameter. Default 0.9
+        - ``"telemetry"`` : (str, path-like or callable) Where to send a machine
+          readable record of each iteration, see ``desc.optimize.lsqtr``.
 
     Returns
     -------
@@ -89,6 +92,8 @@ def sgd(
 
     """
     options = {} if options is None else options
+    telemetry = Telemetry.from_option(options.pop("telemetry", None), method)
+    fun, grad = telemetry.wrap("fun", fun), telemetry.wrap("grad", grad)
     nfev = 0
     ngev = 0
     iteration = 0
@@ -158,6 +163,16 @@ def sgd(
         allx.append(x)
         if verbose > 1:
             print_iteration_nonlinear(iteration, nfev, f, df, step_norm, g_norm)
+        telemetry.record(
+            iteration,
+            x,
+            nfev=nfev,
+            ngev=ngev,
+            cost=f,
+            cost_reduction=df,
+            step_norm=step_norm,
+            optimality=g_norm,
+        )
 
         if callback(jnp.copy(x), *args):
             success, message = False, STATUS_MESSAGES["callback"]
@@ -1,5 +1,7 @@
 """Functions for solving subproblems arising in trust region methods."""
 
+import functools
+
 import numpy as np
 
 from desc.backend import (
@@ -460,6 +462,104 @@ def trust_region_step_exact_qr(
     return cond(jnp.linalg.norm(p_newton) <= trust_radius, truefun, falsefun, None)
 
 
+@functools.partial(jit, static_argnames="mode")
+def trust_region_step_cg(
+    g,
+    JorH,
+    diag,
+    trust_radius,
+    initial_alpha=None,
+    rtol=None,
+    max_iter=None,
+    mode="jac",
+    precond=None,
+):
+    """Solve a trust-region problem using truncated conjugate gradients.
+
+    Solves problems of the form
+        min_p g.T p + 1/2 p.T (B + diag) p,  ||p|| < trust_radius
+
+    where ``B = J.T J`` for least squares problems (``mode="jac"``) or ``B = H`` for
+    general problems (``mode="hess"``), approximately with the Steihaug-Toint method,
+    which only needs matrix-vector products, so the Jacobian or Hessian never has to
+    be formed or factorized. Conjugate gradient iterations are stopped when the
+    residual is small enough, when the step leaves the trust region, or when a
+    direction of negative curvature is found, in which case the step is extended to
+    the boundary. With a preconditioner, the iterates no longer grow monotonically,
+    so stopping at the boundary is a heuristic, but the step always stays inside the
+    trust region.
+
+    Parameters
+    ----------
+    g : ndarray, shape (n,)
+        Gradient of the quadratic model.
+    JorH : MatrixFreeJacobian or MatrixFreeHessian
+        Jacobian matrix, accessed only through ``J.dot`` and ``J.rdot``, or Hessian
+        matrix, accessed only through ``H.dot``.
+    diag : ndarray, shape (n,)
+        Additional diagonal part of the Hessian approximation.
+    trust_radius : float
+        Radius of a trust region.
+    initial_alpha : float, optional
+        Initial guess for Levenberg-Marquardt parameter - unused by this method.
+    rtol : float, optional
+        Relative tolerance for the norm of the residual of the normal equations.
+        Defaults to ``min(0.5, sqrt(norm(g)))``, which gives superlinear convergence
+        near the solution.
+    max_iter : int, optional
+        Maximum number of conjugate gradient iterations. Defaults to the size of g.
+    mode : {"jac", "hess"}
+        Whether ``JorH`` is a Jacobian or a Hessian.
+    precond : CoarseGridPreconditioner, optional
+        Approximate inverse of ``B + diag``, accessed only through ``precond.dot``.
+        Defaults to no preconditioning.
+
+    Returns
+    -------
+    p : ndarray, shape (n,)
+        Found solution of a trust-region problem.
+    hits_boundary : bool
+        True if the proposed step is on the boundary of the trust region.
+    alpha : float
+        Levenberg-Marquardt parameter - always 0 for this method.
+
+    """
+    g_norm = jnp.linalg.norm(g)
+    rtol = setdefault(rtol, jnp.minimum(0.5, jnp.sqrt(g_norm)))
+    max_iter = setdefault(max_iter, g.size)
+    tol = rtol * g_norm
+
+    M = (lambda r: r) if precond is None else precond.dot
+
+    def loop_cond(state):
+        p, r, z, d, k, done, hits_boundary = state
+        return (~done) & (k < max_iter)
+
+    def loop_body(state):
+        p, r, z, d, k, done, hits_boundary = state
+        Bd = (JorH.rdot(JorH.dot(d)) if mode == "jac" else JorH.dot(d)) + diag * d
+        dBd = jnp.dot(d, Bd)
+        rz = jnp.dot(r, z)
+        a = rz / jnp.where(dBd > 0, dBd, 1)
+        p_new = p + a * d
+        hits_boundary = (dBd <= 0) | (jnp.linalg.norm(p_new) >= trust_radius)
+        _, tb = get_boundaries_intersections(p, d, trust_radius)
+        p = jnp.where(hits_boundary, p + tb * d, p_new)
+        r = r + a * Bd
+        z = M(r)
+        d = -z + jnp.dot(r, z) / rz * d
+        done = hits_boundary | (jnp.linalg.norm(r) < tol)
+        return p, r, z, d, k + 1, done, hits_boundary
+
+    z = M(g)
+    p, *_, hits_boundary = while_loop(
+        loop_cond,
+        loop_body,
+        (jnp.zeros_like(g), g, z, -z, 0, g_norm == 0, False),
+    )
+    return p, hits_boundary, 0.0
+
+
 def update_tr_radius(
     trust_radius,
     actual_reduction,
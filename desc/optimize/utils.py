@@ -2,10 +2,22 @@
 
 import copy
 import functools
+import json
+import os
+import time
 
 import numpy as np
 
-from desc.backend import cond, jit, jnp, put, solve_triangular
+from desc.backend import (
+    cond,
+    fori_loop,
+    jax,
+    jit,
+    jnp,
+    put,
+    register_pytree_node,
+    solve_triangular,
+)
 from desc.utils import Index
 
 
@@ -275,7 +287,7 @@ def evaluate_quadratic_form_hess(H, g, x, diag=None):
 
     Parameters
     ----------
-    H : ndarray
+    H : ndarray or MatrixFreeHessian
         Hessian matrix
     g : ndarray, shape(n,)
         Gradient, defines the linear term.
@@ -291,7 +303,7 @@ def evaluate_quadratic_form_hess(H, g, x, diag=None):
         Value of the function.
 
     """
-    q = x @ H @ x
+    q = jnp.dot(x, H.dot(x))
     if diag is not None:
         q += jnp.sum(diag * x**2, axis=-1)
     l = jnp.dot(g, x)
@@ -407,6 +419,172 @@ def print_iteration_nonlinear(
     print(s)
 
 
+class Telemetry:
+    """Machine readable record of each iteration of an optimizer.
+
+    Every record is a dict with the iteration number, the quantities printed by
+    ``print_iteration_nonlinear`` and any others passed by the optimizer (such as the
+    trust region radius), the wall time spent in each wrapped function since the
+    previous record, the peak memory used by the process and, if ``objective`` is
+    given, the cost of each of its sub-objectives.
+
+    Parameters
+    ----------
+    sink : str, path-like or callable, optional
+        Where to send the records. A str or path is a file that each record is
+        appended to as a line of JSON. A callable is called with each record. If None,
+        nothing is recorded and wrapped functions are returned unchanged.
+    method : str, optional
+        Name of the optimizer, included in each record.
+    objective : ObjectiveFunction, optional
+        Objective being optimized. Its sub-objectives are used to split the residual
+        into the cost of each one.
+
+    """
+
+    def __init__(self, sink=None, method=None, objective=None):
+        self._sink = sink
+        self._method = method
+        self._objective = objective
+        self._times = {}
+        self._last_time = time.perf_counter()
+
+    @classmethod
+    def from_option(cls, option, method=None):
+        """Create from the ``"telemetry"`` option of an optimizer.
+
+        Parameters
+        ----------
+        option : Telemetry, str, path-like, callable or None
+            Value of the option. Telemetry made by ``Optimizer.optimize`` is reused,
+            but records the name of the low level method if it didn't have one.
+        method : str, optional
+            Name of the optimizer.
+
+        Returns
+        -------
+        telemetry : Telemetry
+
+        """
+        if isinstance(option, cls):
+            if option._method is None:
+                option._method = method
+            return option
+        return cls(option, method)
+
+    @property
+    def enabled(self):
+        """bool: Whether anything is being recorded."""
+        return self._sink is not None
+
+    def wrap(self, key, func):
+        """Time calls to func, adding the time to the current record under key.
+
+        Results are blocked on so that the time includes the actual computation.
+        Calls with traced arguments (eg while func is being differentiated by JAX)
+        are not timed.
+        """
+        if not self.enabled or func is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            if any(
+                isinstance(leaf, jax.core.Tracer)
+                for leaf in jax.tree_util.tree_leaves((args, kwargs))
+            ):
+                return func(*args, **kwargs)
+            t0 = time.perf_counter()
+            out = jax.block_until_ready(func(*args, **kwargs))
+            self._times[key] = self._times.get(key, 0.0) + time.perf_counter() - t0
+            return out
+
+        return wrapped
+
+    def record(self, iteration, x=None, f=None, **kwargs):
+        """Send the record of an iteration to the sink.
+
+        Parameters
+        ----------
+        iteration : int
+            Iteration number.
+        x : ndarray, optional
+            Current optimization variables, used to compute the cost of each
+            sub-objective.
+        f : ndarray, optional
+            Residual of the objective at x, if already known.
+        **kwargs : float
+            Other quantities to record, eg ``nfev``, ``cost``, ``trust_radius``.
+
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._times["total"] = now - self._last_time
+        rec = {"method": self._method, "iteration": int(iteration)}
+        rec.update({key: _to_json(val) for key, val in kwargs.items()})
+        rec["time"] = self._times
+        rec["memory"] = _peak_memory()
+        if self._objective is not None and x is not None:
+            rec["objectives"] = self._objective_costs(x, f)
+        if callable(self._sink):
+            self._sink(rec)
+        else:
+            with open(self._sink, "a") as file:
+                file.write(json.dumps(rec) + "\n")
+        self._times = {}
+        # don't count the time spent computing the record
+        self._last_time = time.perf_counter()
+
+    def _objective_costs(self, x, f=None):
+        """Cost of each sub-objective, 1/2 the sum of squares of its residual."""
+        objective = self._objective
+        # wrappers like LinearConstraintProjection have the same residual
+        base = objective
+        while hasattr(base, "_objective"):
+            base = base._objective
+        dims = [obj.dim_f for obj in base.objectives]
+        if f is None or jnp.size(f) != sum(dims):
+            f = objective.compute_scaled_error(x, objective.constants)
+        costs = {}
+        for obj, fi in zip(base.objectives, jnp.split(f, np.cumsum(dims)[:-1])):
+            name = obj.name
+            i = 1
+            while name in costs:
+                name = f"{obj.name}_{i}"
+                i += 1
+            costs[name] = float(0.5 * jnp.sum(fi**2))
+        return costs
+
+
+def _to_json(val):
+    if val is None or isinstance(val, (bool, str)):
+        return val
+    val = np.asarray(val)
+    return val.item() if val.ndim == 0 else val.tolist()
+
+
+def _peak_memory():
+    """Peak memory of the process and of the default device, in bytes."""
+    out = {}
+    try:
+        import resource
+
+        # ru_maxrss is in kilobytes on linux and bytes on mac
+        scale = 1 if os.uname().sysname == "Darwin" else 1024
+        out["host_peak_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        out["host_peak_bytes"] *= scale
+    except (ImportError, AttributeError):  # windows
+        pass
+    try:
+        stats = jax.devices()[0].memory_stats()
+    except Exception:
+        stats = None
+    if stats and "peak_bytes_in_use" in stats:
+        out["device_peak_bytes"] = int(stats["peak_bytes_in_use"])
+    return out
+
+
 STATUS_MESSAGES = {
     "success": "Optimization terminated successfully.",
     "xtol": "`xtol` condition satisfied.",
@@ -487,6 +665,256 @@ def compute_jac_scale(A, prev_scale_inv=None):
     return 1 / scale_inv, scale_inv
 
 
+@jit
+def broyden_update(J, dx, df):
+    """Update a Jacobian matrix with Broyden's rank one secant formula.
+
+    Returns the matrix closest to ``J`` in the Frobenius norm that satisfies the secant
+    condition ``J_new @ dx = df``.
+
+    Parameters
+    ----------
+    J : ndarray, shape(m, n)
+        Jacobian matrix at the previous point.
+    dx : ndarray, shape(n,)
+        Step from the previous point.
+    df : ndarray, shape(m,)
+        Change in the function value over the step.
+
+    Returns
+    -------
+    J_new : ndarray, shape(m, n)
+        Updated Jacobian matrix.
+
+    """
+    return J + jnp.outer(df - J @ dx, dx / jnp.dot(dx, dx))
+
+
+@functools.partial(jit, static_argnames="num_probes")
+def compute_jac_scale_matfree(J, prev_scale_inv=None, num_probes=16):
+    """Estimate scaling factor based on column norm of a matrix free Jacobian.
+
+    The squared column norms are the diagonal of ``J.T @ J``, which is estimated
+    from ``num_probes`` products ``z @ J`` with random vectors of +/-1 (Hutchinson's
+    method), so that the Jacobian never has to be formed.
+
+    Parameters
+    ----------
+    J : MatrixFreeJacobian
+        Jacobian to estimate the column norms of.
+    prev_scale_inv : ndarray, optional
+        Column norms from the previous iteration. The new norms are not allowed to
+        decrease.
+    num_probes : int
+        Number of random vectors to use.
+
+    """
+    keys = jax.random.split(jax.random.PRNGKey(0), num_probes)
+
+    def body(i, diag):
+        z = jax.random.rademacher(keys[i], (J.shape[0],), dtype=J.x.dtype)
+        return diag + J.rdot(z) ** 2
+
+    diag = fori_loop(0, num_probes, body, jnp.zeros(J.shape[1], dtype=J.x.dtype))
+    scale_inv = (diag / num_probes) ** 0.5
+    scale_inv = jnp.where(
+        scale_inv < jnp.finfo(J.x.dtype).eps * max(J.shape), 1, scale_inv
+    )
+
+    if prev_scale_inv is not None:
+        scale_inv = jnp.maximum(scale_inv, prev_scale_inv)
+    return 1 / scale_inv, scale_inv
+
+
+class MatrixFreeJacobian:
+    """Jacobian matrix that is only accessed through products with vectors.
+
+    Represents ``J @ diag(d)``, where ``J`` is the Jacobian of a function at ``x``,
+    using Jacobian-vector and vector-Jacobian products so that the matrix is never
+    formed. Instances are pytrees, so they can be passed to jitted functions in
+    place of a dense Jacobian wherever only ``dot`` and ``rdot`` are needed.
+
+    Parameters
+    ----------
+    jvp : callable
+        Jacobian-vector product, with signature ``jvp(v, x, *args) -> J @ v``. Should
+        also accept ``v`` of shape (k, n) and return an array of shape (k, m).
+    vjp : callable
+        Vector-Jacobian product, with signature ``vjp(u, x, *args) -> u @ J``.
+    x : ndarray, shape(n,)
+        Point where the Jacobian is evaluated.
+    args : tuple
+        Additional arguments passed to ``jvp`` and ``vjp``.
+    shape : tuple of int
+        Shape (m, n) of the Jacobian.
+    d : ndarray, shape(n,), optional
+        Scaling applied to the columns of the Jacobian. Defaults to no scaling.
+
+    """
+
+    def __init__(self, jvp, vjp, x, args, shape, d=None):
+        self.jvp = jvp
+        self.vjp = vjp
+        self.x = x
+        self.args = tuple(args)
+        self.shape = tuple(shape)
+        self.d = jnp.ones(self.shape[1], dtype=x.dtype) if d is None else d
+
+    def scale(self, d):
+        """Return the Jacobian with columns scaled by d instead of self.d."""
+        return MatrixFreeJacobian(self.jvp, self.vjp, self.x, self.args, self.shape, d)
+
+    def dot(self, s):
+        """Compute ``J @ diag(d) @ s`` for s of shape (n,) or (n, k)."""
+        if s.ndim == 1:
+            return self.jvp(self.d * s, self.x, *self.args)
+        return self.jvp((self.d[:, None] * s).T, self.x, *self.args).T
+
+    def rdot(self, u):
+        """Compute ``u @ J @ diag(d)`` for u of shape (m,)."""
+        return self.d * self.vjp(u, self.x, *self.args)
+
+    def tree_flatten(self):
+        """Flatten into arrays and static data."""
+        return (self.x, self.args, self.d), (self.jvp, self.vjp, self.shape)
+
+    @classmethod
+    def tree_unflatten(cls, aux_data, children):
+        """Rebuild from arrays and static data."""
+        jvp, vjp, shape = aux_data
+        x, args, d = children
+        return cls(jvp, vjp, x, args, shape, d)
+
+
+register_pytree_node(
+    MatrixFreeJacobian,
+    MatrixFreeJacobian.tree_flatten,
+    MatrixFreeJacobian.tree_unflatten,
+)
+
+
+class CoarseGridPreconditioner:
+    """Two level preconditioner for the Gauss-Newton matrix of a least squares problem.
+
+    Approximates the inverse of ``diag(d) @ J.T @ J @ diag(d)`` by
+
+        ``I + diag(1/d) @ S @ inv(J_c.T @ J_c) @ S.T @ diag(1/d)``
+
+    where the columns of ``S`` span a subspace of smooth (low resolution) directions,
+    and ``J_c`` is the Jacobian of the same problem discretized in that subspace. The
+    coarse term removes the small eigenvalues of the smooth directions, while the
+    identity handles the rest, which are already well scaled by ``d`` when it is the
+    inverse of the column norms of ``J``. Instances are pytrees, so they can be
+    passed to jitted functions.
+
+    Parameters
+    ----------
+    S : ndarray, shape(n, k)
+        Basis of the coarse subspace.
+    L : ndarray, shape(k, k)
+        Lower triangular Cholesky factor of ``J_c.T @ J_c``.
+    d : ndarray, shape(n,), optional
+        Scaling of the variables. Defaults to no scaling.
+
+    """
+
+    def __init__(self, S, L, d=None):
+        self.S = S
+        self.L = L
+        self.d = jnp.ones(S.shape[0], dtype=S.dtype) if d is None else d
+
+    @classmethod
+    def from_jac(cls, S, J_c):
+        """Factorize the coarse Jacobian J_c with coarse basis S."""
+        return cls(S, chol(J_c.T @ J_c))
+
+    def scale(self, d):
+        """Return the preconditioner for variables scaled by d instead of self.d."""
+        return CoarseGridPreconditioner(self.S, self.L, d)
+
+    def dot(self, r):
+        """Apply the approximate inverse to r of shape (n,)."""
+        u = solve_triangular(self.L, self.S.T @ (r / self.d), lower=True)
+        u = solve_triangular(self.L.T, u, lower=False)
+        return r + (self.S @ u) / self.d
+
+    def tree_flatten(self):
+        """Flatten into arrays and static data."""
+        return (self.S, self.L, self.d), None
+
+    @classmethod
+    def tree_unflatten(cls, aux_data, children):
+        """Rebuild from arrays and static data."""
+        return cls(*children)
+
+
+register_pytree_node(
+    CoarseGridPreconditioner,
+    CoarseGridPreconditioner.tree_flatten,
+    CoarseGridPreconditioner.tree_unflatten,
+)
+
+
+class MatrixFreeHessian:
+    """Hessian matrix that is only accessed through products with vectors.
+
+    Represents ``diag(d) @ H @ diag(d)``, where ``H`` is the Hessian of a scalar
+    function at ``x``, using Hessian-vector products so that the matrix is never
+    formed. Instances are pytrees, so they can be passed to jitted functions in place
+    of a dense Hessian wherever only ``dot`` is needed.
+
+    Parameters
+    ----------
+    hvp : callable
+        Hessian-vector product, with signature ``hvp(v, x, *args) -> H @ v``.
+    x : ndarray, shape(n,)
+        Point where the Hessian is evaluated.
+    args : tuple
+        Additional arguments passed to ``hvp``.
+    d : ndarray, shape(n,), optional
+        Scaling applied to the rows and columns of the Hessian. Defaults to no
+        scaling.
+
+    """
+
+    def __init__(self, hvp, x, args, d=None):
+        self.hvp = hvp
+        self.x = x
+        self.args = tuple(args)
+        self.d = jnp.ones_like(x) if d is None else d
+
+    @property
+    def shape(self):
+        """tuple: Shape (n, n) of the Hessian."""
+        return (self.x.size, self.x.size)
+
+    def scale(self, d):
+        """Return the Hessian with rows and columns scaled by d instead of self.d."""
+        return MatrixFreeHessian(self.hvp, self.x, self.args, d)
+
+    def dot(self, s):
+        """Compute ``diag(d) @ H @ diag(d) @ s`` for s of shape (n,)."""
+        return self.d * self.hvp(self.d * s, self.x, *self.args)
+
+    def tree_flatten(self):
+        """Flatten into arrays and static data."""
+        return (self.x, self.args, self.d), (self.hvp,)
+
+    @classmethod
+    def tree_unflatten(cls, aux_data, children):
+        """Rebuild from arrays and static data."""
+        (hvp,) = aux_data
+        x, args, d = children
+        return cls(hvp, x, args, d)
+
+
+register_pytree_node(
+    MatrixFreeHessian,
+    MatrixFreeHessian.tree_flatten,
+    MatrixFreeHessian.tree_unflatten,
+)
+
+
 @jit
 def compute_hess_scale(H, prev_scale_inv=None):
     """Compute scaling factors based on diagonal of Hessian matrix."""
@@ -500,6 +928,42 @@ def compute_hess_scale(H, prev_scale_inv=None):
     return 1 / scale_inv, scale_inv
 
 
+@functools.partial(jit, static_argnames="num_probes")
+def compute_hess_scale_matfree(H, prev_scale_inv=None, num_probes=16):
+    """Estimate scaling factors based on diagonal of a matrix free Hessian.
+
+    The diagonal is estimated as the mean of ``z * (H @ z)`` over ``num_probes``
+    random vectors ``z`` of +/-1 (Hutchinson's method), so that the Hessian never has
+    to be formed.
+
+    Parameters
+    ----------
+    H : MatrixFreeHessian
+        Hessian to estimate the diagonal of.
+    prev_scale_inv : ndarray, optional
+        Diagonal from the previous iteration. The new values are not allowed to
+        decrease.
+    num_probes : int
+        Number of random vectors to use.
+
+    """
+    keys = jax.random.split(jax.random.PRNGKey(0), num_probes)
+
+    def body(i, diag):
+        z = jax.random.rademacher(keys[i], H.x.shape, dtype=H.x.dtype)
+        return diag + z * H.dot(z)
+
+    diag = fori_loop(0, num_probes, body, jnp.zeros_like(H.x))
+    scale_inv = jnp.abs(diag / num_probes)
+    scale_inv = jnp.where(
+        scale_inv < jnp.finfo(H.x.dtype).eps * max(H.shape), 1, scale_inv
+    )
+
+    if prev_scale_inv is not None:
+        scale_inv = jnp.maximum(scale_inv, prev_scale_inv)
+    return 1 / scale_inv, scale_inv
+
+
 def f_where_x(x, xs, fs, dim=0):
     """Return fs where x==xs.
 
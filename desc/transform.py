@@ -1,11 +1,16 @@
 """Class to transform from spectral basis to real space."""
 
+import hashlib
+import os
+import tempfile
 import warnings
 
 import numpy as np
 from termcolor import colored
 
-from desc.backend import jnp, put
+from desc import __version__
+from desc import config as desc_config
+from desc.backend import jax, jnp, put
 from desc.grid import Grid
 from desc.io import IOAble
 from desc.utils import combination_permutation, warnif
@@ -39,6 +44,11 @@ class Transform(IOAble):
         * ``'jitable'`` is the same as ``'direct1'`` but avoids some checks, allowing
           you to create transforms inside JIT compiled functions.
         * ``'auto'`` selects the method based on the grid and basis resolution.
+    lazy : bool
+        whether to defer evaluating each transform matrix until it is first used.
+        Blocks evaluated outside of JIT are stored for reuse. When the transform is
+        passed as an argument to a JIT compiled function, unbuilt blocks are instead
+        evaluated inside the compiled function, trading compute for memory.
 
     """
 
@@ -54,6 +64,7 @@ class Transform(IOAble):
         build=True,
         build_pinv=False,
         method="auto",
+        lazy=False,
     ):
 
         self._grid = grid
@@ -79,6 +90,7 @@ class Transform(IOAble):
 
         self._built = False
         self._built_pinv = False
+        self._lazy = bool(lazy)
         self._derivatives = self._get_derivatives(derivs)
         self._sort_derivatives()
         self._method = method
@@ -288,79 +300,124 @@ class Transform(IOAble):
             self._built = True
             return
 
+        if self.lazy:
+            # matrices are evaluated on first use
+            self._built = True
+            return
+
         if self.method in ["direct1", "jitable"]:
             for d in self.derivatives:
-                self.matrices["direct1"][d[0]][d[1]][d[2]] = self.basis.evaluate(
-                    self.grid, d
-                )
+                self._build_matrix("direct1", *d)
 
         if self.method in ["fft", "direct2"]:
-            temp_d = np.hstack(
-                [self.derivatives[:, :2], np.zeros((len(self.derivatives), 1))]
-            ).astype(int)
-            temp_modes = np.hstack([self.lm_modes, np.zeros((self.num_lm_modes, 1))])
-            for d in temp_d:
-                self.matrices["fft"][d[0]][d[1]] = self.basis.evaluate(
-                    self.fft_grid, d, modes=temp_modes
-                )
+            for d in np.unique(self.derivatives[:, :2], axis=0):
+                self._build_matrix("fft", *d)
         if self.method == "direct2":
-            temp_d = np.hstack(
-                [np.zeros((len(self.derivatives), 2)), self.derivatives[:, 2:]]
-            ).astype(int)
-            temp_modes = np.hstack(
-                [np.zeros((self.num_n_modes, 2)), self.n_modes[:, np.newaxis]]
-            )
-            for d in temp_d:
-                self.matrices["direct2"][d[2]] = self.basis.evaluate(
-                    self.dft_grid, d, modes=temp_modes
-                )
+            for d in np.unique(self.derivatives[:, 2]):
+                self._build_matrix("direct2", d)
 
         self._built = True
 
+    def _get_matrix(self, key, *d):
+        """Get the matrix ``self.matrices[key][d[0]]...[d[-1]]``.
+
+        Parameters
+        ----------
+        key : {"direct1", "fft", "direct2"}
+            Which matrices to get. "direct1" are indexed by [dr, dt, dz], "fft" by
+            [dr, dt] and "direct2" by [dz].
+        d : int
+            Derivative orders.
+
+        Returns
+        -------
+        A : ndarray
+            Transform matrix. In lazy mode, it is built if it doesn't exist yet.
+
+        """
+        matrices = self.matrices[key]
+        for i in d[:-1]:
+            matrices = matrices.get(i, {})
+        A = matrices.get(d[-1], {})
+        if isinstance(A, dict):
+            # lazy mode only defers building, it can't add derivative orders
+            cols = {"direct1": [0, 1, 2], "fft": [0, 1], "direct2": [2]}[key]
+            initialized = (self.derivatives[:, cols] == np.array(d)).all(axis=-1).any()
+            if not (self.lazy and initialized):
+                raise ValueError(
+                    colored("Derivative orders are out of initialized bounds", "red")
+                )
+            A = self._build_matrix(key, *d)
+        return A
+
+    def _build_matrix(self, key, *d):
+        """Evaluate the matrix ``self.matrices[key][d[0]]...[d[-1]]``."""
+        if key == "direct1":
+            A = self._evaluate(self.grid, np.array(d))
+        elif key == "fft":
+            # use jnp since mode numbers are traced when building inside JIT
+            temp_modes = jnp.hstack([self.lm_modes, jnp.zeros((self.num_lm_modes, 1))])
+            A = self._evaluate(self.fft_grid, np.array([*d, 0]), modes=temp_modes)
+        elif key == "direct2":
+            temp_modes = jnp.hstack(
+                [jnp.zeros((self.num_n_modes, 2)), self.n_modes[:, jnp.newaxis]]
+            )
+            A = self._evaluate(self.dft_grid, np.array([0, 0, *d]), modes=temp_modes)
+        if not (self.lazy and isinstance(A, jax.core.Tracer)):
+            # don't store matrices evaluated lazily inside JIT, they would leak tracers
+            matrices = self.matrices[key]
+            for i in d[:-1]:
+                matrices = matrices[i]
+            matrices[d[-1]] = A
+        return A
+
     def build_pinv(self):
         """Build the pseudoinverse for fitting."""
         if self.built_pinv:
             return
         rcond = None if self.rcond == "auto" else self.rcond
         if self.method in ["direct1", "jitable"]:
-            A = self.basis.evaluate(self.grid, np.array([0, 0, 0]))
-            self.matrices["pinv"] = (
-                jnp.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
-            )
+            self.matrices["pinv"] = self._pinv(self.grid, rcond)
         elif self.method == "direct2":
             temp_modes = np.hstack([self.lm_modes, np.zeros((self.num_lm_modes, 1))])
-            A = self.basis.evaluate(
-                self.fft_grid, np.array([0, 0, 0]), modes=temp_modes
-            )
+            self.matrices["pinvA"] = self._pinv(self.fft_grid, rcond, temp_modes)
             temp_modes = np.hstack(
                 [np.zeros((self.num_n_modes, 2)), self.n_modes[:, np.newaxis]]
             )
-            B = self.basis.evaluate(
-                self.dft_grid, np.array([0, 0, 0]), modes=temp_modes
-            )
-            self.matrices["pinvA"] = (
-                jnp.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
-            )
-            self.matrices["pinvB"] = (
-                jnp.linalg.pinv(B, rtol=rcond) if B.size else np.zeros_like(B.T)
-            )
+            self.matrices["pinvB"] = self._pinv(self.dft_grid, rcond, temp_modes)
         elif self.method == "fft":
             temp_modes = np.hstack([self.lm_modes, np.zeros((self.num_lm_modes, 1))])
-            A = self.basis.evaluate(
-                self.fft_grid, np.array([0, 0, 0]), modes=temp_modes
-            )
-            self.matrices["pinvA"] = (
-                jnp.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
-            )
+            self.matrices["pinvA"] = self._pinv(self.fft_grid, rcond, temp_modes)
         self._built_pinv = True
 
+    def _evaluate(self, grid, derivatives, modes=None):
+        """Evaluate the basis on grid, using the transform cache if enabled."""
+        return _cached(
+            lambda: self.basis.evaluate(grid, derivatives, modes=modes),
+            "evaluate",
+            self.basis,
+            grid,
+            derivatives,
+            modes,
+        )
+
+    def _pinv(self, grid, rcond, modes=None):
+        """Pseudoinverse of the basis on grid, using the transform cache if enabled."""
+
+        def fun():
+            A = self.basis.evaluate(grid, np.array([0, 0, 0]), modes=modes)
+            return jnp.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
+
+        return _cached(fun, "pinv", self.basis, grid, rcond, modes)
+
     def transform(self, c, dr=0, dt=0, dz=0):
         """Transform from spectral domain to physical.
 
         Parameters
         ----------
-        c : ndarray, shape(num_coeffs,)
-            spectral coefficients, indexed to correspond to the spectral basis
+        c : ndarray, shape(num_coeffs,) or shape(k, num_coeffs)
+            spectral coefficients, indexed to correspond to the spectral basis.
+            If 2D, each row is transformed in a single batched operation.
         dr : int
             order of radial derivative
         dt : int
@@ -370,7 +427,7 @@ class Transform(IOAble):
 
         Returns
         -------
-        x : ndarray, shape(num_nodes,)
+        x : ndarray, shape(num_nodes,) or shape(k, num_nodes)
             array of values of function at node locations
         """
         if not self.built:
@@ -378,76 +435,74 @@ class Transform(IOAble):
                 "Transform must be precomputed with transform.build() before being used"
             )
 
-        if self.basis.num_modes != c.size:
+        if self.basis.num_modes != c.shape[-1]:
             raise ValueError(
                 colored(
-                    "Coefficients dimension ({}) is incompatible with ".format(c.size)
+                    "Coefficients dimension ({}) is incompatible with ".format(
+                        c.shape[-1]
+                    )
                     + "the number of basis modes({})".format(self.basis.num_modes),
                     "red",
                 )
             )
 
-        if len(c) == 0:
-            return np.zeros(self.grid.num_nodes)
+        batch = c.shape[:-1]
+        if c.shape[-1] == 0:
+            return np.zeros((*batch, self.grid.num_nodes))
 
         if self.method in ["direct1", "jitable"]:
-            A = self.matrices["direct1"].get(dr, {}).get(dt, {}).get(dz, {})
-            if isinstance(A, dict):
-                raise ValueError(
-                    colored("Derivative orders are out of initialized bounds", "red")
-                )
-            return A @ c
+            A = self._get_matrix("direct1", dr, dt, dz)
+            return (A @ c.T).T
 
         elif self.method == "direct2":
-            A = self.matrices["fft"].get(dr, {}).get(dt, {})
-            B = self.matrices["direct2"].get(dz, {})
-            if isinstance(A, dict) or isinstance(B, dict):
-                raise ValueError(
-                    colored("Derivative orders are out of initialized bounds", "red")
-                )
-            c_mtrx = jnp.zeros((self.num_lm_modes * self.num_n_modes,))
-            c_mtrx = put(c_mtrx, self.fft_index, c).reshape((-1, self.num_n_modes))
+            A = self._get_matrix("fft", dr, dt)
+            B = self._get_matrix("direct2", dz)
+            c_mtrx = jnp.zeros((*batch, self.num_lm_modes * self.num_n_modes))
+            c_mtrx = put(c_mtrx, (..., self.fft_index), c).reshape(
+                (*batch, -1, self.num_n_modes)
+            )
             cc = A @ c_mtrx
-            return (cc @ B.T).flatten(order="F")
+            return _flatten_F(cc @ B.T)
 
         elif self.method == "fft":
-            A = self.matrices["fft"].get(dr, {}).get(dt, {})
-            if isinstance(A, dict):
-                raise ValueError(
-                    colored("Derivative orders are out of initialized bounds", "red")
-                )
+            A = self._get_matrix("fft", dr, dt)
             # reshape coefficients
-            c_mtrx = jnp.zeros((self.num_lm_modes * self.num_n_modes,))
-            c_mtrx = put(c_mtrx, self.fft_index, c).reshape((-1, self.num_n_modes))
+            c_mtrx = jnp.zeros((*batch, self.num_lm_modes * self.num_n_modes))
+            c_mtrx = put(c_mtrx, (..., self.fft_index), c).reshape(
+                (*batch, -1, self.num_n_modes)
+            )
             # differentiate
-            c_diff = c_mtrx[:, :: (-1) ** dz] * self.dk**dz * (-1) ** (dz > 1)
+            c_diff = c_mtrx[..., :: (-1) ** dz] * self.dk**dz * (-1) ** (dz > 1)
             # re-format in complex notation
             c_cplx = (self.grid.num_zeta / 2) * (
-                c_diff[:, self.basis.N + 1 :] - 1j * c_diff[:, self.basis.N - 1 :: -1]
+                c_diff[..., self.basis.N + 1 :]
+                - 1j * c_diff[..., self.basis.N - 1 :: -1]
             )
-            c_pad = jnp.hstack(
+            c_pad = jnp.concatenate(
                 (
-                    self.grid.num_zeta * c_diff[:, self.basis.N, jnp.newaxis],
+                    self.grid.num_zeta * c_diff[..., self.basis.N, jnp.newaxis],
                     c_cplx,
-                    jnp.zeros((c_cplx.shape[0], self.pad_dim)),
-                    jnp.fliplr(jnp.conj(c_cplx)),
-                )
+                    jnp.zeros((*c_cplx.shape[:-1], self.pad_dim)),
+                    jnp.flip(jnp.conj(c_cplx), axis=-1),
+                ),
+                axis=-1,
             )
             # transform coefficients
             c_fft = jnp.real(jnp.fft.ifft(c_pad))
-            return (A @ c_fft).flatten(order="F")
+            return _flatten_F(A @ c_fft)
 
     def fit(self, x):
         """Transform from physical domain to spectral using weighted least squares fit.
 
         Parameters
         ----------
-        x : ndarray, shape(num_nodes,)
-            values in real space at coordinates specified by grid
+        x : ndarray, shape(num_nodes,) or shape(k, num_nodes)
+            values in real space at coordinates specified by grid.
+            If 2D, each row is fit in a single batched operation.
 
         Returns
         -------
-        c : ndarray, shape(num_coeffs,)
+        c : ndarray, shape(num_coeffs,) or shape(k, num_coeffs)
             spectral coefficients in basis
 
         """
@@ -456,24 +511,25 @@ class Transform(IOAble):
                 "Transform must be built with transform.build_pinv() before being used"
             )
 
+        batch = x.shape[:-1]
         if self.method == "direct1":
             Ainv = self.matrices["pinv"]
-            c = jnp.matmul(Ainv, x)
+            c = (Ainv @ x.T).T
         elif self.method == "direct2":
             Ainv = self.matrices["pinvA"]
             Binv = self.matrices["pinvB"]
-            yy = jnp.matmul(Ainv, x.reshape((-1, self.grid.num_zeta), order="F"))
-            c = jnp.matmul(Binv, yy.T).T.flatten()[self.fft_index]
+            yy = Ainv @ _unflatten_F(x, self.grid.num_zeta)
+            c = (yy @ Binv.T).reshape((*batch, -1))[..., self.fft_index]
         elif self.method == "fft":
             Ainv = self.matrices["pinvA"]
-            c_fft = jnp.matmul(Ainv, x.reshape((Ainv.shape[1], -1), order="F"))
+            c_fft = Ainv @ _unflatten_F(x, x.shape[-1] // Ainv.shape[1])
             c_cplx = jnp.fft.fft(c_fft)
-            c_unpad = c_cplx[:, 1 : (c_cplx.shape[1] - self.pad_dim - 1) // 2 + 1]
-            c0 = c_cplx[:, :1].real / self.grid.num_zeta
+            c_unpad = c_cplx[..., 1 : (c_cplx.shape[-1] - self.pad_dim - 1) // 2 + 1]
+            c0 = c_cplx[..., :1].real / self.grid.num_zeta
             c2 = c_unpad.real / (self.grid.num_zeta / 2)
-            c1 = -c_unpad.imag[:, ::-1] / (self.grid.num_zeta / 2)
-            c_diff = jnp.hstack([c1, c0, c2])
-            c = c_diff.flatten()[self.fft_index]
+            c1 = -c_unpad.imag[..., ::-1] / (self.grid.num_zeta / 2)
+            c_diff = jnp.concatenate([c1, c0, c2], axis=-1)
+            c = c_diff.reshape((*batch, -1))[..., self.fft_index]
         return c
 
     def project(self, y):
@@ -485,48 +541,52 @@ class Transform(IOAble):
         Parameters
         ----------
         y : ndarray
-            vector to project. Should be of size (self.grid.num_nodes,)
+            vector to project. Should be of size (self.grid.num_nodes,), or
+            (k, self.grid.num_nodes) to project each row in a single batched
+            operation.
 
         Returns
         -------
         b : ndarray
-            vector y projected onto basis, shape (self.basis.num_modes)
+            vector y projected onto basis, shape (self.basis.num_modes) or
+            (k, self.basis.num_modes)
         """
         if not self.built:
             raise RuntimeError(
                 "Transform must be precomputed with transform.build() before being used"
             )
 
-        if self.grid.num_nodes != y.size:
+        if self.grid.num_nodes != y.shape[-1]:
             raise ValueError(
                 colored(
-                    "y dimension ({}) is incompatible with ".format(y.size)
+                    "y dimension ({}) is incompatible with ".format(y.shape[-1])
                     + "the number of grid nodes({})".format(self.grid.num_nodes),
                     "red",
                 )
             )
 
+        batch = y.shape[:-1]
         if self.method == "direct1":
-            A = self.matrices["direct1"][0][0][0]
-            return jnp.matmul(A.T, y)
+            A = self._get_matrix("direct1", 0, 0, 0)
+            return (A.T @ y.T).T
 
         elif self.method == "direct2":
-            A = self.matrices["fft"][0][0]
-            B = self.matrices["direct2"][0]
-            yy = jnp.matmul(A.T, y.reshape((-1, self.grid.num_zeta), order="F"))
-            return jnp.matmul(yy, B).flatten()[self.fft_index]
+            A = self._get_matrix("fft", 0, 0)
+            B = self._get_matrix("direct2", 0)
+            yy = A.T @ _unflatten_F(y, self.grid.num_zeta)
+            return (yy @ B).reshape((*batch, -1))[..., self.fft_index]
 
         elif self.method == "fft":
-            A = self.matrices["fft"][0][0]
+            A = self._get_matrix("fft", 0, 0)
             # this was derived by trial and error, but seems to work correctly
             # there might be a more efficient way...
-            a = jnp.fft.fft(A.T @ y.reshape((A.shape[0], -1), order="F"))
-            cdn = a[:, 0]
-            cr = a[:, 1 : 1 + self.basis.N]
-            b = jnp.hstack(
-                [-cr.imag[:, ::-1], cdn.real[:, np.newaxis], cr.real]
-            ).flatten()[self.fft_index]
-            return b
+            a = jnp.fft.fft(A.T @ _unflatten_F(y, y.shape[-1] // A.shape[0]))
+            cdn = a[..., 0]
+            cr = a[..., 1 : 1 + self.basis.N]
+            b = jnp.concatenate(
+                [-cr.imag[..., ::-1], cdn.real[..., np.newaxis], cr.real], axis=-1
+            )
+            return b.reshape((*batch, -1))[..., self.fft_index]
 
     def change_resolution(
         self, grid=None, basis=None, build=True, build_pinv=False, method="auto"
@@ -676,6 +736,11 @@ class Transform(IOAble):
         """ndarray: spectral mode numbers."""
         return self.basis.modes
 
+    @property
+    def lazy(self):
+        """bool: whether transform matrices are evaluated on first use."""
+        return self.__dict__.setdefault("_lazy", False)
+
     @property
     def built(self):
         """bool: whether the transform matrices have been built."""
@@ -728,3 +793,87 @@ class Transform(IOAble):
                 self.method, repr(self.basis), repr(self.grid)
             )
         )
+
+
+def _flatten_F(x):
+    """Flatten the last two axes of x in Fortran order."""
+    return jnp.swapaxes(x, -1, -2).reshape((*x.shape[:-2], -1))
+
+
+def _unflatten_F(x, n):
+    """Inverse of ``_flatten_F``, with n the size of the new last axis."""
+    return jnp.swapaxes(x.reshape((*x.shape[:-1], n, -1)), -1, -2)
+
+
+def _cached(fun, *args):
+    """Return ``fun()``, storing the result in the on-disk transform cache.
+
+    The transform cache is enabled with ``desc.config["transform_cache"]`` or the
+    environment variable ``DESC_TRANSFORM_CACHE=1``. Matrices are stored as .npy files
+    in ``desc.config["cache_dir"]``, named by a hash of ``args``, and are reopened
+    with memory mapping.
+
+    Parameters
+    ----------
+    fun : callable
+        Function with no arguments that computes the matrix.
+    args : tuple
+        Everything the result of ``fun`` depends on. Grids and bases are hashed by
+        their nodes and modes.
+
+    Returns
+    -------
+    A : ndarray
+        Result of ``fun()``.
+
+    """
+    if not (desc_config.get("transform_cache") and desc_config.get("cache_dir")):
+        return fun()
+    key = _hash_transform_args(*args)
+    if key is None:
+        return fun()
+    path = os.path.join(
+        os.path.expanduser(desc_config["cache_dir"]), "transforms", key + ".npy"
+    )
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+    A = fun()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so other processes never see partial files
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as f:
+            np.save(f, np.asarray(A))
+        os.replace(f.name, path)
+    except OSError:
+        pass
+    return A
+
+
+def _hash_transform_args(*args):
+    """Content hash of the arguments that determine a transform matrix.
+
+    Returns None if any argument is traced, i.e. when building inside JIT.
+    """
+    from desc.basis import _Basis
+    from desc.grid import _Grid
+
+    h = hashlib.sha256(__version__.encode())
+    for arg in args:
+        if isinstance(arg, _Basis):
+            h.update(f"{type(arg).__qualname__} {arg.NFP}".encode())
+            arg = arg.modes
+        elif isinstance(arg, _Grid):
+            arg = arg.nodes
+        if isinstance(arg, jax.core.Tracer):
+            return None
+        if arg is None or isinstance(arg, (str, float, int)):
+            h.update(repr(arg).encode())
+        else:
+            arg = np.asarray(arg)
+            h.update(f"{arg.dtype} {arg.shape}".encode())
+            h.update(np.ascontiguousarray(arg).tobytes())
+    return h.hexdigest()
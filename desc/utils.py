@@ -2,11 +2,23 @@
 
 import functools
 import inspect
+import multiprocessing
 import operator
+import os
 import warnings
+import weakref
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from itertools import combinations_with_replacement, permutations
 
 import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
 from scipy.special import factorial
 from termcolor import colored
 
@@ -433,6 +445,98 @@ def svd_inv_null(A):
     return Ainv, Z
 
 
+def block_svd_inv_null(A):
+    """Compute pseudo-inverse and null space of a sparse matrix block by block.
+
+    The rows and columns of A are split into independent blocks, the connected
+    components of the graph where row i and column j are joined if A[i, j] != 0.
+    Each block is factorized with a small SVD, and columns without any nonzero entries
+    are free, so that the cost depends on the size of the largest block rather than
+    the size of A. Singular values are cut off with the same tolerance as in
+    ``svd_inv_null``, relative to the largest singular value of all of A, so the result
+    spans the same spaces as ``svd_inv_null``, though the basis of the null space is in
+    general different.
+
+    Parameters
+    ----------
+    A : ndarray or scipy.sparse matrix
+        Matrix to invert and find null space of.
+
+    Returns
+    -------
+    Ainv : scipy.sparse.csr_matrix
+        Pseudo-inverse of A.
+    Z : scipy.sparse.csr_matrix
+        Null space of A, with orthonormal columns.
+
+    """
+    A = scipy.sparse.csr_matrix(A)
+    A.eliminate_zeros()
+    M, N = A.shape
+    graph = scipy.sparse.bmat([[None, A], [A.T, None]], format="csr")
+    _, labels = scipy.sparse.csgraph.connected_components(graph, directed=False)
+    row_labels, col_labels = labels[:M], labels[M:]
+    # columns that don't appear in any row are free, give them their own label
+    col_labels = np.where(np.diff(A.tocsc().indptr) == 0, -1, col_labels)
+
+    order = np.argsort(row_labels, kind="stable")
+    keys, start = np.unique(row_labels[order], return_index=True)
+    rows_by_label = dict(zip(keys, np.split(order, start[1:])))
+    order = np.argsort(col_labels, kind="stable")
+    keys, start = np.unique(col_labels[order], return_index=True)
+    blocks = []
+    for label, cols in zip(keys, np.split(order, start[1:])):
+        if label == -1:
+            blocks.append((None, cols, None))
+            continue
+        rows = rows_by_label[label]
+        svd = np.linalg.svd(A[rows][:, cols].toarray(), full_matrices=True)
+        blocks.append((rows, cols, svd))
+    # A is block diagonal up to a permutation, so its largest singular value is the
+    # largest of any block, and the tolerance matches the one in svd_inv_null
+    smax = max(
+        [svd[1].max(initial=0) for _, _, svd in blocks if svd is not None], default=0
+    )
+    tol = smax * np.finfo(A.dtype).eps * max(M, N)
+
+    # blocks are stored in coordinate format, so that the cost and memory scale with
+    # the size of the blocks rather than the size of A
+    Ainv_rows, Ainv_cols, Ainv_vals = [], [], []
+    Z_rows, Z_cols, Z_vals = [], [], []
+    k = 0
+    for rows, cols, svd in blocks:
+        if svd is None:
+            Z_rows.append(cols)
+            Z_cols.append(k + np.arange(cols.size))
+            Z_vals.append(np.ones(cols.size, dtype=A.dtype))
+            k += cols.size
+            continue
+        u, s, vh = svd
+        K = min(rows.size, cols.size)
+        large = s > tol
+        num = np.sum(large)
+        s = np.where(large, 1 / np.where(large, s, 1), 0)
+        Ainv_rows.append(np.repeat(cols, rows.size))
+        Ainv_cols.append(np.tile(rows, cols.size))
+        Ainv_vals.append(((vh[:K].T * s) @ u[:, :K].T).ravel())
+        if num < cols.size:
+            Zi = vh[num:].T.conj()
+            Z_rows.append(np.repeat(cols, Zi.shape[1]))
+            Z_cols.append(np.tile(k + np.arange(Zi.shape[1]), cols.size))
+            Z_vals.append(Zi.ravel())
+            k += Zi.shape[1]
+
+    def _coo(rows, cols, vals, shape):
+        if not len(vals):
+            return scipy.sparse.csr_matrix(shape, dtype=A.dtype)
+        rows, cols, vals = map(np.concatenate, (rows, cols, vals))
+        return scipy.sparse.csr_matrix((vals, (rows, cols)), shape=shape)
+
+    Ainv = _coo(Ainv_rows, Ainv_cols, Ainv_vals, (N, M))
+    Z = _coo(Z_rows, Z_cols, Z_vals, (N, k))
+    return Ainv, Z
+
+
 def combination_permutation(m, n, equals=True):
     """Compute all m-tuples of non-negative ints that sum to less than or equal to n.
 
@@ -752,7 +856,16 @@ def atleast_nd(ndmin, ary):
     return jnp.array(ary, ndmin=ndmin) if jnp.ndim(ary) < ndmin else ary
 
 
-def jaxify(func, abstract_eval, vectorized=False, abs_step=1e-4, rel_step=0):
+def jaxify(
+    func,
+    abstract_eval,
+    vectorized=False,
+    abs_step=1e-4,
+    rel_step=0,
+    max_workers=None,
+    executor="thread",
+    scratch_dir=None,
+):
     """Make an external (python) function work with JAX.
 
     Positional arguments to func can be differentiated,
@@ -760,6 +873,15 @@ def jaxify(func, abstract_eval, vectorized=False, abs_step=1e-4, rel_step=0):
 
     Note: Only forward mode differentiation is supported currently.
 
+    When ``max_workers`` or ``scratch_dir`` is given and func is not vectorized, a
+    vmapped call (such as the finite difference directions of ``jax.jacfwd``) is
+    passed to the host as a single batch, and the evaluations of func in the batch are
+    dispatched to a pool of ``max_workers`` workers. A Jacobian with N columns then
+    costs about N/max_workers sequential evaluations of func in wall time. The pool is
+    created on first use and shut down by the ``close`` method of the returned
+    function, or when it is garbage collected. A user supplied ``Executor`` is never
+    shut down.
+
     Parameters
     ----------
     func : callable
@@ -789,20 +911,58 @@ def jaxify(func, abstract_eval, vectorized=False, abs_step=1e-4, rel_step=0):
     rel_step : float, optional
         Relative finite difference step size. Default = 0.
         Total step size is ``abs_step + rel_step * mean(abs(x))``.
+    max_workers : int, optional
+        Number of evaluations of func to run in parallel. Default is to evaluate func
+        sequentially. Not supported for vectorized functions, which already receive
+        the whole batch.
+    executor : {"thread", "process"} or concurrent.futures.Executor, optional
+        Pool to run the evaluations in. Threads are enough when func spends its time
+        in an external program or releases the GIL, otherwise use processes, which
+        requires func and its arguments to be picklable. An ``Executor`` should have
+        at least ``max_workers`` workers. Default = "thread".
+    scratch_dir : str or path-like, optional
+        If given, each worker gets its own subdirectory ``scratch_dir/worker_<k>``,
+        which is passed to func as the keyword argument ``scratch_dir``. No two
+        evaluations running at the same time share a subdirectory, so func can write
+        its input and output files there.
 
     Returns
     -------
     func : callable
         New function that behaves as func but works with jit/vmap/jacfwd etc.
+        If ``max_workers`` or ``scratch_dir`` is given, it also has a ``close``
+        method that shuts down the worker pool.
 
     """
+    errorif(
+        vectorized and (max_workers is not None or scratch_dir is not None),
+        ValueError,
+        "max_workers and scratch_dir are not supported for vectorized functions.",
+    )
+    pooled = max_workers is not None or scratch_dir is not None
+    if pooled:
+        host_func = _PooledCallback(func, max_workers or 1, executor, scratch_dir)
 
     def wrap_pure_callback(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             result_shape_dtype = abstract_eval(*args, **kwargs)
+            if not pooled:
+                return pure_callback(
+                    func, result_shape_dtype, *args, vectorized=vectorized, **kwargs
+                )
+            # receive vmapped calls as one batch and split it on the host
+            in_shapes = [
+                jnp.shape(x) for x in jax.tree_util.tree_leaves((args, kwargs))
+            ]
+            out_leaves, out_treedef = jax.tree_util.tree_flatten(result_shape_dtype)
+            out_shapes = [jnp.shape(x) for x in out_leaves]
             return pure_callback(
-                func, result_shape_dtype, *args, vectorized=vectorized, **kwargs
+                functools.partial(host_func, in_shapes, out_shapes, out_treedef),
+                result_shape_dtype,
+                *args,
+                vectorized=True,
+                **kwargs,
             )
 
         return wrapper
@@ -836,7 +996,120 @@ def jaxify(func, abstract_eval, vectorized=False, abs_step=1e-4, rel_step=0):
 
         return func
 
-    return define_fd_jvp(wrap_pure_callback(func))
+    wrapped = define_fd_jvp(wrap_pure_callback(func))
+    if pooled:
+        wrapped.close = host_func.close
+    return wrapped
+
+
+def _call_in_scratch_dir(func, scratch_dir, args, kwargs):
+    if scratch_dir is not None:
+        # scratch_dir may already be bound positionally to its default
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.arguments["scratch_dir"] = scratch_dir
+        args, kwargs = bound.args, bound.kwargs
+    return func(*args, **kwargs)
+
+
+class _PooledCallback:
+    """Evaluate a batch of calls to a non-vectorized function in a worker pool."""
+
+    def __init__(self, func, max_workers, executor, scratch_dir):
+        errorif(
+            not isinstance(executor, Executor)
+            and executor not in ["thread", "process"],
+            ValueError,
+            f"executor should be 'thread', 'process' or an Executor, got {executor}.",
+        )
+        self._func = func
+        self._max_workers = max_workers
+        self._executor = executor
+        self._pool = executor if isinstance(executor, Executor) else None
+        self._finalizer = None
+        if scratch_dir is None:
+            self._scratch_dirs = [None] * max_workers
+        else:
+            self._scratch_dirs = [
+                os.path.join(os.fspath(scratch_dir), f"worker_{k}")
+                for k in range(max_workers)
+            ]
+            for path in self._scratch_dirs:
+                os.makedirs(path, exist_ok=True)
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self._executor == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+            else:
+                # forking a process that is running jax can deadlock
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            # the finalizer can't reference self, or self would never be collected
+            self._finalizer = weakref.finalize(self, self._pool.shutdown, wait=False)
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool, unless it was supplied by the user.
+
+        A later call creates a new pool.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._pool = None
+
+    def __call__(self, in_shapes, out_shapes, out_treedef, *args, **kwargs):
+        # vmapped args have extra leading batch dimensions, and unbatched args have
+        # leading dimensions of size 1, so broadcast everything to the batch shape
+        leaves, treedef = jax.tree_util.tree_flatten((args, kwargs))
+        batch_shape = np.broadcast_shapes(
+            *[np.shape(x)[: np.ndim(x) - len(s)] for x, s in zip(leaves, in_shapes)]
+        )
+        num_calls = int(np.prod(batch_shape))
+        leaves = [
+            np.broadcast_to(x, batch_shape + s).reshape((num_calls,) + s)
+            for x, s in zip(leaves, in_shapes)
+        ]
+        calls = [
+            jax.tree_util.tree_unflatten(treedef, [x[i] for x in leaves])
+            for i in range(num_calls)
+        ]
+        if self._max_workers == 1 or num_calls == 1:
+            out = [
+                _call_in_scratch_dir(self._func, self._scratch_dirs[0], *call)
+                for call in calls
+            ]
+        else:
+            out = self._map(calls)
+        out = zip(*[jax.tree_util.tree_leaves(y) for y in out])
+        out = [
+            np.reshape(np.stack(y), batch_shape + s) for y, s in zip(out, out_shapes)
+        ]
+        return jax.tree_util.tree_unflatten(out_treedef, out)
+
+    def _map(self, calls):
+        """Evaluate calls in the pool, giving each running call its own scratch dir."""
+        pool = self._get_pool()
+        out = [None] * len(calls)
+        free = list(range(self._max_workers))
+        running = {}
+        for i, call in enumerate(calls):
+            if not free:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    j, k = running.pop(future)
+                    out[j] = future.result()
+                    free.append(k)
+            k = free.pop()
+            future = pool.submit(
+                _call_in_scratch_dir, self._func, self._scratch_dirs[k], *call
+            )
+            running[future] = (i, k)
+        for future, (j, _) in running.items():
+            out[j] = future.result()
+        return out
 
 
 def atleast_3d_mid(ary):
@@ -1,5 +1,8 @@
 """Benchmarks for timing comparison on cpu (that are small enough to run on CI)."""
 
+import subprocess
+import sys
+
 import numpy as np
 import pytest
 
@@ -7,8 +10,11 @@ import desc
 
 desc.set_device("cpu")
 import desc.examples
-from desc.backend import jax
-from desc.basis import FourierZernikeBasis
+from desc.backend import jax, precision
+from desc.basis import FourierZernikeBasis, zernike_radial, zernike_radial_vectorized
+from desc.coils import biot_savart_hh, biot_savart_quad
+from desc.compute import data_index, get_params, get_profiles, get_transforms
+from desc.compute.utils import _compute as compute_fun
 from desc.equilibrium import Equilibrium
 from desc.grid import ConcentricGrid, LinearGrid
 from desc.magnetic_fields import ToroidalMagneticField
@@ -30,6 +36,16 @@ from desc.perturbations import perturb
 from desc.transform import Transform
 
 
+@pytest.mark.benchmark()
+def test_import_desc_compute(benchmark):
+    """Test time to import desc.compute in a fresh interpreter."""
+
+    def run():
+        subprocess.run([sys.executable, "-c", "import desc.compute"], check=True)
+
+    benchmark.pedantic(run, iterations=1, rounds=10)
+
+
 @pytest.mark.benchmark()
 def test_build_transform_fft_lowres(benchmark):
     """Test time to build a transform (after compilation) for low resolution."""
@@ -87,6 +103,75 @@ def test_build_transform_fft_highres(benchmark):
     benchmark.pedantic(build, setup=setup, iterations=1, rounds=20)
 
 
+@pytest.mark.benchmark()
+def test_build_transform_fft_highres_cached(benchmark, tmp_path, monkeypatch):
+    """Test time to build a transform for high resolution with transform cache."""
+    monkeypatch.setitem(desc.config, "cache_dir", str(tmp_path))
+    monkeypatch.setitem(desc.config, "transform_cache", True)
+
+    def setup():
+        jax.clear_caches()
+
+    def build():
+        L = 25
+        M = 25
+        N = 25
+        grid = ConcentricGrid(L=L, M=M, N=N)
+        basis = FourierZernikeBasis(L=L, M=M, N=N)
+        transf = Transform(grid, basis, method="fft", build=False)
+        transf.build()
+
+    build()  # populate the cache
+    benchmark.pedantic(build, setup=setup, iterations=1, rounds=20)
+
+
+@pytest.mark.benchmark()
+@pytest.mark.parametrize("L", [12, 24, 36, 50])
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_zernike_radial(benchmark, L, vectorized):
+    """Test time to evaluate every radial mode and derivative of a Zernike basis."""
+    basis = FourierZernikeBasis(L=L, M=L, N=0)
+    grid = ConcentricGrid(L=2 * L, M=2 * L, N=0)
+    r = grid.nodes[grid.unique_rho_idx, 0]
+    l, m = basis.modes[basis.unique_LM_idx, :2].T
+
+    def run():
+        for dr in range(4):
+            if vectorized:
+                zernike_radial_vectorized(r, l, m, dr).block_until_ready()
+            else:
+                zernike_radial(r[:, np.newaxis], l, m, dr).block_until_ready()
+
+    run()  # compile
+    benchmark.pedantic(run, iterations=1, rounds=20)
+
+
+@pytest.mark.benchmark()
+@pytest.mark.parametrize("kernel", ["hh", "quad"])
+@pytest.mark.parametrize("kind", ["double", "single"])
+def test_biot_savart_precision(benchmark, kernel, kind):
+    """Test time and accuracy of biot-savart kernels in double vs single precision."""
+    s = np.linspace(0, 2 * np.pi, 256, endpoint=False)
+    coil = np.array([10 + 2 * np.cos(s), np.zeros_like(s), 2 * np.sin(s)]).T
+    tangents = np.array([-2 * np.sin(s), np.zeros_like(s), 2 * np.cos(s)]).T
+    tangents *= s[1]
+    x = np.random.default_rng(0).random((20000, 3)) + [[9.5, -0.5, -0.5]]
+
+    def run():
+        if kernel == "hh":
+            B = biot_savart_hh(x, coil, np.roll(coil, -1, axis=0), 1e6)
+        else:
+            B = biot_savart_quad(x, coil, tangents, 1e6)
+        return B.block_until_ready()
+
+    B = run()
+    with precision(kind):
+        B_kind = run()  # compile
+        benchmark.pedantic(run, iterations=1, rounds=20)
+    error = np.linalg.norm(B_kind - B, axis=-1) / np.linalg.norm(B, axis=-1)
+    benchmark.extra_info["max relative error"] = float(error.max())
+
+
 @pytest.mark.benchmark()
 def test_equilibrium_init_lowres(benchmark):
     """Test time to create an equilibrium for low resolution."""
@@ -135,6 +220,35 @@ def test_equilibrium_init_highres(benchmark):
     benchmark.pedantic(build, setup=setup, iterations=1, rounds=20)
 
 
+@pytest.mark.benchmark()
+def test_compute_trace_local_quantities(benchmark):
+    """Test time to trace eq.compute for several hundred local quantities."""
+    eq = Equilibrium(L=4, M=4, N=2)
+    grid = LinearGrid(L=4, M=4, N=2, NFP=eq.NFP)
+    p = "desc.equilibrium.equilibrium.Equilibrium"
+    names = [
+        name
+        for name, val in data_index[p].items()
+        if val["coordinates"] == "rtz"
+        and not val["resolution_requirement"]
+        and not val["grid_requirement"]
+        and not val["source_grid_requirement"]
+        and not val["dependencies"]["kwargs"]
+    ]
+    params = get_params(names, eq)
+    transforms = get_transforms(names, eq, grid)
+    profiles = get_profiles(names, eq, grid)
+
+    def setup():
+        jax.clear_caches()
+
+    def trace():
+        fun = lambda params: compute_fun(eq, names, params, transforms, profiles)
+        jax.jit(fun).lower(params)
+
+    benchmark.pedantic(trace, setup=setup, iterations=1, rounds=5)
+
+
 @pytest.mark.slow
 @pytest.mark.benchmark
 def test_objective_compile_dshape_current(benchmark):
@@ -86,6 +86,10 @@ if __name__ == "__main__":
         "test_proximal_freeb_jac_batched",
         "test_proximal_jac_ripple",
         "test_proximal_jac_ripple_spline",
+        "test_compute_force_balance_w7x",
+        "test_compute_force_balance_w7x_evict",
+        "test_compute_qs_two_term_w7x",
+        "test_compute_qs_two_term_w7x_evict",
     ]
 
     for i in range(len(funs)):
@@ -203,6 +203,44 @@ def _test_proximal_ripple(spline, method):
         _ = getattr(prox, method)(x, prox.constants).block_until_ready()
 
 
+@pytest.mark.memory
+def test_compute_force_balance_w7x():
+    """Benchmark computing force balance quantities."""
+    _test_compute_w7x(ForceBalance, False)
+
+
+@pytest.mark.memory
+def test_compute_force_balance_w7x_evict():
+    """Benchmark computing force balance quantities evicting intermediates."""
+    _test_compute_w7x(ForceBalance, True)
+
+
+@pytest.mark.memory
+def test_compute_qs_two_term_w7x():
+    """Benchmark computing quasisymmetry quantities."""
+    _test_compute_w7x(QuasisymmetryTwoTerm, False)
+
+
+@pytest.mark.memory
+def test_compute_qs_two_term_w7x_evict():
+    """Benchmark computing quasisymmetry quantities evicting intermediates."""
+    _test_compute_w7x(QuasisymmetryTwoTerm, True)
+
+
+def _test_compute_w7x(objective, evict):
+    jax.clear_caches()
+    gc.collect()
+    eq = desc.examples.get("W7-X")
+    obj = objective(eq)
+    obj.build(verbose=0)
+    for _ in range(3):
+        data = eq.compute(
+            obj._data_keys, grid=obj.constants["transforms"]["grid"], evict=evict
+        )
+        del data
+        gc.collect()
+
+
 if __name__ == "__main__":
     func = str(sys.argv[1])
     print(f"Running {func}...")
@@ -222,5 +260,13 @@ if __name__ == "__main__":
         test_proximal_jac_ripple()
     elif func == "test_proximal_jac_ripple_spline":
         test_proximal_jac_ripple_spline()
+    elif func == "test_compute_force_balance_w7x":
+        test_compute_force_balance_w7x()
+    elif func == "test_compute_force_balance_w7x_evict":
+        test_compute_force_balance_w7x_evict()
+    elif func == "test_compute_qs_two_term_w7x":
+        test_compute_qs_two_term_w7x()
+    elif func == "test_compute_qs_two_term_w7x_evict":
+        test_compute_qs_two_term_w7x_evict()
     else:
         print(f"Invalid function name {func}.")
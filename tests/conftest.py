@@ -27,6 +27,7 @@ from desc.magnetic_fields import (
     ToroidalMagneticField,
     solve_regularized_surface_current,
 )
+from desc.objectives import ForceBalance, ObjectiveFunction
 from desc.vmec import VMECIO
 
 plt.rcParams.update({"figure.max_open_warning": 0})
@@ -508,3 +509,18 @@ def VMEC_save_asym(tmpdir_factory):
     )
     desc = Dataset(filename, mode="r")
     return vmec, desc, eq
+
+
+@pytest.fixture(scope="session")
+def FixedBoundaryReference():
+    """Fixed boundary equilibrium solved with lsq-exact, to compare other solvers."""
+    eq = Equilibrium(
+        L=8, M=8, N=0, pressure=np.array([1e4, 0, -1e4]), iota=np.array([1.0, 0, 0.5])
+    )
+    force = ObjectiveFunction(ForceBalance(eq))
+    force.build(verbose=0)
+    cost = force.compute_scalar(force.x(eq))
+    eq_solved, _ = eq.solve(
+        optimizer="lsq-exact", ftol=0, xtol=0, gtol=1e-8, verbose=0, copy=True
+    )
+    return {"eq": eq, "eq_solved": eq_solved, "initial_cost": cost}
@@ -3,7 +3,19 @@
 import numpy as np
 import pytest
 
-from desc.backend import _lstsq, jax, jnp, put, root, root_scalar, sign, vmap
+import desc
+from desc.backend import (
+    _lstsq,
+    jax,
+    jnp,
+    precision,
+    put,
+    reduced_precision,
+    root,
+    root_scalar,
+    sign,
+    vmap,
+)
 
 
 @pytest.mark.unit
@@ -140,3 +152,34 @@ def test_lstsq():
     np.testing.assert_allclose(
         _lstsq(A, b), np.linalg.lstsq(A, b, rcond=None)[0], rtol=1e-6
     )
+
+
+@pytest.mark.unit
+def test_precision():
+    """Test that the precision policy is applied to decorated kernels only."""
+    dtypes = []
+
+    @reduced_precision
+    @jax.jit
+    def kernel(x, y, n):
+        # record the dtype each time the kernel is traced
+        dtypes.append(x.dtype)
+        assert x.dtype == y.dtype
+        assert n.dtype == jnp.int64
+        return x * y
+
+    x = jnp.arange(3.0)
+    n = jnp.arange(3)
+    assert kernel(x, y=x, n=n).dtype == jnp.float64
+    with precision("single"):
+        assert desc.config["precision"] == "single"
+        # output is cast back to double precision
+        assert kernel(x, y=x, n=n).dtype == jnp.float64
+        # everything else stays in double precision
+        assert (x * x).dtype == jnp.float64
+    assert desc.config["precision"] == "double"
+    assert kernel(x, y=x, n=n).dtype == jnp.float64
+    assert dtypes == [jnp.float64, jnp.float32]
+    with pytest.raises(ValueError):
+        with precision("half"):
+            pass
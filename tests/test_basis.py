@@ -22,6 +22,7 @@ from desc.basis import (
     zernike_radial,
     zernike_radial_coeffs,
     zernike_radial_poly,
+    zernike_radial_vectorized,
 )
 from desc.derivatives import Derivative
 from desc.grid import LinearGrid
@@ -209,9 +210,41 @@ class TestBasis:
             dr: zernike_radial_poly(r[:, np.newaxis], l, m, dr)
             for dr in range(max_dr + 1)
         }
+        radial_vectorized = {
+            dr: zernike_radial_vectorized(r, l, m, dr) for dr in range(max_dr + 3)
+        }
         for dr in range(max_dr + 1):
             np.testing.assert_allclose(radial[dr], desired[dr], err_msg=dr)
             np.testing.assert_allclose(radial_poly[dr], desired[dr], err_msg=dr)
+        # the vectorized recurrence supports derivatives of any order
+        desired[5] = np.array([Z3_1(r, 5), Z4_2(r, 5), Z6_2(r, 5), Z4_2(r, 5)]).T
+        desired[6] = np.array([Z3_1(r, 6), Z4_2(r, 6), Z6_2(r, 6), Z4_2(r, 6)]).T
+        for dr in range(max_dr + 3):
+            np.testing.assert_allclose(
+                radial_vectorized[dr], desired[dr], atol=1e-10, err_msg=dr
+            )
+
+    @pytest.mark.unit
+    def test_zernike_radial_vectorized(self):
+        """Test vectorized zernike radial against jacobi evaluation at high res."""
+        basis = ZernikePolynomial(L=50, M=50, spectral_indexing="ansi")
+        l, m = basis.modes[:, 0], basis.modes[:, 1]
+        r = np.linspace(0, 1, 41)
+        for dr in range(5):
+            np.testing.assert_allclose(
+                zernike_radial_vectorized(r, l, m, dr),
+                zernike_radial(r[:, np.newaxis], l, m, dr),
+                atol=1e-10,
+                rtol=1e-10,
+                err_msg=dr,
+            )
+        # derivatives wrt r through custom jvp
+        f = lambda r: zernike_radial_vectorized(r, l, m, 1).sum(axis=1)
+        np.testing.assert_allclose(
+            Derivative(f)(r).diagonal(),
+            zernike_radial(r[:, np.newaxis], l, m, 2).sum(axis=1),
+            rtol=1e-12,
+        )
 
     @pytest.mark.unit
     def test_fourier(self):
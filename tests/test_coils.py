@@ -7,7 +7,7 @@ import pytest
 import scipy
 import scipy.constants
 
-from desc.backend import jnp
+from desc.backend import jnp, precision
 from desc.coils import (
     CoilSet,
     FourierPlanarCoil,
@@ -351,6 +351,28 @@ class TestCoil:
                 atol=1e-12,
             )
 
+    @pytest.mark.unit
+    def test_biot_savart_single_precision(self):
+        """Test that biot-savart in single precision is close to double precision."""
+        coil_grid = LinearGrid(zeta=100, endpoint=False)
+        grid_xyz = np.random.default_rng(0).random((50, 3)) + [[9.5, -0.5, -0.5]]
+        coil = FourierXYZCoil(1e7)
+        spline = SplineXYZCoil(
+            1e7, *coil.compute("x", grid=coil_grid, basis="xyz")["x"].T
+        )
+        for c in [coil, spline]:
+            for fun in [c.compute_magnetic_field, c.compute_magnetic_vector_potential]:
+                f = lambda: fun(grid_xyz, basis="xyz", source_grid=coil_grid)
+                B = f()
+                with precision("single"):
+                    B32 = f()
+                # output is cast back to double precision
+                assert B32.dtype == B.dtype == np.float64
+                assert not np.all(B32 == B)
+                np.testing.assert_allclose(B32, B, rtol=1e-5, atol=1e-5 * abs(B).max())
+                # previously compiled double precision kernel is not reused
+                np.testing.assert_allclose(f(), B, rtol=1e-14)
+
     @pytest.mark.unit
     def test_properties(self):
         """Test getting/setting attributes for Coil class."""
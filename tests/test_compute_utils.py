@@ -1,11 +1,23 @@
 """Tests compute utilities."""
 
+import json
+
 import jax
 import numpy as np
 import pytest
 
 from desc.backend import jnp
+from desc.compute import (
+    ComputeProfiler,
+    data_index,
+    get_data_deps,
+    get_profiles,
+    get_transforms,
+)
 from desc.compute.geom_utils import rotation_matrix
+from desc.compute.utils import _compute, _get_compute_plan, _get_evictions
+from desc.examples import get
+from desc.grid import LinearGrid
 
 
 @pytest.mark.unit
@@ -18,3 +30,104 @@ def test_rotation_matrix():
     np.testing.assert_allclose(rotation_matrix(x0), np.eye(3))
     np.testing.assert_allclose(dfdx_fwd(x0), np.zeros((3, 3, 3)))
     np.testing.assert_allclose(dfdx_rev(x0), np.zeros((3, 3, 3)))
+
+
+@pytest.mark.unit
+def test_compute_plan():
+    """Test that compute plans are topologically sorted and cached."""
+    p = "desc.equilibrium.equilibrium.Equilibrium"
+    names = ("|B|", "J", "e^rho")
+    for has_axis in [False, True]:
+        plan = _get_compute_plan(p, names, has_axis, frozenset())
+        assert len(plan) == len(set(plan))
+        assert set(names).issubset(plan)
+        assert set(plan).issubset(
+            set(names).union(get_data_deps(list(names), p, has_axis=has_axis))
+        )
+        computed = set()
+        for name in plan:
+            deps = data_index[p][name]["dependencies"]
+            deps = deps["data"] + (deps["axis_limit_data"] if has_axis else [])
+            assert computed.issuperset(deps), name
+            computed.add(name)
+            # aliases also store their primary quantity
+            computed.update(
+                getattr(data_index[p][name]["fun"], "keywords", {}).values()
+            )
+
+    # quantities already computed should not be recomputed
+    plan = _get_compute_plan(p, names, False, frozenset(["B"]))
+    assert "B" not in plan
+
+    hits = _get_compute_plan.cache_info().hits
+    _ = _get_compute_plan(p, names, False, frozenset())
+    assert _get_compute_plan.cache_info().hits == hits + 1
+
+
+@pytest.mark.unit
+def test_compute_evict():
+    """Test that evicting intermediate quantities does not change results."""
+    p = "desc.equilibrium.equilibrium.Equilibrium"
+    names = ("|B|", "J", "e^rho")
+    plan = _get_compute_plan(p, names, True, frozenset(["R"]))
+    evictions = _get_evictions(p, names, True, frozenset(["R"]))
+    assert len(evictions) == len(plan)
+    dropped = set()
+    for name, dead in zip(plan, evictions):
+        deps = data_index[p][name]["dependencies"]
+        assert dropped.isdisjoint(deps["data"] + deps["axis_limit_data"]), name
+        dropped.update(dead)
+    assert dropped.isdisjoint(names)
+    assert "R" not in dropped
+
+    eq = get("DSHAPE")
+    grid = LinearGrid(L=3, M=3, N=0, axis=True)
+    data = eq.compute(list(names), grid=grid)
+    data_evict = eq.compute(list(names), grid=grid, evict=True)
+    assert set(data_evict.keys()) == set(names)
+    for name in names:
+        np.testing.assert_allclose(data_evict[name], data[name], err_msg=name)
+
+
+@pytest.mark.unit
+def test_compute_profiler(tmp_path):
+    """Test that the profiler records every computed quantity."""
+    eq = get("DSHAPE")
+    profiler = ComputeProfiler()
+    # default grid has full resolution, so nothing is computed on other grids
+    data = eq.compute(["|B|", "R"], profiler=profiler)
+    computed = set(data.keys()) - set(eq.params_dict)
+    assert computed.issuperset(profiler.records)
+    assert {"|B|", "R", "R_r"}.issubset(profiler.records)
+    for name, record in profiler.records.items():
+        assert record["count"] == 1
+        assert record["time"] > 0
+        assert record["size"] == data[name].size
+    assert profiler.records["|B|^2"]["flops"] > 0
+    assert profiler.records["|B|"]["bytes accessed"] > 0
+
+    report = profiler.report(sort="flops", num=3).splitlines()
+    assert len(report) == 4
+    flops = [profiler.records[line.split()[0]]["flops"] for line in report[1:]]
+    assert flops == sorted(flops, reverse=True)
+    with pytest.raises(ValueError):
+        profiler.report(sort="foo")
+
+    profiler.to_chrome_trace(tmp_path / "trace.json")
+    with open(tmp_path / "trace.json") as f:
+        trace = json.load(f)
+    assert {e["name"] for e in trace["traceEvents"]} == set(profiler.records)
+
+    # under JIT only the cost estimates are recorded
+    profiler = ComputeProfiler()
+    grid = LinearGrid(L=3, M=3, N=0)
+    transforms = get_transforms("|B|", eq, grid)
+    profiles = get_profiles("|B|", eq, grid)
+    jax.jit(
+        lambda params: _compute(
+            eq, "|B|", params, transforms, profiles, profiler=profiler
+        )["|B|"]
+    )(eq.params_dict)
+    assert profiler.records["|B|"]["time"] == 0
+    assert profiler.records["|B|^2"]["flops"] > 0
+    assert not profiler.events
@@ -1,12 +1,18 @@
 """Tests for things related to data_index."""
 
 import inspect
+import os
 import re
 
 import pytest
 
 import desc.compute
-from desc.compute import data_index
+from desc.compute import (
+    _build_data_index,
+    _data_index_cache_path,
+    _load_data_index,
+    data_index,
+)
 from desc.compute.data_index import _class_inheritance
 from desc.utils import errorif, getsource
 
@@ -136,3 +142,41 @@ def test_data_index_deps():
                 assert queried_deps[p][name]["data"] == data | axis_limit_data, err_msg
             assert queried_deps[p][name]["profiles"] == profiles, err_msg
             assert queried_deps[p][name]["params"] == params, err_msg
+
+
+@pytest.mark.unit
+def test_data_index_cache(tmp_path, monkeypatch):
+    """Test that cached full dependencies match the ones built from scratch."""
+    monkeypatch.setitem(desc.config, "cache_dir", str(tmp_path))
+    path = _data_index_cache_path()
+    assert path.startswith(str(tmp_path)) and not os.path.exists(path)
+    expected = {
+        p: {
+            key: (
+                data_index[p][key]["full_dependencies"],
+                data_index[p][key]["full_with_axis_dependencies"],
+            )
+            for key in data_index[p]
+        }
+        for p in data_index
+    }
+
+    # no cache yet, so this should build the tables and save them
+    _build_data_index()
+    assert os.path.exists(path)
+    for p in data_index:
+        for key in data_index[p]:
+            data_index[p][key]["full_dependencies"] = None
+            data_index[p][key]["full_with_axis_dependencies"] = None
+    assert _load_data_index(path)
+    for p in data_index:
+        for key, (full, full_with_axis) in expected[p].items():
+            assert data_index[p][key]["full_dependencies"] == full
+            assert data_index[p][key]["full_with_axis_dependencies"] == full_with_axis
+
+    # a corrupt cache should be ignored and rebuilt
+    with open(path, "wb") as f:
+        f.write(b"not a cache")
+    assert not _load_data_index(path)
+    _build_data_index()
+    assert _load_data_index(path)
@@ -458,3 +458,18 @@ def test_assigning_profile_iota_current():
     with pytest.warns(UserWarning, match="existing toroidal"):
         eq.iota = PowerSeriesProfile()
     assert eq.current is None
+
+
+@pytest.mark.unit
+def test_compute_stacked_params():
+    """Test that a list of params gives the same results as one at a time."""
+    eq = get("DSHAPE")
+    params = [eq.params_dict, {k: 1.01 * v for k, v in eq.params_dict.items()}]
+    grid = LinearGrid(L=4, M=4, N=0)
+    names = ["|B|", "<|B|>_vol", "iota"]
+    data = eq.compute(names, grid=grid, params=params)
+    for i, p in enumerate(params):
+        data_i = eq.compute(names, grid=grid, params=p)
+        for name in names:
+            assert data[name].shape == (2, *data_i[name].shape)
+            np.testing.assert_allclose(data[name][i], data_i[name], rtol=1e-10)
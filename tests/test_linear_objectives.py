@@ -5,7 +5,7 @@ import pytest
 from qsc import Qsc
 
 import desc.examples
-from desc.backend import jnp, put
+from desc.backend import jit, jnp, put
 from desc.equilibrium import Equilibrium
 from desc.geometry import FourierRZToroidalSurface
 from desc.io import load
@@ -357,6 +357,75 @@ def test_factorize_linear_constraints_asserts():
         _ = factorize_linear_constraints(objective, constraint)
 
 
+@pytest.mark.unit
+def test_factorize_linear_constraints_sparse():
+    """Test that the sparse factorization is equivalent to the dense SVD."""
+    eq = desc.examples.get("W7-X")
+    with pytest.warns(UserWarning, match="Reducing radial"):
+        eq.change_resolution(3, 3, 3, 6, 6, 6)
+    objective = ObjectiveFunction(ForceBalance(eq=eq))
+    objective.build()
+    constraints = maybe_add_self_consistency(
+        eq, get_fixed_boundary_constraints(eq=eq)
+    ) + (
+        FixSumModesR(eq=eq, modes=np.array([[1, 1, 1], [2, 2, 2]])),
+        FixSumModesLambda(eq=eq, modes=np.array([[1, 1, -1], [2, 2, -2]])),
+    )
+    constraint = ObjectiveFunction(constraints)
+    constraint.build()
+
+    xp1, A1, b1, Z1, D1, unfixed_idx1, project1, recover1, Ainv1, *_ = (
+        factorize_linear_constraints(objective, constraint)
+    )
+    xp2, A2, b2, Z2, D2, unfixed_idx2, project2, recover2, Ainv2, *_ = (
+        factorize_linear_constraints(objective, constraint, factorization="sparse")
+    )
+    np.testing.assert_allclose(xp1, xp2, atol=1e-14)
+    np.testing.assert_allclose(A1, A2)
+    np.testing.assert_allclose(b1, b2)
+    np.testing.assert_allclose(D1, D2)
+    np.testing.assert_array_equal(unfixed_idx1, unfixed_idx2)
+    np.testing.assert_allclose(Ainv1, Ainv2.todense(), atol=1e-14)
+    # null space is stored as a sparse operator
+    assert Z1.shape == Z2.shape
+    assert Z2.vals.size < Z2.shape[0] * Z2.shape[1] / 10
+    Z2d = Z2.todense()
+    y = np.random.default_rng(0).random(Z2.shape[1])
+    v = np.random.default_rng(1).random((Z2.shape[0], 3))
+    np.testing.assert_allclose(Z2 @ y, Z2d @ y, atol=1e-14)
+    np.testing.assert_allclose(v.T @ Z2, v.T @ Z2d, atol=1e-14)
+    np.testing.assert_allclose(Z2.T @ v, Z2d.T @ v, atol=1e-14)
+    np.testing.assert_allclose((Z2 * v[:, :1]).todense(), Z2d * v[:, :1])
+    np.testing.assert_allclose(Z2.column_norms(), np.linalg.norm(Z2d, axis=0))
+    np.testing.assert_allclose(jit(lambda Z, y: Z @ y)(Z2, y), Z2d @ y)
+    # same null space, with a different orthonormal basis
+    np.testing.assert_allclose(A2 @ Z2d, 0, atol=1e-14)
+    np.testing.assert_allclose(Z2d.T @ Z2d, np.eye(Z2.shape[1]), atol=1e-14)
+    np.testing.assert_allclose(Z1 @ Z1.T, Z2d @ Z2d.T, atol=1e-13)
+    x = recover1(project1(objective.x(eq)))
+    np.testing.assert_allclose(recover2(project2(x)), x, atol=1e-14)
+
+    lcp1 = LinearConstraintProjection(objective, constraint)
+    lcp1.build()
+    lcp2 = LinearConstraintProjection(objective, constraint, factorization="sparse")
+    lcp2.build()
+    np.testing.assert_allclose(
+        lcp2.compute_scaled_error(lcp2.x(eq)),
+        objective.compute_scaled_error(x),
+        atol=1e-12,
+    )
+    # derivatives are the same up to the change of basis of the null space
+    x1, x2 = lcp1.x(eq), lcp2.x(eq)
+    Q = lcp1._Z.T @ Z2d
+    np.testing.assert_allclose(
+        lcp1.jac_scaled_error(x1) @ Q, lcp2.jac_scaled_error(x2), atol=1e-10
+    )
+    np.testing.assert_allclose(lcp1.grad(x1) @ Q, lcp2.grad(x2), atol=1e-10)
+
+    with pytest.raises(ValueError):
+        _ = factorize_linear_constraints(objective, constraint, factorization="qr")
+
+
 @pytest.mark.unit
 def test_build_init():
     """Ensure that passing an equilibrium to init builds the objective correctly.
@@ -1154,6 +1223,59 @@ def test_linearconstraintprojection_update_target():
     np.testing.assert_allclose(lc._unfixed_idx_mat, lcp._unfixed_idx_mat)
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize("factorization", ["svd", "sparse"])
+def test_factorize_linear_constraints_cache(monkeypatch, factorization):
+    """Test that factorizations are reused when only the targets change."""
+    import desc.objectives.utils as objective_utils
+
+    calls = []
+    for name in ["svd_inv_null", "block_svd_inv_null"]:
+        fun = getattr(objective_utils, name)
+        monkeypatch.setattr(
+            objective_utils,
+            name,
+            lambda A, fun=fun: calls.append(A.shape) or fun(A),
+        )
+    monkeypatch.setitem(desc.config, "factorization_cache_size", 2)
+    monkeypatch.setattr(
+        objective_utils, "_factorization_cache", objective_utils.OrderedDict()
+    )
+
+    def factorize(eq):
+        objective = ObjectiveFunction(ForceBalance(eq))
+        objective.build()
+        constraint = ObjectiveFunction(
+            maybe_add_self_consistency(eq, get_fixed_boundary_constraints(eq))
+        )
+        constraint.build()
+        return factorize_linear_constraints(
+            objective, constraint, factorization=factorization
+        )
+
+    eq = Equilibrium(L=3, M=3, N=1, pressure=np.array([1e3, 0, -1e3]))
+    eqp = eq.copy()
+    eqp.Rb_lmn = put(eqp.Rb_lmn, 0, eqp.Rb_lmn[0] + 1e-3)
+    eqp.p_l = eqp.p_l / 2
+
+    xp1, _, _, Z1, *_ = factorize(eq)
+    xp2, _, _, Z2, *_ = factorize(eqp)
+    assert len(calls) == 1
+    monkeypatch.setitem(desc.config, "factorization_cache_size", 0)
+    xp3, _, _, Z3, *_ = factorize(eqp)
+    assert len(calls) == 2
+    np.testing.assert_allclose(xp2, xp3)
+    assert not np.allclose(xp1, xp2)
+    if factorization == "sparse":
+        Z2, Z3 = Z2.todense(), Z3.todense()
+    np.testing.assert_allclose(Z2, Z3)
+
+    # a different constraint structure is factorized again
+    monkeypatch.setitem(desc.config, "factorization_cache_size", 2)
+    factorize(Equilibrium(L=3, M=3, N=2))
+    assert len(calls) == 3
+
+
 @pytest.mark.unit
 def test_NAE_asym_with_sym_axis():
     """Test that asym NAE constraints are correct when axis is sym."""
@@ -6,7 +6,11 @@ that is done in test_compute_functions or regression tests.
 This module primarily tests the constructing/building/calling methods.
 """
 
+import os
 import platform
+import re
+import subprocess
+import sys
 import warnings
 
 import numpy as np
@@ -26,6 +30,7 @@ from desc.coils import (
     initialize_modular_coils,
 )
 from desc.compute import get_transforms
+from desc.derivatives import Derivative
 from desc.equilibrium import Equilibrium
 from desc.examples import get
 from desc.geometry import FourierPlanarCurve, FourierRZToroidalSurface, FourierXYZCurve
@@ -59,6 +64,7 @@ from desc.objectives import (
     Elongation,
     Energy,
     ExternalObjective,
+    FixCoilCurrent,
     ForceBalance,
     ForceBalanceAnisotropic,
     FusionPower,
@@ -100,7 +106,8 @@ from desc.objectives.nae_utils import (
 )
 from desc.objectives.normalization import compute_scaling_factors
 from desc.objectives.objective_funs import _Objective, collect_docs
-from desc.objectives.utils import softmax, softmin
+from desc.objectives.utils import color_columns, softmax, softmin
+from desc.optimize import LinearConstraintProjection
 from desc.profiles import FourierZernikeProfile, PowerSeriesProfile
 from desc.utils import PRINT_WIDTH, safenorm
 from desc.vmec_utils import ptolemy_linear_transform
@@ -164,6 +171,32 @@ class TestObjectiveFunction:
         grid = LinearGrid(2, 2, 2)
         test(eq, grid)
 
+    @pytest.mark.unit
+    def test_external_objective_max_workers(self, tmp_path):
+        """Test ExternalObjective with finite differences in a worker pool."""
+
+        def myfun(eq, scratch_dir=None):
+            if scratch_dir is not None:
+                assert os.path.isdir(scratch_dir)
+            return np.atleast_1d(eq.compute("<beta>_vol")["<beta>_vol"])
+
+        eq = Equilibrium(pressure=np.array([1e3, 0, -1e3]), iota=np.array([1, 0, 0.5]))
+        obj1 = ObjectiveFunction(ExternalObjective(eq, fun=myfun, dim_f=1))
+        obj2 = ObjectiveFunction(
+            ExternalObjective(
+                eq, fun=myfun, dim_f=1, max_workers=4, scratch_dir=tmp_path
+            )
+        )
+        obj1.build()
+        obj2.build()
+        x = obj1.x(eq)
+        np.testing.assert_allclose(obj1.compute_scaled(x), obj2.compute_scaled(x))
+        np.testing.assert_allclose(obj1.jac_scaled(x), obj2.jac_scaled(x))
+        assert len(os.listdir(tmp_path)) == 4
+        # rebuilding shuts down the previous pool and makes a new one
+        obj2.build()
+        np.testing.assert_allclose(obj1.jac_scaled(x), obj2.jac_scaled(x))
+
     @pytest.mark.unit
     def test_linear_objective_from_user(self):
         """Test LinearObjectiveFromUser for arbitrary callable."""
@@ -2045,6 +2078,206 @@ def test_derivative_modes():
     assert obj3.objectives[1]._jac_chunk_size == obj3._jac_chunk_size
 
 
+@pytest.mark.unit
+def test_sparse_jacobian():
+    """Test Jacobians computed with sparsity detection and column coloring."""
+    coil = FourierPlanarCoil()
+    coil.change_resolution(N=2)
+    coils = CoilSet.linspaced_angular(coil, n=6)
+
+    def build(deriv_mode):
+        obj = ObjectiveFunction(
+            (CoilLength(coils), CoilCurvature(coils)), deriv_mode=deriv_mode
+        )
+        obj.build()
+        return obj
+
+    obj1 = build("batched")
+    obj2 = build("sparse")
+    # each row only depends on the parameters of one coil
+    assert obj2._jac_num_colors <= obj2.dim_x // len(coils)
+    x = obj1.x(coils)
+    np.testing.assert_allclose(obj1.jac_scaled_error(x), obj2.jac_scaled_error(x))
+    np.testing.assert_allclose(obj1.jac_unscaled(x), obj2.jac_unscaled(x))
+    np.testing.assert_allclose(
+        obj1.jac_scaled_error(x), obj2.jac_sparse(x).todense(), atol=1e-14
+    )
+    with pytest.raises(ValueError, match="deriv_mode='sparse'"):
+        obj1.jac_sparse(x)
+
+    con = ObjectiveFunction(FixCoilCurrent(coils))
+    lcp1 = LinearConstraintProjection(obj1, con)
+    lcp2 = LinearConstraintProjection(obj2, con)
+    lcp1.build()
+    lcp2.build()
+    y = lcp1.x(coils)
+    np.testing.assert_allclose(
+        lcp1.jac_scaled_error(y), lcp2.jac_scaled_error(y), atol=1e-12
+    )
+
+    # the z coordinate of a coil in the xy plane is zero, so the derivative of the
+    # where is zero at the build point, and NaN tangents don't get through it
+    def fun(grid, data):
+        z = data["x"][:, 2]
+        return jnp.where(z > 0, z, 0.0)
+
+    coil = FourierPlanarCoil(normal=[0, 0, 1])
+    obj1, obj2 = (
+        ObjectiveFunction(
+            ObjectiveFromUser(fun, coil, grid=LinearGrid(N=8)), deriv_mode=deriv_mode
+        )
+        for deriv_mode in ["batched", "sparse"]
+    )
+    obj1.build()
+    obj2.build()
+    tilted = coil.copy()
+    tilted.normal = [0.2, 0.1, 1.0]
+    x = obj1.x(tilted)
+    assert np.any(obj1.jac_unscaled(x) != 0)
+    np.testing.assert_allclose(obj1.jac_unscaled(x), obj2.jac_unscaled(x))
+
+
+@pytest.mark.unit
+def test_hvp():
+    """Test Hessian-vector products against the full Hessian."""
+    coils = CoilSet.linspaced_angular(FourierPlanarCoil(r_n=[0, 0.3, 0.1]), n=2)
+    obj = ObjectiveFunction((CoilLength(coils), CoilCurvature(coils)))
+    obj.build()
+    rng = np.random.default_rng(0)
+    x = obj.x(coils)
+    v = rng.random(x.size)
+    np.testing.assert_allclose(obj.hvp(v, x), obj.hess(x) @ v, atol=1e-10)
+
+    lcp = LinearConstraintProjection(obj, ObjectiveFunction(FixCoilCurrent(coils)))
+    lcp.build()
+    y = lcp.x(coils)
+    w = rng.random(y.size)
+    H = Derivative(lcp.grad, 0, "fwd")(y)
+    np.testing.assert_allclose(lcp.hvp(w, y), H @ w, atol=1e-10)
+
+
+@pytest.mark.unit
+def test_jac_chunk_size_auto(tmp_path, monkeypatch):
+    """Test jac_chunk_size="auto" measures memory usage and caches the result."""
+    monkeypatch.setitem(desc.config, "cache_dir", str(tmp_path))
+    monkeypatch.setitem(desc.config, "jac_mem_budget", 2e-4)
+    coils = CoilSet.linspaced_angular(FourierPlanarCoil(r_n=[0, 0.3, 0.1]), n=2)
+
+    obj1 = ObjectiveFunction(CoilCurvature(coils), jac_chunk_size=None)
+    obj2 = ObjectiveFunction(CoilCurvature(coils))
+    obj1.build()
+    obj2.build()
+    # the full Jacobian doesn't fit in the budget but a single column does
+    assert 1 < obj2._jac_chunk_size < obj2.dim_x
+    x = obj1.x(coils)
+    np.testing.assert_allclose(obj1.jac_scaled_error(x), obj2.jac_scaled_error(x))
+
+    def search(*args, **kwargs):
+        raise AssertionError("jac_chunk_size should be cached")
+
+    monkeypatch.setattr(ObjectiveFunction, "_search_jac_chunk_size", search)
+    obj3 = ObjectiveFunction(CoilCurvature(coils))
+    obj3.build()
+    assert obj3._jac_chunk_size == obj2._jac_chunk_size
+
+
+@pytest.mark.unit
+def test_compilation_cache(tmp_path):
+    """Test that a second process loads the compiled objective from the cache."""
+    script = (
+        "from desc.coils import FourierPlanarCoil\n"
+        "from desc.objectives import CoilCurvature, ObjectiveFunction\n"
+        "obj = ObjectiveFunction(CoilCurvature(FourierPlanarCoil()))\n"
+        "obj.build(verbose=0)\n"
+        "obj.compile(mode='lsq')\n"
+    )
+    env = dict(
+        os.environ,
+        DESC_CACHE_DIR=str(tmp_path),
+        DESC_COMPILATION_CACHE="1",
+        PYTHONPATH=os.pathsep.join(
+            [os.path.dirname(os.path.dirname(desc.__file__))]
+            + os.environ.get("PYTHONPATH", "").split(os.pathsep)
+        ),
+    )
+
+    def run():
+        out = subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        hits, misses = re.search(
+            r"Compilation cache: (\d+) hits, (\d+) misses", out
+        ).groups()
+        return int(hits), int(misses)
+
+    hits, misses = run()
+    # compute_scaled_error and jac_scaled_error
+    assert misses >= 2
+    hits, misses = run()
+    assert hits >= 2
+    assert misses == 0
+
+
+@pytest.mark.unit
+def test_export(tmp_path):
+    """Test exporting an objective and evaluating it without DESC objectives."""
+    pytest.importorskip("absl")
+    pytest.importorskip("flatbuffers")
+    from desc.export import load_exported
+
+    coils = CoilSet.linspaced_angular(FourierPlanarCoil(), n=3)
+    obj = LinearConstraintProjection(
+        ObjectiveFunction(CoilCurvature(coils)),
+        ObjectiveFunction(FixCoilCurrent(coils)),
+    )
+    obj.build()
+    path = str(tmp_path / "objective.npz")
+    obj.export(path)
+
+    exported = load_exported(path)
+    assert exported.dim_x == obj.x().size
+    assert exported.dim_f == obj.dim_f
+    x = exported.x0 + 1e-2
+    np.testing.assert_allclose(
+        exported.compute_scaled_error(x), obj.compute_scaled_error(x)
+    )
+    np.testing.assert_allclose(exported.jac_scaled_error(x), obj.jac_scaled_error(x))
+
+    script = (
+        "import sys\n"
+        "from desc.export import load_exported\n"
+        f"obj = load_exported({path!r})\n"
+        "obj.jac_scaled_error(obj.x0 + obj.compute_scaled_error(obj.x0).sum())\n"
+        "assert 'desc.objectives' not in sys.modules\n"
+    )
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(
+            [os.path.dirname(os.path.dirname(desc.__file__))]
+            + os.environ.get("PYTHONPATH", "").split(os.pathsep)
+        ),
+    )
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
+
+
+@pytest.mark.unit
+def test_export_old_jax(monkeypatch, tmp_path):
+    """Test that exporting gives a clear error with versions of jax before 0.4.30."""
+    import jax
+
+    coils = CoilSet.linspaced_angular(FourierPlanarCoil(), n=2)
+    obj = ObjectiveFunction(CoilCurvature(coils))
+    obj.build()
+    monkeypatch.delattr(jax, "export", raising=False)
+    monkeypatch.setitem(sys.modules, "jax.export", None)
+    with pytest.raises(ImportError, match="jax>=0.4.30"):
+        obj.export(tmp_path / "obj.npz")
+
+
 @pytest.mark.unit
 def test_fwd_rev():
     """Test that forward and reverse mode jvps etc give same results."""
@@ -2798,6 +3031,54 @@ def test_vjp():
     np.testing.assert_allclose(vjp1s, vjp2s, atol=1e-8)
 
 
+@pytest.mark.unit
+def test_fused_objectives():
+    """Test that sub-objectives on the same grid are fused without changing values."""
+    eq = get("HELIOTRON")
+    grid = LinearGrid(M=eq.M_grid, N=eq.N_grid, NFP=eq.NFP, rho=[0.5, 1.0])
+
+    def build(**kwargs):
+        objectives = (
+            ForceBalance(eq, grid=grid),
+            QuasisymmetryTwoTerm(eq, grid=grid, helicity=(1, eq.NFP)),
+            QuasisymmetryTwoTerm(eq, grid=grid, helicity=(1, 0)),
+            RotationalTransform(eq, grid=grid),
+            Energy(eq),
+        )
+        obj = ObjectiveFunction(objectives, **kwargs)
+        obj.build()
+        return obj
+
+    obj1 = build()
+    obj2 = build(fuse=True)
+    # fusing is opt in
+    assert obj1._fused_groups == []
+    assert build(fuse=False)._fused_groups == []
+    # QS two-term with different helicities can't share data, and Energy has its own
+    # grid, so only the first 2 objectives and the rotational transform get fused
+    assert len(obj2._fused_groups) == 1
+    assert obj2._fused_groups[0][0] == (0, 1, 3)
+    members = [obj2.objectives[i] for i in (0, 1, 3)]
+    transforms = members[0].constants["transforms"]
+    assert all(obj.constants["transforms"] is transforms for obj in members)
+    assert obj2.objectives[2].constants["transforms"] is not transforms
+
+    x = obj1.x(eq)
+    np.testing.assert_allclose(
+        obj1.compute_scaled_error(x), obj2.compute_scaled_error(x), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        obj1.jac_scaled_error(x), obj2.jac_scaled_error(x), rtol=1e-10, atol=1e-12
+    )
+    # sub-objectives still work on their own after being fused
+    for obj_1, obj_2 in zip(obj1.objectives, obj2.objectives):
+        np.testing.assert_allclose(
+            obj_1.compute_unscaled(*obj_1.xs(eq)),
+            obj_2.compute_unscaled(*obj_2.xs(eq)),
+            rtol=1e-12,
+        )
+
+
 @pytest.mark.unit
 def test_objective_target_bounds():
     """Test that the target_scaled and bounds_scaled etc. return the right things."""
@@ -2875,6 +3156,21 @@ def test_softmax_and_softmin():
     np.testing.assert_almost_equal(sftmin, np.min(arr))
 
 
+@pytest.mark.unit
+def test_color_columns():
+    """Test that columns of the same color don't share nonzero rows."""
+    # block diagonal with banded blocks, plus a dense column
+    block = np.array([[1, 1, 0, 0], [0, 1, 1, 0], [0, 0, 1, 1]], dtype=bool)
+    sparsity = np.kron(np.eye(5, dtype=bool), block)
+    sparsity = np.hstack([sparsity, np.ones((15, 1), dtype=bool)])
+    colors = color_columns(sparsity)
+    assert colors.max() + 1 == 3
+    for c in range(colors.max() + 1):
+        assert np.all(sparsity[:, colors == c].sum(axis=1) <= 1)
+    np.testing.assert_array_equal(color_columns(np.eye(4, dtype=bool)), 0)
+    np.testing.assert_array_equal(color_columns(np.ones((2, 3))), [0, 1, 2])
+
+
 @pytest.mark.unit
 def test_loss_function_asserts():
     """Test the checks on loss function for _Objective."""
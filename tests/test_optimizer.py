@@ -1,5 +1,6 @@
 """Tests for optimizers and Optimizer class."""
 
+import json
 import warnings
 
 import numpy as np
@@ -62,10 +63,11 @@ from desc.optimize import (
     fmintr,
     lsq_auglag,
     lsqtr,
+    lsqtr_multistart,
     optimizers,
     sgd,
 )
-from desc.utils import get_all_instances
+from desc.utils import copy_coeffs, get_all_instances
 
 
 @jit
@@ -173,6 +175,62 @@ class TestFmin:
         )
         np.testing.assert_allclose(out["x"], SCALAR_FUN_SOLN, atol=1e-8)
 
+    @pytest.mark.unit
+    def test_convex_hvp_cg(self):
+        """Test minimizing convex test function using Newton-CG with hvp."""
+        x0 = np.ones(2)
+
+        def hess(x):
+            raise AssertionError("Hessian should not be formed")
+
+        def hvp(v, x):
+            return scalar_hess(x) @ v
+
+        out = fmintr(
+            scalar_fun,
+            x0,
+            scalar_grad,
+            hess,
+            verbose=3,
+            x_scale="hess",
+            ftol=0,
+            xtol=0,
+            gtol=1e-12,
+            options={"tr_method": "cg"},
+            hvp=hvp,
+        )
+        np.testing.assert_allclose(out["x"], SCALAR_FUN_SOLN, atol=1e-8)
+        assert out["hess"] is None
+
+        # default hvp from autodiff of grad
+        def fun(x):
+            return jnp.sum(100 * (x[1:] - x[:-1] ** 2) ** 2 + (1 - x[:-1]) ** 2)
+
+        grad = jit(Derivative(fun, mode="grad"))
+        out = fmintr(
+            fun,
+            np.zeros(7),
+            grad,
+            hess,
+            bounds=(-1, 0.8),
+            verbose=3,
+            x_scale=1,
+            options={"tr_method": "cg"},
+        )
+        out2 = fmintr(
+            fun,
+            np.zeros(7),
+            grad,
+            jit(Derivative(fun, mode="hess")),
+            bounds=(-1, 0.8),
+            verbose=3,
+            x_scale=1,
+        )
+        np.testing.assert_allclose(out["x"], out2["x"], rtol=1e-4, atol=1e-4)
+
+        with pytest.raises(ValueError):
+            fmintr(scalar_fun, x0, scalar_grad, "bfgs", options={"tr_method": "cg"})
+
     @pytest.mark.slow
     @pytest.mark.unit
     def test_rosenbrock_bfgs_dogleg(self):
@@ -310,6 +368,249 @@ class TestLSQTR:
         )
         np.testing.assert_allclose(out["x"], p)
 
+    @pytest.mark.unit
+    def test_lsqtr_cg(self):
+        """Test minimizing least squares test function using matrix free CG."""
+        p = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0])
+        x = np.linspace(-1, 1, 100)
+        y = vector_fun(x, p)
+
+        def res(p):
+            return vector_fun(x, p) - y
+
+        rando = default_rng(seed=0)
+        p0 = p + 0.25 * (rando.random(p.size) - 0.5)
+
+        def jac(p):
+            raise AssertionError("Jacobian should not be formed")
+
+        def jvp(v, p):
+            return Derivative.compute_jvp(res, 0, v, p)
+
+        def vjp(u, p):
+            return Derivative.compute_vjp(res, 0, u, p)
+
+        out = lsqtr(
+            res,
+            p0,
+            jac,
+            verbose=3,
+            options={"tr_method": "cg"},
+            jvp=jvp,
+            vjp=vjp,
+        )
+        np.testing.assert_allclose(out["x"], p)
+        assert out["jac"] is None
+
+        # default jvp, vjp from autodiff of fun
+        bounds = (0.5, 3.5)
+        p0 = np.clip(p0, *bounds)
+        out = lsqtr(
+            res,
+            p0,
+            jac,
+            bounds=bounds,
+            ftol=1e-12,
+            xtol=1e-12,
+            gtol=1e-10,
+            verbose=3,
+            x_scale=1,
+            options={"tr_method": "cg"},
+        )
+        out2 = lsqtr(
+            res,
+            p0,
+            Derivative(res, 0, "fwd"),
+            bounds=bounds,
+            ftol=1e-12,
+            xtol=1e-12,
+            gtol=1e-10,
+            verbose=3,
+            x_scale=1,
+        )
+        np.testing.assert_allclose(out["x"], out2["x"], rtol=1e-5, atol=1e-5)
+
+    @pytest.mark.unit
+    def test_lsqtr_cg_precond(self):
+        """Test matrix free CG with a coarse grid preconditioner."""
+        from desc.optimize.tr_subproblems import trust_region_step_cg
+        from desc.optimize.utils import CoarseGridPreconditioner, MatrixFreeJacobian
+
+        # the first few columns are badly scaled, and span the coarse subspace
+        rando = default_rng(seed=1)
+        J = rando.standard_normal((40, 10)) * np.array([1e-3] * 4 + [1.0] * 6)
+        f = rando.standard_normal(40)
+        S = np.eye(10)[:, :4]
+        precond = CoarseGridPreconditioner.from_jac(S, J @ S)
+        J_mf = MatrixFreeJacobian(
+            lambda v, x: v @ J.T, lambda u, x: u @ J, np.zeros(10), (), J.shape
+        )
+        p_newton = np.linalg.lstsq(J, -f, rcond=None)[0]
+        args = (J.T @ f, J_mf, np.zeros(10), 1e6, None, 1e-12, 10)
+        p1 = trust_region_step_cg(*args)[0]
+        p2 = trust_region_step_cg(*args, precond=precond)[0]
+        assert np.linalg.norm(p1 - p_newton) > 1e-3 * np.linalg.norm(p_newton)
+        np.testing.assert_allclose(p2, p_newton, rtol=1e-8)
+
+        p = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0])
+        x = np.linspace(-1, 1, 100)
+        y = vector_fun(x, p)
+
+        def res(p):
+            return vector_fun(x, p) - y
+
+        p0 = p + 0.25 * (rando.random(p.size) - 0.5)
+        jac = Derivative(res, 0, "fwd")
+        S = np.eye(6)[:, :3]
+        ncalls = []
+
+        def cg_precond(p):
+            ncalls.append(p)
+            return CoarseGridPreconditioner.from_jac(S, jac(p) @ S)
+
+        out = lsqtr(
+            res,
+            p0,
+            jac,
+            verbose=3,
+            options={"tr_method": "cg", "cg_precond": cg_precond},
+        )
+        np.testing.assert_allclose(out["x"], p)
+        assert len(ncalls) == 1
+        ncalls.clear()
+        out = lsqtr(
+            res,
+            p0,
+            jac,
+            verbose=3,
+            options={
+                "tr_method": "cg",
+                "cg_precond": cg_precond,
+                "cg_precond_every": 2,
+            },
+        )
+        np.testing.assert_allclose(out["x"], p)
+        assert len(ncalls) > 1
+        with pytest.raises(ValueError, match="cg_precond"):
+            lsqtr(res, p0, jac, options={"cg_precond": cg_precond})
+
+    @pytest.mark.unit
+    def test_lsqtr_broyden(self):
+        """Test that Broyden updates reuse the Jacobian and find the same solution."""
+        p = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0])
+        x = np.linspace(-1, 1, 100)
+        y = vector_fun(x, p)
+
+        def res(p):
+            return vector_fun(x, p) - y
+
+        rando = default_rng(seed=0)
+        p0 = p + 0.25 * (rando.random(p.size) - 0.5)
+        jac = Derivative(res, 0, "fwd")
+
+        out1 = lsqtr(res, p0, jac, verbose=3)
+        out2 = lsqtr(res, p0, jac, verbose=3, options={"broyden_updates": 5})
+        np.testing.assert_allclose(out1["x"], p)
+        np.testing.assert_allclose(out2["x"], p)
+        assert out2["njev"] < out1["njev"]
+
+        with pytest.raises(ValueError):
+            lsqtr(
+                res,
+                p0,
+                jac,
+                options={"broyden_updates": 5, "tr_method": "cg"},
+            )
+
+    @pytest.mark.unit
+    def test_lsqtr_multistart(self):
+        """Test that a batch of initial guesses matches separate runs of lsqtr."""
+
+        def res(x, a):
+            return jnp.array([10 * (x[1] - x[0] ** 2), a - x[0], jnp.sin(3 * x[0])])
+
+        jac = Derivative(res, 0, "fwd")
+        x0 = 2 * default_rng(seed=0).normal(size=(6, 2))
+        tols = {"ftol": 1e-10, "xtol": 1e-10, "gtol": 1e-10}
+
+        for tr_method in ["qr", "svd", "cho"]:
+            out = lsqtr_multistart(
+                res,
+                x0,
+                jac,
+                args=(1.0,),
+                verbose=3,
+                options={"tr_method": tr_method},
+                **tols,
+            )
+            assert np.all(out["success_all"])
+            for i in range(x0.shape[0]):
+                outi = lsqtr(
+                    res,
+                    x0[i],
+                    jac,
+                    args=(1.0,),
+                    verbose=0,
+                    options={"tr_method": tr_method},
+                    **tols,
+                )
+                np.testing.assert_allclose(out["x_all"][i], outi["x"], rtol=1e-6)
+                np.testing.assert_allclose(out["cost_all"][i], outi["cost"])
+            # the starts fall in two basins, and the best one is returned
+            assert out["cost"] == np.min(out["cost_all"])
+            np.testing.assert_allclose(out["x"], out["x_all"][out["best"]])
+            assert np.ptp(out["cost_all"]) > 0.1
+
+
+@pytest.mark.unit
+def test_telemetry(tmp_path):
+    """Test that telemetry records each iteration to a file or a callable."""
+    p = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0])
+    x = np.linspace(-1, 1, 100)
+    y = vector_fun(x, p)
+
+    def res(p):
+        return vector_fun(x, p) - y
+
+    p0 = p + 0.25 * (default_rng(seed=0).random(p.size) - 0.5)
+    jac = Derivative(res, 0, "fwd")
+    path = tmp_path / "telemetry.jsonl"
+    out = lsqtr(res, p0, jac, verbose=0, options={"telemetry": path})
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == out["nit"] + 1
+    assert [rec["iteration"] for rec in records] == list(range(out["nit"] + 1))
+    assert records[-1]["method"] == "lsqtr"
+    assert records[-1]["nfev"] == out["nfev"]
+    np.testing.assert_allclose(records[-1]["cost"], out["cost"])
+    for key in ["fun", "jac", "factorize", "subproblem", "total"]:
+        assert records[-1]["time"][key] > 0
+    # without telemetry nothing is wrapped
+    out2 = lsqtr(res, p0, jac, verbose=0)
+    np.testing.assert_allclose(out["x"], out2["x"])
+
+    eq = Equilibrium(L=2, M=2, N=0, iota=np.array([1.0]))
+    objective = ObjectiveFunction(
+        (ForceBalance(eq), AspectRatio(eq, target=10, weight=1e-3))
+    )
+    for method in ["lsq-exact", "fmintr", "fmin-auglag"]:
+        records = []
+        Optimizer(method).optimize(
+            eq,
+            objective,
+            get_fixed_boundary_constraints(eq),
+            maxiter=2,
+            verbose=0,
+            options={"telemetry": records.append},
+            copy=True,
+        )
+        assert len(records) == 3
+        assert records[-1]["method"] == method
+        costs = records[-1]["objectives"]
+        assert set(costs) == {"force", "aspect ratio"}
+        if method == "lsq-exact":
+            np.testing.assert_allclose(sum(costs.values()), records[-1]["cost"])
+
 
 @pytest.mark.unit
 def test_no_iterations():
@@ -936,9 +1237,32 @@ def test_auglag():
         options={"initial_multipliers": "least_squares"},
     )
 
+    out5 = lsq_auglag(
+        vecfun,
+        x0,
+        jac,
+        bounds=(-jnp.inf, jnp.inf),
+        constraint=constraint,
+        args=(),
+        x_scale="auto",
+        ftol=0,
+        xtol=1e-8,
+        gtol=1e-8,
+        ctol=1e-8,
+        verbose=3,
+        maxiter=None,
+        options={
+            "initial_multipliers": "least_squares",
+            "tr_method": "cho",
+            "broyden_updates": 5,
+        },
+    )
+
     np.testing.assert_allclose(out1["x"], out3["x"], rtol=1e-4, atol=1e-4)
     np.testing.assert_allclose(out2["x"], out3["x"], rtol=1e-4, atol=1e-4)
     np.testing.assert_allclose(out4["x"], out3["x"], rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(out5["x"], out3["x"], rtol=1e-4, atol=1e-4)
+    assert out5["njev"] < out2["njev"]
 
 
 @pytest.mark.slow
@@ -1530,3 +1854,101 @@ def test_optimize_three_coil_at_once():
         np.testing.assert_allclose(c.shift, shift0)
         np.testing.assert_allclose(c.rotmat, rotmat0)
         np.testing.assert_allclose(c.compute("length")["length"], 13)
+
+
+@pytest.mark.regression
+@pytest.mark.slow
+@pytest.mark.solve
+def test_multigrid(FixedBoundaryReference):
+    """Test that multigrid V-cycles solve a fixed boundary equilibrium."""
+    eq = FixedBoundaryReference["eq"]
+    eq1 = FixedBoundaryReference["eq_solved"]
+    eq2, out2 = eq.solve(
+        optimizer="lsq-multigrid",
+        ftol=0,
+        xtol=0,
+        gtol=1e-8,
+        verbose=0,
+        copy=True,
+        options={"levels": 3},
+    )
+    assert len(out2["njev_levels"]) == 3
+    assert out2["njev"] == out2["njev_levels"][0]
+    assert out2["cost"] < 1e-4 * FixedBoundaryReference["initial_cost"]
+    # the poloidal angle isn't unique, so compare physical quantities
+    for name in ["W_B", "<beta>_vol", "R0/a"]:
+        np.testing.assert_allclose(
+            eq2.compute(name)[name], eq1.compute(name)[name], rtol=1e-4
+        )
+
+
+@pytest.mark.unit
+def test_multigrid_levels():
+    """Test the coarse levels and transfer operators of the multigrid solver."""
+    from desc.optimize._multigrid import _build_levels
+
+    eq = Equilibrium(
+        L=8, M=8, N=0, pressure=np.array([1e4, 0, -1e4]), iota=np.array([1.0, 0, 0.5])
+    )
+    objective = LinearConstraintProjection(
+        ObjectiveFunction(ForceBalance(eq)),
+        ObjectiveFunction(
+            maybe_add_self_consistency(eq, get_fixed_boundary_constraints(eq))
+        ),
+    )
+    objective.build(verbose=0)
+    fine, coarse = _build_levels(objective, 2, verbose=0)
+    assert (coarse.eq.L, coarse.eq.M, coarse.eq.N) == (4, 4, 0)
+    # prolongation is zero padding and restriction is truncation
+    x = coarse.objective._objective.x(coarse.eq)
+    np.testing.assert_allclose(coarse.restrict(coarse.prolong(x)), x)
+    R_lmn = coarse.prolong(x)[fine.eq.x_idx["R_lmn"]]
+    np.testing.assert_allclose(
+        R_lmn, copy_coeffs(coarse.eq.R_lmn, coarse.eq.R_basis.modes, eq.R_basis.modes)
+    )
+
+    with pytest.raises(ValueError, match="default fixed boundary constraints"):
+        eq.solve(
+            optimizer="lsq-multigrid",
+            constraints=(
+                *get_fixed_boundary_constraints(eq),
+                FixParameters(eq, {"R_lmn": np.array([1])}),
+            ),
+            verbose=0,
+            copy=True,
+        )
+
+
+@pytest.mark.regression
+@pytest.mark.slow
+@pytest.mark.solve
+def test_jfnk(FixedBoundaryReference):
+    """Test the Jacobian-free Newton-Krylov solver with coarse grid preconditioner."""
+    eq = FixedBoundaryReference["eq"]
+    eq1 = FixedBoundaryReference["eq_solved"]
+    eq2, out2 = eq.solve(
+        optimizer="lsq-jfnk",
+        ftol=1e-8,
+        xtol=0,
+        gtol=1e-8,
+        maxiter=100,
+        verbose=0,
+        copy=True,
+    )
+    # the coarse Jacobian is factorized once and reused for every step
+    assert out2["njev_coarse"] == 1
+    assert out2["cost"] < 1e-4 * FixedBoundaryReference["initial_cost"]
+    for name in ["W_B", "<beta>_vol", "R0/a"]:
+        np.testing.assert_allclose(
+            eq2.compute(name)[name], eq1.compute(name)[name], rtol=1e-3
+        )
+
+
+@pytest.mark.unit
+def test_jfnk_tr_method():
+    """Test that the Jacobian-free Newton-Krylov solver only allows tr_method=cg."""
+    eq = Equilibrium(L=2, M=2, N=0)
+    with pytest.raises(ValueError, match="tr_method='cg'"):
+        eq.solve(
+            optimizer="lsq-jfnk", options={"tr_method": "qr"}, verbose=0, copy=True
+        )
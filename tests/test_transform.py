@@ -655,3 +655,111 @@ def test_NFP_warning():
         _ = Transform(g22, b21)
     # toroidal nodes and modes, but equal nfp, no warning
     _ = Transform(g22, b22)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("method", ["direct1", "direct2", "fft"])
+def test_transform_cache(tmp_path, monkeypatch, method):
+    """Test that cached transform matrices are reused and give the same results."""
+    monkeypatch.setitem(desc.config, "cache_dir", str(tmp_path))
+    monkeypatch.setitem(desc.config, "transform_cache", True)
+    grid = LinearGrid(L=4, M=5, N=3, NFP=2)
+    basis = FourierZernikeBasis(L=3, M=3, N=2, NFP=2)
+    transform1 = Transform(grid, basis, derivs=1, build_pinv=True, method=method)
+    assert len(list((tmp_path / "transforms").iterdir()))
+
+    transform2 = Transform(grid, basis, derivs=1, build_pinv=True, method=method)
+    assert transform2.method == method
+    c = np.random.random(basis.num_modes)
+    for d in transform1.derivatives:
+        np.testing.assert_allclose(
+            transform2.transform(c, *d), transform1.transform(c, *d)
+        )
+    x = transform1.transform(c)
+    np.testing.assert_allclose(transform2.fit(x), transform1.fit(x))
+    np.testing.assert_allclose(transform2.fit(x), c, atol=1e-10)
+    key = "pinv" if method == "direct1" else "pinvA"
+    assert isinstance(transform2.matrices[key], np.memmap)
+
+    # different grid should not reuse the cached matrices
+    transform3 = Transform(
+        LinearGrid(L=5, M=5, N=3, NFP=2), basis, build_pinv=True, method=method
+    )
+    assert transform3.matrices[key].shape != transform1.matrices[key].shape
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("method", ["direct1", "direct2", "fft"])
+def test_transform_lazy(method):
+    """Test that lazily built transform matrices give the same results."""
+    grid = LinearGrid(L=4, M=5, N=3, NFP=2)
+    basis = FourierZernikeBasis(L=3, M=3, N=2, NFP=2)
+    transform = Transform(grid, basis, derivs=1, method=method)
+    lazy = Transform(grid, basis, derivs=1, method=method, lazy=True)
+    assert lazy.built
+    c = np.random.random(basis.num_modes)
+
+    # inside jit, the matrices are evaluated on the fly and not stored
+    @jit
+    def foo(c, tr):
+        return tr.transform(c, 1, 0, 0)
+
+    np.testing.assert_allclose(foo(c, lazy), transform.transform(c, 1, 0, 0))
+    matrix = lambda: (
+        lazy.matrices["direct1"][1][0][0]
+        if method == "direct1"
+        else lazy.matrices["fft"][1][0]
+    )
+    assert isinstance(matrix(), dict)
+
+    for d in transform.derivatives:
+        np.testing.assert_allclose(lazy.transform(c, *d), transform.transform(c, *d))
+    assert not isinstance(matrix(), dict)
+    y = np.random.random(grid.num_nodes)
+    np.testing.assert_allclose(lazy.project(y), transform.project(y))
+
+    # lazy mode doesn't allow derivatives that weren't initialized
+    for tr in [transform, lazy]:
+        with pytest.raises(ValueError, match="out of initialized bounds"):
+            tr.transform(c, 2, 0, 0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("method", ["direct1", "direct2", "fft"])
+def test_transform_batched(method):
+    """Test that stacked coefficients give the same results as one at a time."""
+    grid = LinearGrid(L=4, M=5, N=3, NFP=2)
+    basis = FourierZernikeBasis(L=3, M=3, N=2, NFP=2)
+    transform = Transform(grid, basis, derivs=1, method=method, build_pinv=True)
+    c = np.random.random((3, basis.num_modes))
+    y = np.random.random((3, grid.num_nodes))
+
+    for d in transform.derivatives:
+        x = transform.transform(c, *d)
+        assert x.shape == (3, grid.num_nodes)
+        for i in range(3):
+            np.testing.assert_allclose(x[i], transform.transform(c[i], *d))
+    cf = transform.fit(y)
+    b = transform.project(y)
+    assert cf.shape == b.shape == (3, basis.num_modes)
+    for i in range(3):
+        np.testing.assert_allclose(cf[i], transform.fit(y[i]), atol=1e-12)
+        np.testing.assert_allclose(b[i], transform.project(y[i]), atol=1e-12)
+
+
+@pytest.mark.unit
+def test_transform_build_in_jit():
+    """Test that non-lazy transforms built inside JIT store their matrices."""
+    basis = FourierSeries(N=3)
+
+    @jit
+    def foo(c, nodes):
+        grid = Grid(nodes, jitable=True)
+        transform = Transform(grid, basis, derivs=1, method="jitable")
+        return transform.transform(c, dz=1)
+
+    grid = LinearGrid(N=5)
+    c = np.random.random(basis.num_modes)
+    np.testing.assert_allclose(
+        foo(c, grid.nodes), Transform(grid, basis, derivs=1).transform(c, dz=1)
+    )
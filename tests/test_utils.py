@@ -1,5 +1,6 @@
 """Tests for utility functions."""
 
+import os
 from functools import partial
 
 import numpy as np
@@ -7,7 +8,15 @@ import pytest
 
 from desc.backend import flatnonzero, jax, jnp, tree_leaves, tree_structure
 from desc.grid import LinearGrid
-from desc.utils import broadcast_tree, isalmostequal, islinspaced, jaxify, take_mask
+from desc.utils import (
+    block_svd_inv_null,
+    broadcast_tree,
+    isalmostequal,
+    islinspaced,
+    jaxify,
+    svd_inv_null,
+    take_mask,
+)
 
 
 @pytest.mark.unit
@@ -238,6 +247,44 @@ def test_jaxify():
     np.testing.assert_allclose(df_rel3, df_true, rtol=3e-3)
 
 
+@pytest.mark.unit
+def test_jaxify_max_workers(tmp_path):
+    """Test that jaxify evaluates finite differences in a worker pool."""
+    calls = []
+
+    def f(x):
+        """Function that is not JAX transformable."""
+        return np.sin(x) + 2 * np.cos(x) + 3 * x**2 - 4 * x - 5
+
+    def fun(x, scratch_dir=None):
+        assert os.path.isdir(scratch_dir)
+        calls.append(scratch_dir)
+        return f(x)
+
+    x = np.linspace(0, 2 * np.pi, 15)
+    abstract_eval = lambda *args, **kwargs: jnp.empty(x.size)
+    fun_serial = jaxify(f, abstract_eval)
+    fun_pooled = jaxify(fun, abstract_eval, max_workers=3, scratch_dir=tmp_path)
+
+    np.testing.assert_allclose(
+        jax.jit(jax.jacfwd(fun_pooled))(x), jax.jacfwd(fun_serial)(x)
+    )
+    np.testing.assert_allclose(
+        jax.vmap(fun_pooled)(np.stack([x, 2 * x])), np.stack([f(x), f(2 * x)])
+    )
+    # each running evaluation gets its own scratch directory
+    assert set(calls) == {str(tmp_path / f"worker_{k}") for k in range(3)}
+
+    # closing shuts down the pool, and a later call starts a new one
+    fun_pooled.close()
+    fun_pooled.close()
+    np.testing.assert_allclose(jax.jacfwd(fun_pooled)(x), jax.jacfwd(fun_serial)(x))
+    fun_pooled.close()
+
+    with pytest.raises(ValueError):
+        jaxify(fun, abstract_eval, vectorized=True, max_workers=2)
+
+
 @partial(jnp.vectorize, signature="(m)->()")
 def _last_value(a):
     """Return the last non-nan value in ``a``."""
@@ -268,3 +315,23 @@ def test_take_mask():
             desired[-1] if desired.size else np.nan,
             equal_nan=True,
         )
+
+
+@pytest.mark.unit
+def test_block_svd_inv_null():
+    """Test that block_svd_inv_null matches svd_inv_null with a badly scaled block."""
+    rng = np.random.default_rng(0)
+    A = np.zeros((5, 8))
+    A[:2, :3] = rng.random((2, 3))
+    A[2:4, 3:5] = rng.random((2, 2))
+    # a block that is negligible compared to the rest of A, but not to itself
+    A[4, 5] = 1e-20
+    Ainv, Z = svd_inv_null(A)
+    Ainv_block, Z_block = block_svd_inv_null(A)
+    Ainv_block, Z_block = Ainv_block.toarray(), Z_block.toarray()
+
+    np.testing.assert_allclose(Ainv_block, Ainv, atol=1e-12)
+    assert Z_block.shape == Z.shape
+    np.testing.assert_allclose(Z_block.T @ Z_block, np.eye(Z.shape[1]), atol=1e-12)
+    # both bases span the same space
+    np.testing.assert_allclose(Z @ (Z.T @ Z_block), Z_block, atol=1e-12)